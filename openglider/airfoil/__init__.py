@@ -18,6 +18,8 @@
 # You should have received a copy of the GNU General Public License
 # along with OpenGlider.  If not, see <http://www.gnu.org/licenses/>.
 from __future__ import division
+import numpy as np
+
 from openglider.airfoil.profile_2d import Profile2D
 from openglider.airfoil.profile_3d import Profile3D
 from openglider.airfoil.parametric import BezierProfile2D
@@ -27,7 +29,16 @@ def get_x_value(x_value_list, x):
     """
     Get position of x in a list of x_values
     zb get_x_value([1,2,3],1.5)=0.5
+    Accepts arrays for x.
     """
-    for i in range(len(x_value_list) - 1):
-        if x_value_list[i + 1] >= x or i == len(x_value_list) - 2:
-            return i - (x_value_list[i] - x) / (x_value_list[i + 1] - x_value_list[i])
+    x_values = np.asarray(x_value_list, dtype=float)
+    x = np.asarray(x, dtype=float)
+
+    # first i with x_values[i+1] >= x (running maximum -> sorted)
+    maxima = np.maximum.accumulate(x_values[1:])
+    i = np.minimum(np.searchsorted(maxima, x, side="left"), len(x_values) - 2)
+    result = i - (x_values[i] - x) / (x_values[i + 1] - x_values[i])
+
+    if result.ndim == 0:
+        return float(result)
+    return result
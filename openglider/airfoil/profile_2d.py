@@ -25,7 +25,7 @@ import numpy as np
 import tempfile
 import shutil
 
-from openglider.utils.cache import HashedList
+from openglider.utils.cache import cached_property, HashedList
 from openglider.utils.distribution import Distribution
 from openglider.vector.functions import norm_squared
 from openglider.vector.polygon import Polygon2D
@@ -43,30 +43,48 @@ class Profile2D(Polygon2D):
         fakt = np.array([1, float(other)])
         return super(Profile2D, self).__imul__(fakt)
 
+    @cached_property('self')
+    def _x_lookup(self):
+        """
+        Running minima of the x-values for the binary search in __call__:
+            upper: min(x[1:j+1]) -> non-increasing
+            lower: min(x[i:-1]) -> non-decreasing
+        """
+        x = self.data[:, 0]
+        upper = np.minimum.accumulate(x[1:])
+        lower = np.minimum.accumulate(x[1:-1][::-1])[::-1]
+        return upper, lower
+
     def __call__(self, xval):
-        xval = float(xval)
-        if xval < 0.:       # LOWER
-            i = 1
-            xval = -xval
-            while self[i][0] >= xval and i < len(self):
-                i += 1
-            i -= 1
-        elif xval == 0:     # NOSE
-            i = self.noseindex - 1
-        else:               # UPPER
-            i = len(self) - 2
-            while self[i][0] > xval and i > 1:
-                i -= 1
-                # Determine k-value
-        k = -(self[i][0] - xval) / (self[i + 1][0] - self[i][0])
-
-        return i + k
+        """
+        Get the (fractional) index for an x-value (<0: first side, >0: second side).
+        Accepts arrays.
+        """
+        xval = np.asarray(xval, dtype=float)
+        x = self.data[:, 0]
+        upper, lower = self._x_lookup
+
+        # first side: first j >= 1 with x[j] < -xval -> i = j - 1
+        i_upper = np.searchsorted(-upper, xval, side="right")
+        i_upper = np.where(i_upper < len(upper), i_upper, self.noseindex - 1)  # beyond the nose
+        # second side: last i in (1, len-2) with x[i] <= xval
+        i_lower = np.maximum(np.searchsorted(lower, xval, side="right"), 1)
+
+        i = np.where(xval < 0, i_upper, i_lower)
+        i = np.where(xval == 0, self.noseindex - 1, i)
+
+        xval = np.abs(xval)
+        k = -(x[i] - xval) / (x[i + 1] - x[i])
+
+        result = i + k
+        if result.ndim == 0:
+            return float(result)
+        return result
 
     def align(self, p):
         """Align a point (x, y) on the airfoil. x: (0,1), y: (-1,1)"""
         x, y = p
-        upper = self[self(-x)]
-        lower = self[self(x)]
+        upper, lower = self.points_at([self(-x), self(x)])
 
         return lower + (upper-lower) * (y + 1)/2
 
@@ -229,18 +247,17 @@ class Profile2D(Polygon2D):
         profile.numpoints = numpoints
         return profile
 
-    #@cached_property('self')
     @property
     def x_values(self):
         """Get XValues of airfoil. upper side neg, lower positive"""
         i = self.noseindex
-        return [-vector[0] for vector in self.data[:i]] + \
-               [vector[0] for vector in self.data[i:]]
+        x = self.data[:, 0]
+        return np.concatenate([-x[:i], x[i:]]).tolist()
 
     @x_values.setter
     def x_values(self, xval):
         """Set X-Values of airfoil to defined points."""
-        self.data = [self[self(x)] for x in xval]
+        self.data = self.points_at(self(xval))
 
     @property
     def numpoints(self):
@@ -250,33 +267,40 @@ class Profile2D(Polygon2D):
     def numpoints(self, numpoints):
         self.x_values = Distribution.from_cos_distribution(numpoints)
 
-    #todo: cached
-    #@cached_property('self')
-    @property
+    def _get_sides(self):
+        """
+        Get the points of both sides at all (absolute) x-values
+        :return: x-values, points(-x), points(x)
+        """
+        xvals = np.unique(np.abs(self.x_values))
+        return xvals, self.points_at(self(-xvals)), self.points_at(self(xvals))
+
+    @cached_property('self')
     def thickness(self):
         """return the maximum sickness (Sic!) of an airfoil"""
-        xvals = sorted(set(map(abs, self.x_values)))
-        return max([self[self(-i)][1] - self[self(i)][1] for i in xvals])
+        _, upper, lower = self._get_sides()
+        return float(np.max(upper[:, 1] - lower[:, 1]))
 
     @thickness.setter
     def thickness(self, newthick):
         factor = float(newthick / self.thickness)
-        new = [point * [1., factor] for point in self.data]
+        new = self.data * [1., factor]
         name = self.name
         if name is not None:
             name += "_" + str(newthick) + "%"
         self.__init__(new, name)
 
-    @property
+    @cached_property('self')
     def camber_line(self):
-        xvals = sorted(set(map(abs, self.x_values)))
-        return np.array([self.profilepoint(i, 0.) for i in xvals])
+        _, upper, lower = self._get_sides()
+        camber_line = (upper + lower) / 2
+        camber_line.flags.writeable = False  # shared by all readers of the cache
+        return camber_line
 
-    #@cached_property('self')
-    @property
+    @cached_property('self')
     def camber(self):
         """return the maximum camber of the airfoil"""
-        return max([p[1] for p in self.camber_line])
+        return float(np.max(self.camber_line[:, 1]))
 
     @camber.setter
     def camber(self, newcamber):
@@ -298,13 +322,17 @@ class Profile2D(Polygon2D):
                 return False
         return True
 
-    @property
+    @cached_property('self')
     def upper_indices(self):
-        return range(0, self.noseindex)
+        indices = np.arange(0, self.noseindex)
+        indices.flags.writeable = False
+        return indices
 
-    @property
+    @cached_property('self')
     def lower_indices(self):
-        return range(self.noseindex + 1, len(self))
+        indices = np.arange(self.noseindex + 1, len(self))
+        indices.flags.writeable = False
+        return indices
 
     def insert_point(self, pos):
         if pos in self.x_values:
@@ -7,7 +7,12 @@ from openglider.utils import Config
 class GlobalConfig(Config):
     asinc_interpolation_points = 1000
     caching = True
+    cache_backend = "instance"  # or "lru"
+    cache_max_bytes = 512 * 2**20  # limit for the lru-cache
     debug = False
+    disk_cache_dir = None  # directory for persistent artifacts (disabled if None)
+    disk_cache_max_bytes = 2 * 2**30
+    disk_cache_max_age = None  # seconds since last usage
     json_allowed_modules = [r"openglider\..*"]
     json_forbidden_modules = [r".*eval", r".*subprocess.*"]
     user = "{}/{}".format(platform.node(), getpass.getuser())
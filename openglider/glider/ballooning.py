@@ -27,15 +27,41 @@ from openglider.vector.interpolate import Interpolation
 
 
 class ArcSinc:
+    newton_steps = 3
+
     def __init__(self):
         self.start = 0.
         self.end = np.pi
         self.arsinc = None
 
     def __call__(self, val):
+        """
+        Inverse of sinc(phi) = sin(phi)/phi for phi in (0, pi). Accepts arrays.
+        The interpolation-table gives the initial guess, which is refined with
+        newton-iterations on sin(phi) - val*phi = 0.
+        """
         if self.arsinc is None:
             self.interpolate(openglider.config['asinc_interpolation_points'])
-        return self.arsinc(val)
+        val = np.asarray(val, dtype=float)
+        phi = np.asarray(self.arsinc(val), dtype=float)
+
+        # close to 1 the table is inaccurate (infinite slope): use the series expansion
+        # sinc(phi) = 1 - phi**2/6 + phi**4/120 -> phi**2 = 6*u + 9/5*u**2 (u = 1 - val)
+        u = 1 - val
+        near_one = (u > 0) & (u < 1e-3)
+        phi = np.where(near_one, np.sqrt(6 * np.abs(u) + 1.8 * u**2), phi)
+
+        # outside of (0, 1) keep the (extrapolated) table value
+        inside = (val > 0) & (val < 1)
+        for _ in range(self.newton_steps):
+            f = np.sin(phi) - val * phi
+            df = np.cos(phi) - val
+            valid = inside & (df != 0)
+            phi = np.where(valid, phi - f / np.where(valid, df, 1), phi)
+
+        if phi.ndim == 0:
+            return float(phi)
+        return phi
 
     def interpolate(self, numpoints):
         data = []
@@ -67,16 +93,21 @@ class Ballooning(object):
                 'f_lower': self.lower}
 
     def __getitem__(self, xval):
-        """Get Ballooning Value (%) for a certain XValue"""
-        if -1 <= xval < 0:
-            #return self.upper.xpoint(-xval)[1]
-            return self.upper(-xval)
-        elif 0 <= xval <= 1:
-            #return -self.lower.xpoint(xval)[1]
-            return self.lower(xval)
-        else:
+        """Get Ballooning Value (%) for a certain XValue (or an array of XValues)"""
+        xval = np.asarray(xval, dtype=float)
+        if not np.all((-1 <= xval) & (xval <= 1)):
             raise ValueError("Ballooning only between -1 and 1")
 
+        values = np.atleast_1d(xval)
+        upper = values < 0
+        result = np.empty(values.shape)
+        result[upper] = self.upper(-values[upper])
+        result[~upper] = self.lower(values[~upper])
+
+        if xval.ndim == 0:
+            return float(result[0])
+        return result.reshape(xval.shape)
+
     def __call__(self, arg):
         """Get Ballooning Arc (phi) for a certain XValue"""
         return self.phi(1. / (self[arg] + 1))
@@ -109,7 +140,7 @@ class Ballooning(object):
         return copy.deepcopy(self)
 
     @classmethod
-    def phi(cls, *baloon):
+    def phi(cls, baloon):
         """
         Return the angle of the piece of cake.
         b/l=R*phi/(R*Sin(phi)) -> Phi=arsinc(l/b)
@@ -117,7 +148,7 @@ class Ballooning(object):
         return cls.arcsinc(baloon)
 
     def mapx(self, xvals):
-        return [self[i] for i in xvals]
+        return self[xvals]
 
     @property
     def amount_maximal(self):
@@ -28,28 +28,12 @@ class BasicCell(CachedObject):
             return self.prof1
         elif y_value == 1:            # right side
             return self.prof2
+        elif with_numpy:
+            return Profile3D(self.midribs([y_value], ballooning=ballooning, arc_argument=arc_argument)[0])
         else:                   # somewhere else
             #self._checkxvals()
             midrib = []
 
-            # Ballooning is considered to be arcs, following 2 (two!) simple rules:
-            # 1: x1 = x*d
-            # 2: x2 = R*normvekt*(cos(phi2)-cos(phi)
-            # 3: norm(d)/r*(1-x) = 2*sin(phi(2))
-            if with_numpy:
-                l_phi = np.array(self.ballooning_phi)
-                l_n = np.array(self.normvectors)
-                l_r = np.array(self.ballooning_radius)
-                l_diff = self.prof1.data - self.prof2.data
-
-                l_phi = l_phi  + (1e-10 - l_phi) * (l_phi <= 0.)
-                l_psi = l_phi * 2 * y_value
-                l_h = np.cos(l_phi - l_psi) - np.cos(l_phi)
-                l_d = 0.5 * (1 - np.sin(l_phi - l_psi) / np.sin(l_phi))
-                l_r = l_r * (l_r > 0.)
-                l_midrib = self.prof1.data.T - l_d * l_diff.T + (l_h * l_r) * l_n.T
-                return Profile3D(l_midrib.T)
-
             for i, _ in enumerate(self.prof1.data):  # Arc -> phi(bal) -> r  # oder so...
                 diff = self.prof1[i] - self.prof2[i]
                 if ballooning and self.ballooning_radius[i] > 0.:
@@ -69,6 +53,46 @@ class BasicCell(CachedObject):
 
             return Profile3D(midrib)
 
+    def midribs(self, y_values, ballooning=True, arc_argument=True):
+        """
+        Get the points of several midribs at once
+        :param y_values: list/array of y-values (0-1)
+        :return: array (num_y, numpoints, 3)
+        """
+        y_values = np.asarray(y_values, dtype=float)
+        prof1 = np.asarray(self.prof1.data, dtype=float)
+        prof2 = np.asarray(self.prof2.data, dtype=float)
+        y = y_values[:, np.newaxis]
+
+        # Ballooning is considered to be arcs, following 2 (two!) simple rules:
+        # 1: x1 = x*d
+        # 2: x2 = R*normvekt*(cos(phi2)-cos(phi)
+        # 3: norm(d)/r*(1-x) = 2*sin(phi(2))
+        d = np.repeat(y, len(prof1), axis=1)
+        if ballooning and len(prof1):
+            radius = np.array(self.ballooning_radius)
+            ballooned = radius > 0.
+        else:
+            ballooned = np.zeros(len(prof1), dtype=bool)
+
+        phi = np.array(self.ballooning_phi)[ballooned] if ballooned.any() else np.zeros(0)
+        if arc_argument:
+            psi = phi * 2 * y                               # psi [-phi:phi]
+            d[:, ballooned] = 0.5 - 0.5 * np.sin(phi - psi) / np.sin(phi)
+            h = np.cos(phi - psi) - np.cos(phi)
+        else:
+            h = np.cos(np.arcsin((2 * y - 1) * np.sin(phi))) - np.cos(phi)
+
+        midribs = prof1 - d[:, :, np.newaxis] * (prof1 - prof2)
+        if ballooned.any():
+            normvectors = np.array(self.normvectors)[ballooned]
+            midribs[:, ballooned] += (h * radius[ballooned])[:, :, np.newaxis] * normvectors
+
+        # keep the outer ribs exact
+        midribs[y_values == 0] = prof1
+        midribs[y_values == 1] = prof2
+        return midribs
+
     @cached_property('prof1', 'prof2')
     def normvectors(self, j=None):
         prof1 = self.prof1.data
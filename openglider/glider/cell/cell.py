@@ -87,17 +87,7 @@ class Cell(CachedObject):
     def _make_profile3d_from_minirib(self, minirib):
         # self.basic_cell.prof1 = self.prof1
         # self.basic_cell.prof2 = self.prof2
-        shape_with_ballooning = self.basic_cell.midrib(minirib.y_value,
-                                                       True).data
-        shape_without_ballooning = self.basic_cell.midrib(minirib.y_value,
-                                                          False).data
-        points = []
-        for xval, with_bal, without_bal in zip(
-                self.x_values, shape_with_ballooning, shape_without_ballooning):
-            fakt = minirib.function(xval)  # factor ballooned/unb. (0-1)
-            point = without_bal + fakt * (with_bal - without_bal)
-            points.append(point)
-        return Profile3D(points)
+        return minirib.get_3d(self)
 
     @cached_property('rib_profiles_3d')
     def _child_cells(self):
@@ -111,22 +101,20 @@ class Cell(CachedObject):
         if not self.miniribs:
             return cells
 
-        for index, xvalue in enumerate(self.x_values):
-            left_point = self.rib1.profile_3d.data[index]
-            right_point = self.rib2.profile_3d.data[index]
-            bl = self.ballooning[xvalue]
-
-            l = norm(right_point - left_point)  # L
-            lnew = sum([norm(c.prof1.data[index] - c.prof2.data[index]) for c in cells])  # L-NEW
-
-            for c in cells:
-                if bl > 0:
-                    newval = l / lnew * (bl+1/2) - 1/2
-                    #newval = l/lnew / bl
-                    #newval = lnew / l / bl if bl != 0 else 1
-                    c.ballooning_phi.append(Ballooning.arcsinc(1/(1+newval)))  # B/L NEW 1 / (bl * l / lnew)
-                else:
-                    c.ballooning_phi.append(0.)
+        left_points = self.rib1.profile_3d.data
+        right_points = self.rib2.profile_3d.data
+        bl = self.ballooning[self.x_values]
+
+        l = np.linalg.norm(right_points - left_points, axis=1)  # L
+        lnew = sum([np.linalg.norm(c.prof1.data - c.prof2.data, axis=1) for c in cells])  # L-NEW
+
+        phi = np.zeros(len(bl))
+        ballooned = bl > 0
+        newval = l[ballooned] / lnew[ballooned] * (bl[ballooned] + 1/2) - 1/2
+        phi[ballooned] = Ballooning.arcsinc(1/(1+newval))  # B/L NEW 1 / (bl * l / lnew)
+
+        for c in cells:
+            c.ballooning_phi = HashedList(phi)
         return cells
 
     @property
@@ -152,7 +140,7 @@ class Cell(CachedObject):
     def point(self, y=0, i=0, k=0):
         return self.midrib(y).point(i, k)
 
-    def midrib(self, y, ballooning=True, arc_argument=False, with_numpy=False):
+    def midrib(self, y, ballooning=True, arc_argument=False, with_numpy=True):
         if len(self._child_cells) == 1:
             return self.basic_cell.midrib(y, ballooning=ballooning, with_numpy=with_numpy)
         if ballooning:
@@ -165,15 +153,40 @@ class Cell(CachedObject):
         else:
             return self.basic_cell.midrib(y, ballooning=False)
 
+    def midribs(self, y_values, ballooning=True, arc_argument=False):
+        """
+        Get the points of several midribs at once
+        :param y_values: list/array of y-values (0-1)
+        :return: array (num_y, numpoints, 3)
+        """
+        y_values = np.asarray(y_values, dtype=float)
+        if len(self._child_cells) == 1 or not ballooning:
+            # same as midrib: the arc_argument only applies to the child cells
+            return self.basic_cell.midribs(y_values, ballooning=ballooning)
+
+        yvalues = np.array(self._yvalues)
+        cell_indices = np.searchsorted(yvalues[1:-1], y_values, side="left")
+        midribs = np.empty((len(y_values), len(self.x_values), 3))
+        for i, cell in enumerate(self._child_cells):
+            in_cell = cell_indices == i
+            if not in_cell.any():
+                continue
+            y_new = (y_values[in_cell] - yvalues[i]) / (yvalues[i + 1] - yvalues[i])
+            midribs[in_cell] = cell.midribs(y_new, arc_argument=arc_argument)
+        return midribs
+
     def get_midribs(self, numribs):
         y_values = linspace(0, 1, numribs)
-        return [self.midrib(y) for y in y_values]
+        return [Profile3D(rib) for rib in self.midribs(y_values)]
 
     @cached_property('ballooning', 'rib1.profile_2d.numpoints', 'rib2.profile_2d.numpoints')
     def ballooning_phi(self):
         x_values = self.rib1.profile_2d.x_values
-        balloon = [self.ballooning[i] for i in x_values]
-        return HashedList([Ballooning.arcsinc(1. / (1+bal)) if bal > 0 else 0 for bal in balloon])
+        balloon = self.ballooning[x_values]
+        phi = np.zeros(len(balloon))
+        ballooned = balloon > 0
+        phi[ballooned] = Ballooning.arcsinc(1. / (1+balloon[ballooned]))
+        return HashedList(phi)
 
     @property
     def ribs(self):
@@ -225,12 +238,13 @@ class Cell(CachedObject):
             panel.mirror()
 
     def mean_rib(self, num_midribs=8):
-        mean_rib = self.midrib(0).flatten().normalize()
-        for y in np.linspace(0, 1, num_midribs)[1:]:
-            mean_rib += self.midrib(y).flatten().normalize()
+        midribs = self.midribs(np.linspace(0, 1, num_midribs))
+        mean_rib = Profile3D(midribs[0]).flatten().normalize()
+        for rib in midribs[1:]:
+            mean_rib += Profile3D(rib).flatten().normalize()
         return mean_rib * (1. / num_midribs)
 
-    def get_mesh(self,  numribs=0, with_numpy=False, half_cell=False):
+    def get_mesh(self,  numribs=0, with_numpy=True, half_cell=False):
         """
         Get Cell-mesh
         :param numribs: number of miniribs to calculate
@@ -243,9 +257,12 @@ class Cell(CachedObject):
         rib_indices = range(numribs + 1)
         if half_cell:
             rib_indices = rib_indices[(numribs) // 2:]
-        for rib_no in rib_indices:
-            y = rib_no / max(numribs, 1)
-            rib = self.midrib(y, with_numpy=with_numpy).data
+        y_values = [rib_no / max(numribs, 1) for rib_no in rib_indices]
+        if with_numpy:
+            midribs = self.midribs(y_values)
+        else:
+            midribs = [self.midrib(y, with_numpy=False).data for y in y_values]
+        for rib in midribs:
             ribs.append(Vertex.from_vertices_list(rib[:-1]))
 
         quads = []
@@ -23,9 +23,10 @@ import copy
 
 import numpy as np
 
-from openglider.airfoil import get_x_value
-from openglider.mesh import Mesh
-from openglider.vector import norm
+from openglider.airfoil import get_x_value, Profile3D
+from openglider.mesh import Mesh, PolygonArray
+from openglider.mesh.least_square_conformal_mapping import LSCM
+from openglider.vector import norm, PolyLine2D
 from openglider.vector.projection import flatten_list
 from openglider.utils import Config
 
@@ -149,10 +150,7 @@ class DiagonalRib(object):
             import openglider.mesh.mesh as _mesh
             points2d = _mesh.map_to_2d(point_array)
 
-            mesh_info = _mesh.mptriangle.MeshInfo()
-            mesh_info.set_points(points2d)
-            mesh = _mesh.custom_triangulation(mesh_info, "Qz")
-            return Mesh.from_indexed(point_array, {"diagonals": list(mesh.elements)})
+            return Mesh.from_indexed(point_array, {"diagonals": _mesh.triangulate_points(points2d)})
 
         else:
             vertices = np.array(list(left) + list(right)[::-1])
@@ -257,7 +255,7 @@ class Panel(object):
     def is_lower(self):
         return self.mean_x() > 0
 
-    def get_3d(self, cell, numribs=0, with_numpy=False):
+    def get_3d(self, cell, numribs=0, with_numpy=True):
         """
         Get 3d-Panel
         :param glider: glider class
@@ -266,8 +264,12 @@ class Panel(object):
         """
         xvalues = cell.rib1.profile_2d.x_values
         ribs = []
-        for i in range(numribs + 1):
-            y = i / numribs
+        y_values = [i / numribs for i in range(numribs + 1)]
+        if with_numpy:
+            midribs = [Profile3D(rib) for rib in cell.midribs(y_values)]
+        else:
+            midribs = [cell.midrib(y, with_numpy=False) for y in y_values]
+        for i, y in enumerate(y_values):
             x1 = self.cut_front["left"] + y * (self.cut_front["right"] -
                                                self.cut_front["left"])
             front = get_x_value(xvalues, x1)
@@ -275,17 +277,43 @@ class Panel(object):
             x2 = self.cut_back["left"] + y * (self.cut_back["right"] -
                                               self.cut_back["left"])
             back = get_x_value(xvalues, x2)
-            ribs.append(cell.midrib(y, with_numpy).get(front, back))
+            ribs.append(midribs[i].get(front, back))
             # todo: return polygon-data
         return ribs
 
-    def get_mesh(self, cell, numribs=0, with_numpy=False):
+    def get_mesh(self, cell, numribs=0, with_numpy=True):
         """
         Get Panel-mesh
         :param cell: cell from which the panel-mesh is build
         :param numribs: number of miniribs to calculate
         :return: mesh
         """
+        points, triangles, _ = self._get_mesh_indexed(cell, numribs, with_numpy)
+        return Mesh.from_indexed(points, {"panel_"+self.material_code: triangles}, name=self.name)
+
+    def get_flattened(self, cell, numribs=0, method="lscm"):
+        """
+        Flatten the panel
+        :param numribs: number of miniribs to use for the mesh (lscm)
+        :param method: "lscm" (least squares conformal map of the panel-mesh)
+                       or "flatten_list" (unfold the strip between the two ribs)
+        :return: left, right (flattened rib-pieces)
+        """
+        if method == "flatten_list":
+            ribs = self.get_3d(cell, 1)
+            return flatten_list(ribs[0], ribs[-1])
+        elif method == "lscm":
+            points, polygons, nums = self._get_mesh_indexed(cell, numribs)
+            triangles = PolygonArray.from_list(polygons).triangularize().regular()
+            flattened = LSCM(points, triangles).run()
+            return PolyLine2D(flattened[nums[0]]), PolyLine2D(flattened[nums[-1]])
+        else:
+            raise ValueError("Invalid method: {}".format(method))
+
+    def _get_mesh_indexed(self, cell, numribs=0, with_numpy=True):
+        """
+        Get points, polygons and the point-indices of every rib of the panel-mesh
+        """
         numribs += 1
         # TODO: doesnt work for numribs=0?
         xvalues = cell.rib1.profile_2d.x_values
@@ -293,8 +321,12 @@ class Panel(object):
         points = []
         nums = []
         count = 0
-        for rib_no in range(numribs + 1):
-            y = rib_no / max(numribs, 1)
+        y_values = [rib_no / max(numribs, 1) for rib_no in range(numribs + 1)]
+        if with_numpy:
+            midribs = [Profile3D(rib) for rib in cell.midribs(y_values)]
+        else:
+            midribs = [cell.midrib(y, with_numpy=False) for y in y_values]
+        for rib_no, y in enumerate(y_values):
             x1 = self.cut_front["left"] + y * (self.cut_front["right"] -
                                                self.cut_front["left"])
             front = get_x_value(xvalues, x1)
@@ -302,7 +334,7 @@ class Panel(object):
             x2 = self.cut_back["left"] + y * (self.cut_back["right"] -
                                               self.cut_back["left"])
             back = get_x_value(xvalues, x2)
-            midrib = cell.midrib(y, with_numpy=with_numpy)
+            midrib = midribs[rib_no]
             ribs.append([x for x in midrib.get_positions(front, back)])
             points += list(midrib[front:back])
             nums.append([i + count for i, _ in enumerate(ribs[-1])])
@@ -348,7 +380,7 @@ class Panel(object):
                     r_i += 1
         #connection_info = {cell.rib1: np.array(ribs[0], int),
         #                   cell.rib2: np.array(ribs[-1], int)}
-        return Mesh.from_indexed(points, {"panel_"+self.material_code: triangles}, name=self.name)
+        return points, triangles, nums
 
     def mirror(self):
         front = self.cut_front
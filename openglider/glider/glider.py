@@ -25,12 +25,14 @@ import math
 import numpy as np
 
 from openglider.glider.in_out import IMPORT_GEOMETRY, EXPORT_3D
+from openglider.glider.rib.rib import align_ribs, get_rib_transformations
 from openglider.glider.shape import Shape
 from openglider.mesh import Mesh
 from openglider.utils import consistent_value
 from openglider.utils.distribution import Distribution
 from openglider.vector.functions import norm, rotation_2d
-from openglider.vector.projection import flatten_list
+from openglider.vector.polyline import PolyLine2D
+from openglider.vector.projection import flatten_list, flatten_lists
 
 
 class Glider(object):
@@ -177,9 +179,9 @@ class Glider(object):
             return np.array([])
         #will hold all the points
         ribs = []
+        y_values = np.arange(num) * 1. / num
         for cell in self.cells:
-            for y in range(num):
-                ribs.append(cell.midrib(y * 1. / num, ballooning=ballooning).data)
+            ribs += list(cell.midribs(y_values, ballooning=ballooning))
         ribs.append(self.cells[-1].midrib(1.).data)
         return ribs
 
@@ -317,12 +319,40 @@ class Glider(object):
     @property
     def ribs(self):
         ribs = []
+        rib_ids = set()
         for cell in self.cells:
             for rib in cell.ribs:
-                if rib not in ribs:
+                if id(rib) not in rib_ids:
+                    rib_ids.add(id(rib))
                     ribs.append(rib)
         return ribs
 
+    def get_flattened_cells(self, cells=None):
+        """
+        Flatten the (unballooned) ribs of all cells in one batch
+        :return: [(left, right), ...] (PolyLine2D)
+        """
+        cells = self.cells if cells is None else cells
+        groups = {}
+        for index, cell in enumerate(cells):
+            shape = (len(cell.prof1.data), len(cell.prof2.data))
+            groups.setdefault(shape, []).append(index)
+
+        result = [None] * len(cells)
+        for indices in groups.values():
+            left, right = flatten_lists([cells[index].prof1.data for index in indices],
+                                        [cells[index].prof2.data for index in indices])
+            for index, left_flat, right_flat in zip(indices, left, right):
+                result[index] = PolyLine2D(left_flat), PolyLine2D(right_flat)
+
+        return result
+
+    def align_ribs(self):
+        """
+        Calculate the transformations and 3d-profiles of all ribs in one batch
+        """
+        align_ribs(self.ribs)
+
     @property
     def profile_numpoints(self):
         return consistent_value(self.ribs, 'profile_2d.numpoints')
@@ -416,7 +446,8 @@ class Glider(object):
         if x == 0:
             return copy.deepcopy([rib.pos for rib in self.ribs])  # This is much faster
         else:
-            return [rib.align([x, 0, 0]) for rib in self.ribs]
+            transformations = get_rib_transformations(self.ribs)
+            return list(transformations([x, 0, 0]))
 
     @property
     def attachment_points(self):
@@ -31,8 +31,8 @@ class ArcCurve(object):
         arc_curve = PolyLine2D([self.curve(i) for i in np.linspace(0.5, 1, self.num_interpolation_points)])
         arc_curve_length = arc_curve.get_length()
         scale_factor = arc_curve_length / x_values[-1]
-        _positions = [arc_curve.extend(0, x * scale_factor) for x in x_values]
-        positions = PolyLine2D([arc_curve[p] for p in _positions])
+        _positions = arc_curve.get_ik_at_length(np.array(x_values) * scale_factor)
+        positions = PolyLine2D(arc_curve.points_at(_positions))
         if not self.has_center_cell(x_values):
             positions[0][0] = 0
         # rescale
@@ -12,6 +12,7 @@ from openglider.glider.parametric.import_ods import import_ods_2d
 from openglider.glider.parametric.lines import LineSet2D, UpperNode2D
 from openglider.glider.rib import RibHole, RigidFoil, Rib, MiniRib
 from openglider.glider.parametric.fitglider import fit_glider_3d
+from openglider.utils.disk_cache import get_artifact
 from openglider.utils.distribution import Distribution
 from openglider.utils.table import Table
 from openglider.utils import ZipCmp
@@ -44,6 +45,7 @@ class ParametricGlider(object):
         self.speed = speed
         self.glide = glide
         self.elements = elements or {}
+        self._merge_cache = None
 
     def __json__(self):
         return {
@@ -130,17 +132,38 @@ class ParametricGlider(object):
         else:
             return first.copy()
 
-    def get_merge_profile(self, factor):
-        factor = max(0, min(len(self.profiles)-1, factor))
-        k = factor % 1
-        i = int(factor // 1)
-        first = self.profiles[i].copy()
-        if k > 0:
-            second = self.profiles[i + 1]
-            airfoil = first * (1 - k) + second * k
-        else:
-            airfoil = first
-        return Profile2D(airfoil.data)
+    def _get_resampled_profiles(self, x_values):
+        """
+        Get the profiles resampled to x_values as one array (num_profiles, num_x, 2)
+        and a dict to memoize merged profiles. Cached until profiles or x_values change.
+        """
+        x_values = np.asarray(x_values, dtype=float)
+        key = (tuple(hash(profile) for profile in self.profiles), x_values.tobytes())
+        if self._merge_cache is None or self._merge_cache[0] != key:
+            resampled = np.array([profile.points_at(profile(x_values)) for profile in self.profiles])
+            self._merge_cache = (key, resampled, {})
+        return self._merge_cache[1:]
+
+    def get_merge_profile(self, factor, x_values=None):
+        """
+        Blend the profiles linearly: factor=1.5 -> mean of profiles 1 and 2.
+        Merged profiles are memoized per factor (rounded to 6 digits).
+        :param x_values: x-values of the result (default: those of the first profile)
+        """
+        if x_values is None:
+            x_values = self.profiles[0].x_values
+        resampled, merged = self._get_resampled_profiles(x_values)
+
+        factor = round(max(0, min(len(self.profiles)-1, factor)), 6)
+        if factor not in merged:
+            k = factor % 1
+            i = int(factor // 1)
+            if k > 0:
+                merged[factor] = resampled[i] * (1 - k) + resampled[i + 1] * k
+            else:
+                merged[factor] = resampled[i]
+
+        return Profile2D(merged[factor].copy())
 
     def get_panels(self, glider_3d=None):
         """
@@ -244,7 +267,7 @@ class ParametricGlider(object):
 
     def apply_arc(self, glider):
         for rib, rib_pos in zip(glider.ribs, self.arc.get_arc_positions(self.shape.rib_x_values)):
-            rib.pos[2] = rib_pos[1]
+            rib.pos = np.array([rib.pos[0], rib.pos[1], rib_pos[1]])
 
     @classmethod
     def fit_glider_3d(cls, glider, numpoints=3):
@@ -273,10 +296,21 @@ class ParametricGlider(object):
 
     def get_glider_3d(self, glider=None, num=50, num_profile=None):
         """returns a new glider from parametric values"""
-        glider = glider or Glider()
-        ribs = []
+        self.rescale_curves()
+        if glider is None:
+            return get_artifact(lambda: self._get_glider_3d(Glider(), num),
+                                "glider_3d", self, self.num_profile, num)
 
+        return self._get_glider_3d(glider, num)
+
+    def get_mesh(self, midribs=0):
+        """Mesh of the 3d-glider"""
         self.rescale_curves()
+        return get_artifact(lambda: self.get_glider_3d().get_mesh(midribs),
+                            "mesh", self, self.num_profile, midribs)
+
+    def _get_glider_3d(self, glider, num):
+        ribs = []
 
         x_values = self.shape.rib_x_values
         shape_ribs = self.shape.ribs
@@ -306,9 +340,8 @@ class ParametricGlider(object):
 
             chord = abs(front[1]-back[1])
             factor = profile_merge_curve(abs(pos))
-            profile = self.get_merge_profile(factor)
+            profile = self.get_merge_profile(factor, profile_x_values)
             profile.name = "Profile{}".format(rib_no)
-            profile.x_values = profile_x_values
 
             this_rib_holes = [RibHole(ribhole["pos"], ribhole["size"]) for ribhole in rib_holes if rib_no in ribhole["ribs"]]
             this_rigid_foils = [RigidFoil(rigid["start"], rigid["end"], rigid["distance"]) for rigid in rigids if rib_no in rigid["ribs"]]
@@ -359,6 +392,7 @@ class ParametricGlider(object):
         #self.apply_holes(glider)
 
         glider.rename_parts()
+        glider.align_ribs()
 
         glider.lineset = self.lineset.return_lineset(glider, self.v_inf)
         glider.lineset.glider = glider
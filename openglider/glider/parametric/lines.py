@@ -1,3 +1,4 @@
+import collections
 import copy
 import re
 
@@ -127,12 +128,13 @@ class LineSet2D(object):
 
     @property
     def nodes(self):
-        nodes = set()
+        # keep the order stable (json-output has to be reproducible)
+        nodes = collections.OrderedDict()
         for line in self.lines:
-            nodes.add(line.upper_node)
-            nodes.add(line.lower_node)
+            nodes[id(line.upper_node)] = line.upper_node
+            nodes[id(line.lower_node)] = line.lower_node
 
-        return list(nodes)
+        return list(nodes.values())
 
     def get_upper_nodes(self, rib_no=None):
         nodes = set()
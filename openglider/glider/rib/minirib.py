@@ -1,3 +1,5 @@
+import numpy as np
+
 from openglider.airfoil import Profile3D
 from openglider.vector.spline import Bezier
 
@@ -32,17 +34,11 @@ class MiniRib():
             return 1
 
     def get_3d(self, cell):
-        shape_with_bal = cell.basic_cell.midrib(self.y_value,
-                                                       True).data
-        shape_wo_bal = cell.basic_cell.midrib(self.y_value,
-                                                          False).data
-
-        points = []
-        for xval, with_bal, without_bal in zip(
-                cell.x_values, shape_with_bal, shape_wo_bal):
-            fakt = self.function(xval)  # factor ballooned/unb. (0-1)
-            point = without_bal + fakt * (with_bal - without_bal)
-            points.append(point)
+        shape_with_bal = cell.basic_cell.midribs([self.y_value], ballooning=True)[0]
+        shape_wo_bal = cell.basic_cell.midribs([self.y_value], ballooning=False)[0]
+
+        fakt = np.array([self.function(xval) for xval in cell.x_values])  # factor ballooned/unb. (0-1)
+        points = shape_wo_bal + fakt[:, np.newaxis] * (shape_with_bal - shape_wo_bal)
 
         return Profile3D(points)
 
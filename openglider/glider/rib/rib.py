@@ -5,7 +5,7 @@ import numpy as np
 from openglider.airfoil import Profile3D
 from openglider.utils.cache import CachedObject, cached_property
 from openglider.vector.functions import rotation_3d, set_dimension
-from openglider.vector.transformation import Rotation, Scale, Translation
+from openglider.vector.transformation import Rotation, Scale, Translation, Transformation
 from openglider.glider.rib.elements import FoilCurve
 from numpy.linalg import norm
 
@@ -20,7 +20,7 @@ class Rib(CachedObject):
     hole_naming_scheme = "{rib.name}h{}"
     rigid_naming_scheme = "{rib.name}rigid{}"
 
-    hashlist = ('aoa_absolute', 'glide', 'arcang', 'zrot', 'chord', 'pos', 'profile_2d')  # pos
+    hashlist = ('aoa_absolute', 'glide', 'arcang', 'zrot', 'xrot', 'chord', 'pos', 'profile_2d')  # pos
 
     def __init__(self, profile_2d=None, startpoint=None,
                  chord=1., arcang=0, aoa_absolute=0, zrot=0, xrot = 0, glide=1,
@@ -313,12 +313,50 @@ def rib_rotation(aoa, arc, zrot, xrot=0):
 
 
 def rib_transformation(aoa, arc, zrot, xrot, scale, pos):
-    scale = Scale(scale)
+    """
+    all arguments can be arrays (one value per rib) -> stacked transformation
+    """
+    scale = np.asarray(scale, dtype=float)
+    scale = Scale(scale[..., np.newaxis] if scale.ndim else float(scale))
     move = Translation(pos)
     rot = rib_rotation(aoa, arc, zrot, xrot)
     return scale * rot * move
 
 
+def get_rib_transformations(ribs):
+    """
+    Stacked transformation (len(ribs) x 4 x 4) of all ribs, calculated at once
+    """
+    def values(attribute):
+        return np.array([getattr(rib, attribute) for rib in ribs], dtype=float)
+
+    arcang = values("arcang")
+    zrot = np.arctan(arcang) / values("glide") * values("zrot")
+    return rib_transformation(values("aoa_absolute"), arcang, zrot, values("xrot"),
+                              values("chord"), values("pos"))
+
+
+def align_ribs(ribs):
+    """
+    Calculate the transformations and 3d-profiles of many ribs at once
+    and fill the ribs' caches.
+    """
+    transformations = get_rib_transformations(ribs)
+
+    # profiles with the same number of points are transformed together
+    groups = {}
+    for index, rib in enumerate(ribs):
+        Rib.transformation.prime(rib, transformations[index])
+        if rib.profile_2d is not None and rib.profile_2d.data is not None:
+            groups.setdefault(len(rib.profile_2d.data), []).append(index)
+
+    for indices in groups.values():
+        data = np.array([set_dimension(ribs[index].profile_2d.data, 3) for index in indices])
+        profiles = Transformation(transformations.mat[indices]).apply(data)
+        for index, profile in zip(indices, profiles):
+            Rib.profile_3d.prime(ribs[index], Profile3D(profile))
+
+
 
 
 if __name__ == "__main__":
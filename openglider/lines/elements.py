@@ -155,7 +155,7 @@ class Line(CachedObject):
     def diff_vector_projected(self):
         return normalize(self.upper_node.vec_proj - self.lower_node.vec_proj)
 
-    @cached_property('lower_node.vec', 'upper_node.vec', 'v_inf')
+    @cached_property('lower_node.vec', 'upper_node.vec', 'lineset.v_inf')
     def length_projected(self):
         return norm(self.lower_node.vec_proj - self.upper_node.vec_proj)
 
@@ -163,7 +163,7 @@ class Line(CachedObject):
     def length_no_sag(self):
         return norm(self.upper_node.vec - self.lower_node.vec)
 
-    @cached_property('lower_node.vec', 'upper_node.vec', 'v_inf', 'sag_par_1', 'sag_par_2')
+    @cached_property('lower_node.vec', 'upper_node.vec', 'lineset.v_inf', 'sag_par_1', 'sag_par_2')
     def length_with_sag(self):
         if self.sag_par_1 is None or self.sag_par_2 is None:
             raise ValueError('Sag not yet calculated!')
@@ -187,7 +187,7 @@ class Line(CachedObject):
         """
         return 1 / 2 * self.type.cw * self.type.thickness * norm(self.v_inf) ** 2
 
-    @cached_property('lower_node.vec', 'upper_node.vec', 'v_inf')
+    @cached_property('lower_node.vec', 'upper_node.vec', 'lineset.v_inf')
     def drag_total(self):
         """
         Get total drag of line
@@ -291,7 +291,7 @@ class Line(CachedObject):
         return self.diff_vector.dot(self.get_rib_normal(glider))
 
 
-class Node(object):
+class Node(CachedObject):
     def __init__(self, node_type, position_vector=None, attachment_point=None):
         self.type = node_type  # lower, top, middle (0, 2, 1)
         if position_vector is not None:
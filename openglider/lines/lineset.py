@@ -4,11 +4,12 @@ from openglider.lines import SagMatrix
 
 from openglider.lines.functions import proj_force
 from openglider.mesh import Mesh
+from openglider.utils.cache import CachedObject, cached_property
 from openglider.vector.functions import norm, normalize
 from openglider.utils.table import Table
 
 
-class LineSet():
+class LineSet(CachedObject):
     """
     Set of different lines
     """
@@ -41,6 +42,45 @@ class LineSet():
             nodes.add(line.lower_node)
         return nodes
 
+    @cached_property('lines')
+    def _line_index(self):
+        """
+        Adjacency of the line-graph:
+        ({node: lines with lower_node=node}, {node: lines with upper_node=node})
+        """
+        upper_lines = {}
+        lower_lines = {}
+        index_property = LineSet._line_index
+        for line in self.lines:
+            upper_lines.setdefault(line.lower_node, []).append(line)
+            lower_lines.setdefault(line.upper_node, []).append(line)
+            # rebuild as soon as a line is connected to another node
+            line._add_dependent("lower_node", self, index_property)
+            line._add_dependent("upper_node", self, index_property)
+
+        return upper_lines, lower_lines
+
+    @cached_property('lines', '_line_index')
+    def _line_order(self):
+        """
+        All lines above the lowest lines (depth-first), every line comes after the line below it
+        """
+        return self._get_line_order(self.lowest_lines)
+
+    def _get_line_order(self, start_lines):
+        """
+        start_lines and all the lines above them in depth-first order (same as a recursive walk)
+        """
+        upper_lines = self._line_index[0]
+        lines = []
+        stack = list(reversed(start_lines))
+        while stack:
+            line = stack.pop()
+            lines.append(line)
+            stack += reversed(upper_lines.get(line.upper_node, []))
+
+        return lines
+
     def scale(self, factor):
         for p in self.lower_attachment_points:
             p.vec = np.array(p.vec) * factor
@@ -66,11 +106,13 @@ class LineSet():
 
     @property
     def floors(self):
+        upper_lines = self._line_index[0]
+
         def recursive_count_floors(node):
             if node.type == 2:
                 return 1
 
-            lines = self.get_upper_connected_lines(node)
+            lines = upper_lines.get(node, [])
             nodes = [line.upper_node for line in lines]
             depths = [recursive_count_floors(node) for node in nodes]
             return max(depths) + 1
@@ -114,16 +156,17 @@ class LineSet():
 
     def _calc_geo(self, start=None):
         if start is None:
-            start = self.lowest_lines
-        for line in start:
-            # print(line.number)
+            lines = self._line_order
+        else:
+            lines = self._get_line_order(start)
+
+        # top-down: the lower node is always set before
+        for line in lines:
             if line.upper_node.type == 1:  # no gallery line
                 lower_point = line.lower_node.vec
                 tangential = self.get_tangential_comp(line, lower_point)
                 line.upper_node.vec = lower_point + tangential * line.init_length
 
-                self._calc_geo(self.get_upper_connected_lines(line.upper_node))
-
     def _calc_sag(self, start=None):
         if start is None:
             start = self.lowest_lines
@@ -144,29 +187,29 @@ class LineSet():
 
     # -----CALCULATE SAG-----#
     def _calc_matrix_entries(self, line):
-        up = self.get_upper_connected_lines(line.upper_node)
-        if line.lower_node.type == 0:
-            self.mat.insert_type_0_lower(line)
-        else:
-            lo = self.get_lower_connected_lines(line.lower_node)
-            self.mat.insert_type_1_lower(line, lo[0])
+        upper_lines, lower_lines = self._line_index
+        for line in self._get_line_order([line]):
+            up = upper_lines.get(line.upper_node, [])
+            if line.lower_node.type == 0:
+                self.mat.insert_type_0_lower(line)
+            else:
+                lo = lower_lines.get(line.lower_node, [])
+                self.mat.insert_type_1_lower(line, lo[0])
 
-        if line.upper_node.type == 1:
-            self.mat.insert_type_1_upper(line, up)
-        else:
-            self.mat.insert_type_2_upper(line)
-        for u in up:
-            self._calc_matrix_entries(u)
+            if line.upper_node.type == 1:
+                self.mat.insert_type_1_upper(line, up)
+            else:
+                self.mat.insert_type_2_upper(line)
 
     def calc_forces(self, start_lines):
-        for line_lower in start_lines:
+        upper_lines = self._line_index[0]
+        # bottom-up: the forces of the upper lines are always set before
+        for line_lower in reversed(self._get_line_order(start_lines)):
             upper_node = line_lower.upper_node
             vec = line_lower.diff_vector
             if line_lower.upper_node.type != 2:  # not a gallery line
-                # recursive force-calculation
-                # setting the force from top to down
-                lines_upper = self.get_upper_connected_lines(upper_node)
-                self.calc_forces(lines_upper)
+                # sum up the forces of the upper lines
+                lines_upper = upper_lines.get(upper_node, [])
 
                 force = np.zeros(3)
                 for line in lines_upper:
@@ -187,7 +230,7 @@ class LineSet():
                     line_lower.force = norm(force_projected)
 
     def get_upper_connected_lines(self, node):
-        return [line for line in self.lines if line.lower_node is node]
+        return list(self._line_index[0].get(node, []))
 
     def get_upper_lines(self, node):
         """
@@ -202,7 +245,7 @@ class LineSet():
         return lines
 
     def get_lower_connected_lines(self, node):
-        return [line for line in self.lines if line.upper_node is node]
+        return list(self._line_index[1].get(node, []))
 
     def get_connected_lines(self, node):
         return self.get_upper_connected_lines(node) + self.get_lower_connected_lines(node)
@@ -257,15 +300,8 @@ class LineSet():
         get the points that have influence on the line and
         are connected to the wing
         """
-        upper_node = line.upper_node
-        if upper_node.type == 2:
-            return [upper_node]
-        else:
-            upper_lines = self.get_upper_connected_lines(upper_node)
-            result = []
-            for upper_line in upper_lines:
-                result += self.get_upper_influence_nodes(upper_line)
-            return result
+        return [upper_line.upper_node for upper_line in self._get_line_order([line])
+                if upper_line.upper_node.type == 2]
 
     def iterate_target_length(self, steps=10, pre_load=50):
         """
@@ -376,8 +412,8 @@ class LineSet():
         '''
         get the sum of the forces of all upper-connected lines
         '''
-        force = np.array([0, 0, 0])
-        for line in self.get_upper_connected_lines():
+        force = np.zeros(3)
+        for line in self.get_upper_connected_lines(node):
             force += line.force * line.diff_vector
         return force
 
@@ -400,9 +436,10 @@ class LineSet():
     def __json__(self):
         new = self.copy()
         nodes = list(new.nodes)
+        node_indices = {node: i for i, node in enumerate(nodes)}
         for line in new.lines:
-            line.upper_node = nodes.index(line.upper_node)
-            line.lower_node = nodes.index(line.lower_node)
+            line.upper_node = node_indices[line.upper_node]
+            line.lower_node = node_indices[line.lower_node]
 
         return {
             'lines': new.lines,
@@ -0,0 +1,304 @@
+from __future__ import division
+
+import itertools
+import logging
+
+import numpy as np
+
+from openglider.mesh.mesh import Mesh, Vertex, find_duplicates
+
+logger = logging.getLogger(__name__)
+
+
+class PolygonArray(object):
+    """
+    Ragged array of polygons (lines, triangles, quads,..).
+    The vertex-indices of all polygons are stored in one flat int32-array,
+    polygon i is indices[offsets[i]:offsets[i+1]].
+    """
+    dtype = np.int32
+
+    def __init__(self, indices=None, offsets=None):
+        if indices is None:
+            indices = np.zeros(0, dtype=self.dtype)
+        if offsets is None:
+            offsets = np.array([0, len(indices)] if len(indices) else [0], dtype=self.dtype)
+        self.indices = np.asarray(indices, dtype=self.dtype)
+        self.offsets = np.asarray(offsets, dtype=self.dtype)
+
+    @classmethod
+    def from_list(cls, polygons):
+        """
+        Create from a list of polygons [[i1, i2, i3], [i1, i2, i3, i4],..]
+        or a 2d-array of polygons with the same length (zero-copy)
+        """
+        if isinstance(polygons, cls):
+            return polygons
+        if isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+            num, size = polygons.shape
+            return cls(polygons.reshape(-1), np.arange(num + 1, dtype=cls.dtype) * size)
+
+        polygons = list(polygons)
+        sizes = np.fromiter((len(polygon) for polygon in polygons), dtype=cls.dtype, count=len(polygons))
+        offsets = np.zeros(len(polygons) + 1, dtype=cls.dtype)
+        np.cumsum(sizes, out=offsets[1:])
+        indices = np.fromiter(itertools.chain.from_iterable(polygons), dtype=cls.dtype, count=int(offsets[-1]))
+        return cls(indices, offsets)
+
+    @classmethod
+    def concatenate(cls, arrays, shifts=None):
+        """
+        Join several PolygonArrays, optionally shifting the indices of each array
+        """
+        arrays = list(arrays)
+        if not arrays:
+            return cls()
+        if shifts is None:
+            shifts = [0] * len(arrays)
+
+        indices = np.concatenate([array.indices + shift for array, shift in zip(arrays, shifts)])
+        index_offsets = np.cumsum([0] + [len(array.indices) for array in arrays[:-1]])
+        offsets = np.concatenate([arrays[0].offsets[:1]] +
+                                 [array.offsets[1:] + offset for array, offset in zip(arrays, index_offsets)])
+        return cls(indices, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, item):
+        num = len(self)
+        if item < 0:
+            item += num
+        if not 0 <= item < num:
+            raise IndexError("polygon index out of range: {}".format(item))
+        return self.indices[self.offsets[item]:self.offsets[item + 1]]
+
+    def __iter__(self):
+        for start, end in zip(self.offsets[:-1], self.offsets[1:]):
+            yield self.indices[start:end]
+
+    def __repr__(self):
+        return "PolygonArray ({} polygons)".format(len(self))
+
+    @property
+    def sizes(self):
+        return np.diff(self.offsets)
+
+    def regular(self):
+        """
+        Return a (num_polygons, size) view if all polygons have the same size, None otherwise
+        """
+        sizes = self.sizes
+        if len(sizes) and np.all(sizes == sizes[0]):
+            return self.indices[self.offsets[0]:self.offsets[-1]].reshape(len(sizes), sizes[0])
+        return None
+
+    def tolist(self):
+        return [polygon.tolist() for polygon in self]
+
+    def copy(self):
+        return self.__class__(self.indices.copy(), self.offsets.copy())
+
+    def remap(self, index_map):
+        """
+        Replace every vertex-index i by index_map[i]
+        """
+        return self.__class__(np.asarray(index_map, dtype=self.dtype)[self.indices], self.offsets)
+
+    def triangularize(self):
+        """
+        Split quads into two triangles, keep all other polygons
+        """
+        sizes = self.sizes
+        quads = sizes == 4
+        if not quads.any():
+            return self.copy()
+
+        # every quad [a, b, c, d] becomes [a, b, c], [c, d, a]
+        pattern = np.array([0, 1, 2, 2, 3, 0])
+        new_sizes = np.where(quads, 6, sizes)
+        starts = np.cumsum(new_sizes) - new_sizes
+        polygon_no = np.repeat(np.arange(len(sizes)), new_sizes)
+        local = np.arange(new_sizes.sum()) - starts[polygon_no]
+        local = np.where(quads[polygon_no], pattern[np.minimum(local, 5)], local)
+        indices = self.indices[self.offsets[:-1][polygon_no] + local]
+
+        polygon_sizes = np.repeat(np.where(quads, 3, sizes), np.where(quads, 2, 1))
+        offsets = np.zeros(len(polygon_sizes) + 1, dtype=self.dtype)
+        np.cumsum(polygon_sizes, out=offsets[1:])
+        return self.__class__(indices, offsets)
+
+
+class ArrayMesh(object):
+    """
+    Array-based Mesh: vertices are stored in a (V, 3) float64 array,
+    polygons as PolygonArrays of vertex-indices (per group)
+    and boundaries as index-arrays (per boundary name).
+    """
+    def __init__(self, vertices=None, polygons=None, boundaries=None, name=None):
+        if vertices is None or len(vertices) == 0:
+            vertices = np.zeros((0, 3))
+        self.vertices = np.asarray(vertices, dtype=np.float64)
+        self.polygons = {key: PolygonArray.from_list(value) for key, value in (polygons or {}).items()}
+        self.boundaries = {key: np.asarray(value, dtype=PolygonArray.dtype)
+                           for key, value in (boundaries or {}).items()}
+        self.name = name or "unnamed"
+
+    def __repr__(self):
+        return "ArrayMesh {} ({} faces, {} vertices)".format(self.name,
+                                                            sum(len(polys) for polys in self.polygons.values()),
+                                                            len(self.vertices))
+
+    @classmethod
+    def from_indexed(cls, vertices, polygons, boundaries=None, name=None):
+        return cls(vertices, polygons, boundaries, name)
+
+    def get_indexed(self):
+        """
+        Get [vertices, polygons, boundaries] with references by index (like Mesh.get_indexed)
+        """
+        polygons = {key: value.tolist() for key, value in self.polygons.items()}
+        boundaries = {key: value.tolist() for key, value in self.boundaries.items()}
+        return self.vertices, polygons, boundaries
+
+    @classmethod
+    def from_mesh(cls, mesh):
+        """
+        Convert a (Vertex-based) Mesh
+        """
+        vertices, polygons, boundaries = mesh.get_indexed()
+        vertices = np.array([list(vertex) for vertex in vertices], dtype=np.float64)
+        return cls(vertices, polygons, boundaries, mesh.name)
+
+    def to_mesh(self):
+        """
+        Convert to a (Vertex-based) Mesh
+        """
+        vertices, polygons, boundaries = self.get_indexed()
+        return Mesh.from_indexed(vertices, polygons, boundaries, self.name)
+
+    @property
+    def all_polygons(self):
+        return PolygonArray.concatenate(self.polygons.values())
+
+    @classmethod
+    def concatenate(cls, meshes, name=None):
+        """
+        Join several meshes, the vertex indices of each mesh are shifted accordingly
+        """
+        meshes = list(meshes)
+        if not meshes:
+            return cls(name=name)
+
+        shifts = np.cumsum([0] + [len(mesh.vertices) for mesh in meshes[:-1]])
+        vertices = np.concatenate([mesh.vertices for mesh in meshes])
+
+        polygon_groups = {}
+        boundary_groups = {}
+        for mesh, shift in zip(meshes, shifts):
+            for key, polygons in mesh.polygons.items():
+                polygon_groups.setdefault(key, []).append((polygons, shift))
+            for key, boundary in mesh.boundaries.items():
+                boundary_groups.setdefault(key, []).append(boundary + shift)
+
+        polygons = {key: PolygonArray.concatenate(*zip(*groups)) for key, groups in polygon_groups.items()}
+        boundaries = {key: np.concatenate(groups) for key, groups in boundary_groups.items()}
+
+        return cls(vertices, polygons, boundaries, name or meshes[0].name)
+
+    def __add__(self, other):
+        return self.concatenate([self, other])
+
+    def __iadd__(self, other):
+        joined = self.concatenate([self, other], name=self.name)
+        self.vertices = joined.vertices
+        self.polygons = joined.polygons
+        self.boundaries = joined.boundaries
+        return self
+
+    def copy(self):
+        return self.__class__(self.vertices.copy(),
+                              {key: value.copy() for key, value in self.polygons.items()},
+                              {key: value.copy() for key, value in self.boundaries.items()},
+                              self.name)
+
+    def triangularize(self):
+        """
+        Make triangles from quads
+        """
+        polygons = {key: value.triangularize() for key, value in self.polygons.items()}
+        return self.__class__(self.vertices, polygons, self.boundaries, self.name)
+
+    def delete_duplicates(self, boundaries=None, tolerance=None):
+        """
+        Join equal vertices of the boundaries and delete the unused copies
+        :param boundaries: list of boundary names to be joined (None->all)
+        :param tolerance: maximum coordinate difference of equal nodes (default: Vertex.dmin)
+        :return: remap-array (new index for every old vertex index)
+        """
+        if tolerance is None:
+            tolerance = Vertex.dmin
+        boundaries = boundaries or self.boundaries.keys()
+        num_vertices = len(self.vertices)
+
+        candidates = [self.boundaries[name] for name in boundaries]
+        if candidates:
+            candidates = np.unique(np.concatenate(candidates))
+        else:
+            candidates = np.zeros(0, dtype=PolygonArray.dtype)
+        targets = np.arange(num_vertices)
+        targets[candidates] = candidates[find_duplicates(self.vertices[candidates], tolerance)]
+
+        keep = targets == np.arange(num_vertices)
+        new_indices = np.cumsum(keep) - 1
+        remap = new_indices[targets]
+
+        for boundary_name, boundary in self.boundaries.items():
+            boundary_keep = keep[boundary]
+            self.boundaries[boundary_name] = new_indices[boundary[boundary_keep]].astype(PolygonArray.dtype)
+            logger.info("deleted {} duplicated Vertices for boundary group <{}> ".format(
+                len(boundary) - boundary_keep.sum(), boundary_name))
+
+        self.vertices = self.vertices[keep]
+        self.polygons = {key: value.remap(remap) for key, value in self.polygons.items()}
+
+        return remap
+
+    def export(self, path, filetype=None, **kwargs):
+        """
+        Export to obj, ply (binary), stl (binary) or vtu (vtk xml), the filetype defaults to the file-ending
+        """
+        from openglider.mesh.export import EXPORT_MESH
+        filetype = filetype or path.split(".")[-1]
+        return EXPORT_MESH[filetype](self, path, **kwargs)
+
+    def export_obj(self, path=None, offset=0):
+        from openglider.mesh.export import export_obj
+        return export_obj(self, path, offset)
+
+    def export_ply(self, path):
+        from openglider.mesh.export import export_ply
+        return export_ply(self, path)
+
+    def export_stl(self, path):
+        from openglider.mesh.export import export_stl
+        return export_stl(self, path)
+
+    def export_vtu(self, path, encoding="raw"):
+        from openglider.mesh.export import export_vtu
+        return export_vtu(self, path, encoding)
+
+    def round(self, places):
+        np.round(self.vertices, places, out=self.vertices)
+        return self
+
+    def __json__(self):
+        vertices, polygons, boundaries = self.get_indexed()
+        return {
+            "vertices": vertices.tolist(),
+            "polygons": polygons,
+            "boundaries": boundaries,
+            "name": self.name
+        }
+
+    __from_json__ = from_indexed
@@ -0,0 +1,234 @@
+"""
+Exporters for ArrayMesh objects.
+The arrays are written to disk in chunks, no intermediate strings/lists per vertex.
+"""
+from __future__ import division
+
+import base64
+import contextlib
+import io
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+# vtk cell types (see vtkCellType.h)
+VTK_VERTEX = 1
+VTK_LINE = 3
+VTK_TRIANGLE = 5
+VTK_POLYGON = 7
+VTK_QUAD = 9
+
+CHUNK_SIZE = 3 * 2**20  # bytes, multiple of 3 for base64
+
+
+@contextlib.contextmanager
+def _open(path_or_file, mode):
+    if hasattr(path_or_file, "write"):
+        yield path_or_file
+    else:
+        with open(path_or_file, mode) as outfile:
+            yield outfile
+
+
+def _runs(sizes):
+    """
+    Get [start, end, size] of the runs of polygons with the same size
+    """
+    if not len(sizes):
+        return []
+    breaks = np.flatnonzero(np.diff(sizes)) + 1
+    starts = np.concatenate([[0], breaks])
+    ends = np.concatenate([breaks, [len(sizes)]])
+    return zip(starts.tolist(), ends.tolist(), sizes[starts].tolist())
+
+
+def export_obj(mesh, path=None, offset=0):
+    """
+    Export to wavefront-obj
+    :param mesh: ArrayMesh
+    :param path: filename or file object, return the file-content as a string if None
+    :param offset: index offset (for multiple objects within one file)
+    """
+    outfile = io.StringIO() if path is None else path
+
+    with _open(outfile, "w") as outfile:
+        np.savetxt(outfile, mesh.vertices, fmt="v %.6f %.6f %.6f")
+
+        for polygon_group_name, polygons in mesh.polygons.items():
+            outfile.write(u"o {}\n".format(polygon_group_name))
+            for start, end, size in _runs(polygons.sizes):
+                # line or face
+                code = "l" if size == 2 else "f"
+                indices = polygons.indices[polygons.offsets[start]:polygons.offsets[end]]
+                np.savetxt(outfile, indices.reshape(end - start, size).astype(np.int64) + offset + 1,
+                           fmt=code + " %d" * size)
+
+        if path is None:
+            return outfile.getvalue()
+
+
+def export_ply(mesh, path):
+    """
+    Export to binary (little endian) ply.
+    Every polygon group gets a material (colour from the group name: "name#rrggbb"),
+    faces reference it by material_index. Lines are skipped.
+    """
+    from openglider.mesh.mesh import Mesh
+
+    groups = [(name, polygons) for name, polygons in mesh.polygons.items()]
+    num_faces = sum(int(np.sum(polygons.sizes > 2)) for _, polygons in groups)
+
+    header = [
+        "ply",
+        "format binary_little_endian 1.0",
+        "comment exported using openglider",
+        "element vertex {}".format(len(mesh.vertices)),
+        "property float x",
+        "property float y",
+        "property float z",
+        "element face {}".format(num_faces),
+        "property list uchar int vertex_indices",
+        "property int material_index",
+        "element material {}".format(len(groups)),
+        "property uchar diffuse_red",
+        "property uchar diffuse_green",
+        "property uchar diffuse_blue",
+        "end_header"
+    ]
+
+    with _open(path, "wb") as outfile:
+        outfile.write(("\n".join(header) + "\n").encode("ascii"))
+        outfile.write(mesh.vertices.astype("<f4").tobytes())
+
+        for material_index, (_, polygons) in enumerate(groups):
+            for start, end, size in _runs(polygons.sizes):
+                if size <= 2:
+                    continue
+                face_type = np.dtype([("num", "u1"), ("indices", "<i4", (size,)), ("material", "<i4")])
+                faces = np.empty(end - start, dtype=face_type)
+                faces["num"] = size
+                faces["indices"] = polygons.indices[polygons.offsets[start]:polygons.offsets[end]].reshape(-1, size)
+                faces["material"] = material_index
+                outfile.write(faces.tobytes())
+
+        colors = [Mesh.parse_color_code(name) for name, _ in groups]
+        outfile.write(np.array(colors, dtype="u1").reshape(-1, 3).tobytes())
+
+
+def export_stl(mesh, path, name="openglider"):
+    """
+    Export to binary stl (quads are split into triangles, lines and other polygons are skipped)
+    """
+    triangle_type = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+    triangle_groups = []
+    for polygons in mesh.polygons.values():
+        polygons = polygons.triangularize()
+        triangles = polygons.sizes == 3
+        starts = polygons.offsets[:-1][triangles]
+        triangle_groups.append(polygons.indices[starts[:, np.newaxis] + np.arange(3)])
+
+    num_triangles = sum(len(triangles) for triangles in triangle_groups)
+
+    with _open(path, "wb") as outfile:
+        outfile.write(name.encode("ascii", "replace")[:80].ljust(80, b" "))
+        outfile.write(np.array(num_triangles, dtype="<u4").tobytes())
+
+        for triangles in triangle_groups:
+            for start in range(0, len(triangles), CHUNK_SIZE // triangle_type.itemsize):
+                points = mesh.vertices[triangles[start:start + CHUNK_SIZE // triangle_type.itemsize]]
+                normals = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+                lengths = np.linalg.norm(normals, axis=1)
+                normals /= np.where(lengths > 0, lengths, 1)[:, np.newaxis]
+
+                data = np.zeros(len(points), dtype=triangle_type)
+                data["normal"] = normals
+                data["vertices"] = points
+                outfile.write(data.tobytes())
+
+
+def _vtk_cell_types(sizes):
+    cell_types = np.full(len(sizes), VTK_POLYGON, dtype=np.uint8)
+    for size, cell_type in ((1, VTK_VERTEX), (2, VTK_LINE), (3, VTK_TRIANGLE), (4, VTK_QUAD)):
+        cell_types[sizes == size] = cell_type
+    return cell_types
+
+
+def export_vtu(mesh, path, encoding="raw"):
+    """
+    Export to a vtk xml unstructured grid (.vtu) with appended data.
+    The polygon group of every cell is stored in the cell data ("group"),
+    every boundary is stored as point data (1 for boundary nodes).
+    :param encoding: "raw" or "base64"
+    """
+    if encoding not in ("raw", "base64"):
+        raise ValueError("Invalid encoding: {}".format(encoding))
+
+    polygons = mesh.all_polygons
+    group_names = list(mesh.polygons.keys())
+    groups = np.repeat(np.arange(len(group_names), dtype=np.int32),
+                       [len(group) for group in mesh.polygons.values()])
+
+    point_data = []
+    for boundary_name, boundary in mesh.boundaries.items():
+        values = np.zeros(len(mesh.vertices), dtype=np.uint8)
+        values[boundary] = 1
+        point_data.append((boundary_name, "UInt8", 1, values))
+
+    arrays = [
+        ("Points", [("Points", "Float64", 3, mesh.vertices)]),
+        ("Cells", [("connectivity", "Int32", 1, polygons.indices),
+                   ("offsets", "Int32", 1, polygons.offsets[1:]),
+                   ("types", "UInt8", 1, _vtk_cell_types(polygons.sizes))]),
+        ("CellData", [("group", "Int32", 1, groups)]),
+        ("PointData", point_data)
+    ]
+    dtypes = {"Float64": "<f8", "Int32": "<i4", "UInt8": "u1"}
+
+    def encoded_size(nbytes):
+        if encoding == "raw":
+            return 8 + nbytes
+        return 12 + 4 * ((nbytes + 2) // 3)  # 8 byte header -> 12 base64 chars
+
+    lines = ['<?xml version="1.0"?>',
+             '<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64">',
+             '<UnstructuredGrid>',
+             '<Piece NumberOfPoints="{}" NumberOfCells="{}">'.format(len(mesh.vertices), len(polygons))]
+
+    offset = 0
+    data = []
+    for section, section_arrays in arrays:
+        lines.append("<{}>".format(section))
+        for array_name, vtk_type, components, values in section_arrays:
+            values = np.ascontiguousarray(values, dtype=dtypes[vtk_type])
+            lines.append('<DataArray type="{}" Name={} NumberOfComponents="{}" format="appended" offset="{}"/>'.format(
+                vtk_type, quoteattr(array_name), components, offset))
+            offset += encoded_size(values.nbytes)
+            data.append(values)
+        lines.append("</{}>".format(section))
+
+    lines += ['</Piece>',
+              '</UnstructuredGrid>',
+              '<AppendedData encoding="{}">'.format(encoding)]
+
+    with _open(path, "wb") as outfile:
+        outfile.write(("\n".join(lines) + "\n_").encode("ascii"))
+        for values in data:
+            header = np.array(values.nbytes, dtype="<u8").tobytes()
+            buffer = memoryview(values.reshape(-1).view(np.uint8))
+            if encoding == "raw":
+                outfile.write(header)
+                outfile.write(buffer)
+            else:
+                outfile.write(base64.b64encode(header))
+                for start in range(0, len(buffer), CHUNK_SIZE):
+                    outfile.write(base64.b64encode(buffer[start:start + CHUNK_SIZE]))
+
+        outfile.write(b"\n</AppendedData>\n</VTKFile>\n")
+
+
+EXPORT_MESH = {
+    "obj": export_obj,
+    "ply": export_ply,
+    "stl": export_stl,
+    "vtu": export_vtu
+}
@@ -10,106 +10,108 @@ from __future__ import division
 
 import numpy as np
 from numpy.linalg import norm
-np.set_printoptions(3, suppress=True)
+
 
 class LSCM(object):
+    """
+    Least squares conformal map of a triangle-mesh to the plane.
+    The system is assembled as a sparse matrix (scipy.sparse), two vertices are pinned.
+    """
     def __init__(self, vertices, triangles):
-        self.vertices = np.array(vertices) # n x 3
-        self.triangles = np.array(triangles) # m x 3
-        self.areas = []; self._set_areas() # m
-
-    def run(self):
-        M = self.complex_M
-        M_r = np.real(M)
-        M_i = np.imag(M)
-        M_r_f = M_r[:,2:]   # the first two x_pos are fixed
-        M_i_f = M_i[:,2:]   # the first two y_pos are fixed
-        M_r_p = M_r[:,:2]
-        M_i_p = M_i[:,:2]
-        M = np.bmat([[M_r_f, -M_i_f], [M_i_f, M_r_f]])
-        M_rhs = np.bmat([[M_r_p, -M_i_p], [M_i_p, M_r_p]])
-        l = norm(self.vertices[1] -self.vertices[0])
-        U_known = np.array([0, 1, 0, 0], float)
-        rhs = -np.array(M_rhs.dot(U_known))[0]
-        print(M_rhs.dot(U_known))
-        sol = np.linalg.lstsq(M, rhs)[0]
-        length_k = len(U_known) / 2.
-        length_u = len(sol) / 2.
-        x_values = np.hstack([U_known[:length_k], sol[:length_u]])
-        y_values = np.hstack([U_known[length_k:], sol[length_u:]])
-        return np.array([x_values, y_values]).T
-
-    def run_1(self):
-        M = self.complex_M
-        M_r = np.real(M)
-        M_i = np.imag(M)
-        M = np.bmat([[M_r, -M_i], [M_i, M_r]])
-        _, _, v = np.linalg.svd(M)
-        xy = v[:,-1]
-        length_u = len(self.vertices)
-        x_values = xy[:length_u]
-        y_values = xy[length_u:]
-        return np.array([x_values, y_values]).T[0]
-
-    def run_2(self):
-        """using (Z1 - Z0)(U2 - U0) = (Z2 - Z0)(U1 - U0) from nl"""
-        M = np.ndarray([len(self.triangles) * 2, len(self.vertices) * 2], float)
-        for i, tri in enumerate(self.triangles):
-            verts_2d = self.triangle_to_2d(tri)
-            x10, y10 = verts_2d[1] - verts_2d[0]
-            x20, y20 = verts_2d[2] - verts_2d[0]
-
-            M[2 * i, tri[0] * 2] = x20 - x10
-            M[2 * i, tri[0] * 2 + 1] =- y20 #+  y10 
-            M[2 * i, tri[1] * 2] = -x20
-            M[2 * i, tri[1] * 2 + 1] = y20
-            M[2 * i, tri[2] * 2] = x10
-            # M[2 * i, tri[2] * 2 + 1] = -y10
-
-            M[2 * i + 1, tri[0] * 2] = y20 #- y10
-            M[2 * i + 1, tri[0] * 2 + 1] = x20 - x10
-            M[2 * i + 1, tri[1] * 2] = -y20
-            M[2 * i + 1, tri[1] * 2 + 1] = -x20
-            # M[2 * i + 1, tri[2] * 2] = y10
-            M[2 * i + 1, tri[2] * 2 + 1] = x10
-
-        # pinning:
-        # 1: get min and max x indices
-        # 2: get array of projected positions of pinned verts
-        # 2.1: sort the list (lowest number first)
-        # 3: create rhs and pop from matrix
-        # 4: find solution and insert knowen values
+        self.vertices = np.array(vertices, dtype=float)  # n x 3
+        self.triangles = np.array(triangles, dtype=int)  # m x 3
+        self.areas = self._get_areas()  # m
+
+    def run(self, method="spsolve"):
+        """
+        Solve the (pinned) least squares problem
+        :param method: "spsolve" (normal equations) or "lsqr"
+        :return: (n, 2) array of the flattened vertices
+        """
+        import scipy.sparse
+        import scipy.sparse.linalg
+
+        num = len(self.vertices)
+        M_r, M_i = self.real_M
+        M = scipy.sparse.bmat([[M_r, -M_i], [M_i, M_r]], format="csc")
+
+        # unknowns: [x_0, .., x_n, y_0, .., y_n]
         known, pin = self.get_pin_verts()
-        M_r = M[:,pin]
-        M = np.delete(M, pin, (1))
-        rhs = np.array([M_r.dot(known)])[0]
-        print(rhs)
-        sol = np.linalg.lstsq(M, -rhs)[0]
-        for i, pos in enumerate(pin):
-            sol = np.insert(sol, pos, known[i])
-        return np.array([sol[::2], sol[1::2]]).T
+        free = np.ones(2 * num, dtype=bool)
+        free[pin] = False
+        M_f = M[:, free]
+        rhs = -M[:, pin].dot(known)
+
+        if method == "lsqr":
+            sol = scipy.sparse.linalg.lsqr(M_f, rhs, atol=1e-12, btol=1e-12)[0]
+        elif method == "spsolve":
+            sol = scipy.sparse.linalg.spsolve(M_f.T.dot(M_f).tocsc(), M_f.T.dot(rhs))
+        else:
+            raise ValueError("Invalid method: {}".format(method))
+
+        uv = np.zeros(2 * num)
+        uv[free] = sol
+        uv[pin] = known
+        flattened = np.array([uv[:num], uv[num:]]).T
+
+        # the pinned distance is the chord, which is too short for curved meshes:
+        # scale to the area of the 3d-mesh (the first pinned vertex stays at the origin)
+        a, b, c = flattened[self.triangles].transpose(1, 0, 2)
+        areas_2d = np.abs((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+        if areas_2d.sum() > 0:
+            flattened *= np.sqrt(self.areas.sum() / areas_2d.sum())
+
+        return flattened
 
+    @property
+    def complex_M(self):
+        """
+        Sparse (m x n) complex matrix of the conformality-condition per triangle
+        """
+        M_r, M_i = self.real_M
+        return (M_r + 1j * M_i).tocsr()
 
+    @property
+    def real_M(self):
+        """
+        Real and imaginary part of complex_M as sparse matrices
+        """
+        import scipy.sparse
+
+        valid = self.areas > 0  # skip degenerated triangles
+        triangles = self.triangles[valid]
+        verts_2d = self.triangles_2d[valid]
+        W = np.array([
+            verts_2d[:, 2] - verts_2d[:, 1],
+            verts_2d[:, 0] - verts_2d[:, 2],
+            verts_2d[:, 1] - verts_2d[:, 0]
+        ]).transpose(1, 0, 2)  # m x 3 x 2
+        W /= np.sqrt(self.areas[valid])[:, np.newaxis, np.newaxis]
+
+        rows = np.repeat(np.arange(len(triangles)), 3)
+        cols = triangles.reshape(-1)
+        shape = (len(triangles), len(self.vertices))
+        M_r = scipy.sparse.coo_matrix((W[:, :, 0].reshape(-1), (rows, cols)), shape=shape).tocsr()
+        M_i = scipy.sparse.coo_matrix((W[:, :, 1].reshape(-1), (rows, cols)), shape=shape).tocsr()
+        return M_r, M_i
+
+    def _get_areas(self):
+        if not len(self.triangles):
+            return np.zeros(0)
+        a, b, c = self.vertices[self.triangles].transpose(1, 0, 2)
+        return norm(np.cross(b - a, c - b), axis=1)
 
     @property
-    def complex_M(self):
-        M = np.zeros([len(self.triangles), len(self.vertices)], np.complex)
-        for i, tri in enumerate(self.triangles):
-            verts_2d = self.triangle_to_2d(tri)
-            W = np.array([
-                    vector2_to_complex(verts_2d[2] - verts_2d[1]),
-                    vector2_to_complex(verts_2d[0] - verts_2d[2]),
-                    vector2_to_complex(verts_2d[1] - verts_2d[0])
-                ], np.complex)
-            for k, j in enumerate(tri):
-                M[i, j] = W[k] / np.sqrt(self.areas[i])
-        return M
-    
-
-    def _set_areas(self):
-        for tri in self.triangles:
-            a, b, c = self.vertices[tri]
-            self.areas.append(norm(np.cross(b - a, c - b)))
+    def triangles_2d(self):
+        """return a 2d representation of every triangle (m x 3 x 2)"""
+        points = self.vertices[self.triangles]
+        a, b, c = points.transpose(1, 0, 2)
+        x = a - b
+        x /= norm(x, axis=1)[:, np.newaxis]
+        z = np.cross(a - c, x)
+        z /= norm(z, axis=1)[:, np.newaxis]
+        y = np.cross(z, x)
+        return np.einsum("mkj,mdj->mkd", points, np.array([x, y]).transpose(1, 0, 2))
 
     def triangle_to_2d(self, tri):
         """return a 2d representation of a triangle"""
@@ -128,60 +130,43 @@ class LSCM(object):
         triangles = []
         with open(file_path, "r") as _file:
             for line in _file:
-                if line[0] =="v":
-                    vertices.append(map(float, line.split(" ")[1:]))
+                if line[0] == "v":
+                    vertices.append(list(map(float, line.split()[1:])))
                 if line[0] == "f":
-                    triangles.append(map(int, line.split(" ")[1:]))
+                    triangles.append(list(map(int, line.split()[1:])))
         vertices = np.array(vertices)
         triangles = np.array(triangles)
         triangles -= 1
         return cls(vertices, triangles)
 
     def get_pin_verts(self):
-        v_x = self.vertices.T[0]
-        mn = v_x.argmin()
-        mx = v_x.argmax()
-        # sort the list
-        if mn > mx:
-            mx, mn = mn, mx
-        known = np.array([self.vertices[mn][0],
-                          self.vertices[mn][1],
-                          self.vertices[mx][0],
-                          self.vertices[mx][1]])
-        pin = np.array([mn*2, mn*2+1, mx*2, mx*2+1])
+        """
+        Pin the two outermost vertices along the main direction of the mesh,
+        they are placed at (0, 0) and (d, 0) with d being their 3d-distance.
+        (run scales the result to the area of the 3d-mesh afterwards)
+        :return: known values, indices of the pinned unknowns ([x_0, .., x_n, y_0, .., y_n])
+        """
+        num = len(self.vertices)
+        centered = self.vertices - self.vertices.mean(axis=0)
+        direction = np.linalg.svd(centered, full_matrices=False)[2][0]
+        projected = centered.dot(direction)
+        mn = projected.argmin()
+        mx = projected.argmax()
+
+        known = np.array([0, norm(self.vertices[mx] - self.vertices[mn]), 0, 0])
+        pin = np.array([mn, mx, num + mn, num + mx])
         return known, pin
-                    
-
-def vector2_to_complex(vector):
-    return vector[0] + 1j * vector[1]
-
 
 
 if __name__ == "__main__":
-    # vertices = np.array([
-    #         [0, 0., 0.5],
-    #         [-1, -1, 0],
-    #         [1, -1, 0],
-    #         [1, 1, 0],
-    #         [-1, 1, 0]
-    #     ], float)
-
-    # triangles = np.array([
-    #         [0, 1, 2],
-    #         [0, 2, 3],
-    #         [0, 3, 4],
-    #         [0, 4, 1]
-    #     ], int)
-    # lscm = LSCM(vertices, triangles)
-    # lscm = LSCM.from_obj("/home/lo/tmp/blender/uv_1.obj")
-    # lscm  =LSCM.from_obj("/home/lo/tmp/blender/uv_cylinder.obj")
-    lscm  =LSCM.from_obj("/home/lo/tmp/blender/uv_half_torus.obj")
-    v = lscm.run_2()
-    print(v)
+    import sys
     import matplotlib.pyplot as plt
+
+    lscm = LSCM.from_obj(sys.argv[1])
+    v = lscm.run()
     tri = lscm.triangles.T
     tri = np.array([tri[0], tri[1], tri[2], tri[0]]).T
 
     plt.axes().set_aspect('equal', 'datalim')
     plt.plot(*v[tri].T)
-    plt.show()
\ No newline at end of file
+    plt.show()
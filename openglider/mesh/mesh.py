@@ -1,14 +1,26 @@
 from __future__ import division
 
+import itertools
+import logging
+
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 try:
     import meshpy.triangle as mptriangle
     from openglider.mesh.meshpy_triangle import custom_triangulation
     USE_POLY_TRI = False
+    USE_SCIPY_TRI = False
 except ImportError as e:
-    print("!!!!NOT ABLE TO IMPORT MESHPY, MESH-CREATION WILL BE SLOW")
-    print(e)
+    try:
+        from openglider.mesh.scipy_triangle import triangulate
+        logger.info("meshpy not available ({}), using scipy-delaunay".format(e))
+        USE_SCIPY_TRI = True
+    except ImportError:
+        print("!!!!NOT ABLE TO IMPORT MESHPY, MESH-CREATION WILL BE SLOW")
+        print(e)
+        USE_SCIPY_TRI = False
     from .poly_tri import PolyTri
     USE_POLY_TRI = True
 
@@ -90,7 +102,7 @@ class Mesh(object):
 
     @property
     def all_polygons(self):
-        return sum(self.polygons.values(), [])
+        return list(itertools.chain.from_iterable(self.polygons.values()))
 
     def get_indexed(self):
         """
@@ -151,6 +163,12 @@ class Mesh(object):
                     vertices += list(hole_vertices)
             if not filled:
                 return cls.from_indexed(rib.align_all(vertices), {'hole': boundaries}, {})
+            if USE_SCIPY_TRI:
+                segments = [[boundary[i], boundary[i+1]] for boundary in boundaries for i in range(len(boundary) - 1)]
+                vertices, tris = triangulate(vertices, segments, quality="q" in mesh_option,
+                                             split_segments="Y" not in mesh_option)
+                vertices = rib.align_all(vertices)
+                return cls.from_indexed(vertices, polygons={"ribs": tris}, boundaries={rib.name: range(len(vertices))})
             tris = PolyTri(np.array(vertices), boundaries, holes=True, delaunay=True).get_tris()
             if not tris:
                 print(np.array(vertices))
@@ -235,13 +253,7 @@ class Mesh(object):
             # segment.append([edge[-1], edge[0]])
             point_array = np.array([point for line in point_array for point in line]) #flatten
             points2d = map_to_2d(point_array)
-            if USE_POLY_TRI:
-                tris = PolyTri(np.array(points2d)).get_tris()
-            else:
-                mesh_info = mptriangle.MeshInfo()
-                mesh_info.set_points(points2d)
-                mesh = custom_triangulation(mesh_info, "Qz")
-                tris = list(mesh.elements)
+            tris = triangulate_points(points2d)
             return cls.from_indexed(point_array, 
                                     {"diagonals": tris}, 
                                     {cell.rib1.name: number_array[0], 
@@ -288,24 +300,8 @@ class Mesh(object):
     __from_json__ = from_indexed
 
     def export_obj(self, path=None, offset=0):
-        vertices, polygons, boundaries = self.get_indexed()
-        out = ""
-
-        for vertex in vertices:
-            out += "v {:.6f} {:.6f} {:.6f}\n".format(*vertex)
-
-        for polygon_group_name, polygons in polygons.items():
-            out += "o {}\n".format(polygon_group_name)
-            for obj in polygons:
-                if len(obj) == 2:
-                    # line
-                    code = "l"
-                else:
-                    # face
-                    code = "f"
-
-                out += " ".join([code] + [str(x+offset+1) for x in obj])
-                out += "\n"
+        from openglider.mesh.array_mesh import ArrayMesh
+        out = ArrayMesh.from_mesh(self).export_obj(offset=offset)
 
         if path:
             with open(path, "w") as outfile:
@@ -358,65 +354,8 @@ class Mesh(object):
         return dwg
 
     def export_ply(self, path):
-        vertices, polygons, boundaries = self.get_indexed()
-
-        material_lines = []
-        panels_lines = []
-
-        for i, polygon_group_name in enumerate(polygons):
-            color = self.parse_color_code(polygon_group_name)
-
-            color_str = " {} {} {} 1".format(*color)
-
-            material_lines.append(" ".join([color_str]*3))
-
-            for obj in polygons[polygon_group_name]:
-                if len(obj) > 2:
-                    out_str = str(len(obj))
-                    for x in obj:
-                        out_str += " {}".format(x)
-                    out_str += " {}".format(i)
-                    panels_lines.append(out_str)
-
-        with open(path, "w") as outfile:
-            outfile.write("ply\n")
-            outfile.write("format ascii 1.0\n")
-            outfile.write("comment exported using openglider\n")
-
-            outfile.write("element vertex {}\n".format(len(vertices)))
-            for coord in ("x", "y", "z"):
-                outfile.write("property float32 {}\n".format(coord))
-
-
-            # outfile.write("element material {}\n".format(len(material_lines)))
-            # outfile.write("property ambient_red uchar\n")
-            # outfile.write("property ambient_green uchar\n")
-            # outfile.write("property ambient_blue uchar\n")
-            # outfile.write("property ambient_coeff float\n")
-            # outfile.write("property diffuse_red uchar\n")
-            # outfile.write("property diffuse_green uchar\n")
-            # outfile.write("property diffuse_blue uchar\n")
-            # outfile.write("property diffuce_coeff float\n")
-            # outfile.write("property specular_red uchar\n")
-            # outfile.write("property specular_green uchar\n")
-            # outfile.write("property specular_blue uchar\n")
-            # outfile.write("property specular_coeff float\n")
-
-            outfile.write("element face {}\n".format(len(panels_lines)))
-            outfile.write("property list uchar uint vertex_indices\n")
-            #outfile.write("property material_index int\n")
-
-            outfile.write("end_header\n")
-
-            for vertex in vertices:
-                outfile.write("{:.6f} {:.6f} {:.6f}\n".format(*vertex))
-
-            for material_line in material_lines:
-                outfile.write(material_line + "\n")
-
-            for panel_line in panels_lines:
-                #print(panel_line)
-                outfile.write(panel_line + "\n")
+        from openglider.mesh.array_mesh import ArrayMesh
+        ArrayMesh.from_mesh(self).export_ply(path)
 
     def export_collada(self):
         import collada
@@ -454,55 +393,96 @@ class Mesh(object):
     # def __iadd__(self, other):
     #     self = self + other
 
-    def delete_duplicates(self, boundaries=None):
+    def delete_duplicates(self, boundaries=None, tolerance=None):
         """
         :param boundaries: list of boundary names to be joined (None->all)
+        :param tolerance: maximum coordinate difference of equal nodes (default: Vertex.dmin)
         :return: Mesh (self)
         """
-
+        if tolerance is None:
+            tolerance = Vertex.dmin
         boundaries = boundaries or self.boundary_nodes.keys()
-        replace_dict = {}
-        all_boundary_nodes = sum([self.boundary_nodes[name] for name in boundaries], [])
+        all_boundary_nodes = list(itertools.chain.from_iterable(self.boundary_nodes[name] for name in boundaries))
+        # unique nodes, keeping the order
+        all_boundary_nodes = list(dict.fromkeys(all_boundary_nodes))
 
-        for i, node1 in enumerate(all_boundary_nodes[:-1]):
-            if node1 not in replace_dict:
-                for j, node2 in enumerate(all_boundary_nodes[i:]):
-                    if node1 is not node2 and node1.is_equal(node2):
-                        replace_dict[node2] = node1
+        remap = find_duplicates([list(node) for node in all_boundary_nodes], tolerance)
+        replace_dict = {node: all_boundary_nodes[target]
+                        for node, target in zip(all_boundary_nodes, remap) if node is not all_boundary_nodes[target]}
 
         for boundary_name, boundary_nodes in self.boundary_nodes.items():
-            to_remove = []
-            for i, node in enumerate(boundary_nodes):
-                if node in replace_dict:
-                    to_remove.append(i)
-            for i in to_remove[::-1]:
-                boundary_nodes.pop(i)
-
-            print("deleted {} duplicated Vertices for boundary group <{}> ".format(
-                len(to_remove), boundary_name))
-
-        for polygon in self.all_polygons:
-            for i, node in enumerate(polygon):
-                if node in replace_dict:
-                    polygon[i] = replace_dict[node]
-
-        # delete duplicated nodes in every element
-        polygons = []
-        for group_name, poly_group in self.polygons.items():
-            for i, polygon in enumerate(poly_group):
-                poly_set = set(polygon)
-                new_polygon = [node for node in polygon if node in poly_set]
-                self.polygons[group_name][i] = new_polygon
-
-        vertices = self.vertices
-        for boundary_name in boundaries:
-            for i, node in enumerate(self.boundary_nodes[boundary_name]):
-                if node not in vertices:
-                    print("no")
-                    print(node in replace_dict)
+            num_nodes = len(boundary_nodes)
+            boundary_nodes[:] = [node for node in boundary_nodes if node not in replace_dict]
+
+            logger.info("deleted {} duplicated Vertices for boundary group <{}> ".format(
+                num_nodes - len(boundary_nodes), boundary_name))
+
+        if replace_dict:
+            for polygon in self.all_polygons:
+                for i, node in enumerate(polygon):
+                    if node in replace_dict:
+                        polygon[i] = replace_dict[node]
+
         return self
 
 
+def find_duplicates(vertices, tolerance=Vertex.dmin):
+    """
+    Find equal vertices (all coordinate differences <= tolerance) by hashing the
+    quantized coordinates. The grid (cell-size 2*tolerance) is shifted by
+    0/tolerance in every direction, so two close vertices always share a cell
+    in one of the 8 grids; vertices up to 2*tolerance apart might get joined too.
+    :param vertices: (n, 3) array
+    :return: remap-array: index of the (first) equal vertex for every vertex
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    num = len(vertices)
+    labels = np.arange(num)
+    if num < 2:
+        return labels
+
+    cell_size = 2. * tolerance
+    groups = []
+    for shift in itertools.product([0., tolerance], repeat=3):
+        keys = np.floor((vertices + shift) / cell_size).astype(np.int64)
+        _, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        if inverse.max() + 1 < num:  # otherwise there are no shared cells
+            groups.append(inverse)
+
+    # union-find: every label points to the smallest index of its cluster
+    changed = bool(groups)
+    while changed:
+        labels_old = labels
+        for inverse in groups:
+            group_min = np.full(inverse.max() + 1, num)
+            np.minimum.at(group_min, inverse, labels)
+            labels = np.minimum(labels, group_min[inverse])
+            # pointer-jumping
+            labels_next = labels[labels]
+            while np.any(labels_next != labels):
+                labels = labels_next
+                labels_next = labels[labels]
+        changed = np.any(labels != labels_old)
+
+    return labels
+
+
+def triangulate_points(points2d):
+    """
+    Delaunay-triangulation of 2d points with the available backend (meshpy, scipy, PolyTri)
+    """
+    if not USE_POLY_TRI:
+        mesh_info = mptriangle.MeshInfo()
+        mesh_info.set_points(points2d)
+        mesh = custom_triangulation(mesh_info, "Qz")
+        return list(mesh.elements)
+    elif USE_SCIPY_TRI:
+        return triangulate(points2d)[1].tolist()
+    else:
+        return PolyTri(np.array(points2d)).get_tris()
+
+
 def apply_z(vertices):
     v = vertices.T
     return np.array([v[0], np.zeros(len(v[0]), v[1])]).T
@@ -0,0 +1,319 @@
+"""
+Constrained (conforming) delaunay triangulation based on scipy.spatial.Delaunay,
+used if meshpy is not available.
+"""
+from __future__ import division
+
+import numpy as np
+import scipy.spatial
+
+CHUNK_SIZE = 1024
+
+
+def _edge_keys(edges, num_points):
+    edges = np.sort(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=1)
+    return edges[:, 0] * num_points + edges[:, 1]
+
+
+def _delaunay(points):
+    return scipy.spatial.Delaunay(points).simplices
+
+
+def _missing_segments(triangles, segments, num_points):
+    """
+    Mask of the segments which are not an edge of the triangulation
+    """
+    edge_keys = _edge_keys(triangles[:, [0, 1, 1, 2, 2, 0]], num_points)
+    return ~np.isin(_edge_keys(segments, num_points), edge_keys)
+
+
+def _insert_segments(points, segments, max_iterations=50):
+    """
+    Split the segments (at the midpoint) until all of them are edges of the delaunay triangulation
+    :return: points, segments, triangles
+    """
+    triangles = _delaunay(points)
+    for _ in range(max_iterations):
+        if not len(segments):
+            break
+        missing = _missing_segments(triangles, segments, len(points))
+        if not missing.any():
+            break
+
+        points, segments = _split_segments(points, segments, missing)
+        triangles = _delaunay(points)
+
+    return points, segments, triangles
+
+
+def _split_segments(points, segments, split):
+    """
+    Split the segments (mask) at their midpoints (appended to points)
+    """
+    split_segments = segments[split]
+    midpoint_indices = np.arange(len(split_segments)) + len(points)
+    points = np.concatenate([points, points[split_segments].mean(axis=1)])
+    segments = np.concatenate([segments[~split],
+                               np.array([split_segments[:, 0], midpoint_indices]).T,
+                               np.array([midpoint_indices, split_segments[:, 1]]).T])
+    return points, segments
+
+
+def winding_number(test_points, points, segments):
+    """
+    Winding number of every test point with respect to the (oriented) segments
+    """
+    test_points = np.asarray(test_points, dtype=float).reshape(-1, 2)
+    start = points[segments[:, 0]]
+    end = points[segments[:, 1]]
+    direction = np.where(end[:, 1] > start[:, 1], 1, -1)
+    d_y = end[:, 1] - start[:, 1]
+    d_y = np.where(d_y == 0, 1, d_y)
+
+    result = np.zeros(len(test_points), dtype=int)
+    for chunk_start in range(0, len(test_points), CHUNK_SIZE):
+        chunk = test_points[chunk_start:chunk_start + CHUNK_SIZE]
+        p_x = chunk[:, 0:1]
+        p_y = chunk[:, 1:2]
+        # segments crossing the horizontal ray p -> +x
+        crosses = (start[:, 1] <= p_y) != (end[:, 1] <= p_y)
+        x_cut = start[:, 0] + (p_y - start[:, 1]) * (end[:, 0] - start[:, 0]) / d_y
+        crosses &= p_x < x_cut
+        result[chunk_start:chunk_start + CHUNK_SIZE] = np.sum(crosses * direction, axis=1)
+
+    return result
+
+
+def _inside(test_points, points, segments):
+    # odd winding number -> inside (independent of the orientation of the hole-loops)
+    if not len(segments):
+        return np.ones(len(test_points), dtype=bool)
+    return winding_number(test_points, points, segments) % 2 == 1
+
+
+def _circumcenters(triangle_points):
+    a, b, c = triangle_points.transpose(1, 0, 2)
+    b = b - a
+    c = c - a
+    d = 2 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+    d = np.where(d == 0, np.finfo(float).tiny, d)
+    b_2 = np.sum(b ** 2, axis=1)
+    c_2 = np.sum(c ** 2, axis=1)
+    u_x = (c[:, 1] * b_2 - b[:, 1] * c_2) / d
+    u_y = (b[:, 0] * c_2 - c[:, 0] * b_2) / d
+    return a + np.array([u_x, u_y]).T
+
+
+def _quality(triangle_points):
+    """
+    minimal angle, area and the (local) vertex at the minimal angle of every triangle
+    """
+    a, b, c = triangle_points.transpose(1, 0, 2)
+    lengths = np.array([np.linalg.norm(b - c, axis=1),
+                        np.linalg.norm(c - a, axis=1),
+                        np.linalg.norm(a - b, axis=1)])
+    area = 0.5 * np.abs((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+    # smallest angle is opposite of the shortest edge: sin(alpha) = 2*area / (l1*l2)
+    min_vertex = lengths.argmin(axis=0)
+    lengths.sort(axis=0)
+    sin_min = 2 * area / np.maximum(lengths[1] * lengths[2], np.finfo(float).tiny)
+    return np.arcsin(np.clip(sin_min, 0, 1)), area, min_vertex
+
+
+def _input_angles(points, segments):
+    """
+    smallest angle between the segments meeting at every point (2*pi for less than two segments)
+    """
+    angles = np.full(len(points), 2 * np.pi)
+    if not len(segments):
+        return angles
+
+    # direction of every segment, seen from both of its ends
+    ends = np.concatenate([segments, segments[:, ::-1]])
+    diff = points[ends[:, 1]] - points[ends[:, 0]]
+    direction = np.arctan2(diff[:, 1], diff[:, 0])
+    order = np.lexsort((direction, ends[:, 0]))
+    point_indices = ends[order, 0]
+    direction = direction[order]
+
+    # angles between neighbouring directions around every point (+ the wrap-around)
+    same_point = point_indices[1:] == point_indices[:-1]
+    np.minimum.at(angles, point_indices[1:][same_point], np.diff(direction)[same_point])
+    first = np.flatnonzero(np.concatenate([[True], ~same_point]))
+    last = np.concatenate([first[1:] - 1, [len(direction) - 1]])
+    multiple = last > first
+    np.minimum.at(angles, point_indices[first[multiple]],
+                  2 * np.pi - (direction[last[multiple]] - direction[first[multiple]]))
+
+    return angles
+
+
+def _select_spaced(centers, radius, points, ratio=0.5):
+    """
+    Select the centers (in the given order) which are farther than ratio*radius
+    from all points and from the centers selected before.
+    :return: indices of the selected centers
+    """
+    if not len(centers):
+        return np.zeros(0, dtype=int)
+    distance = scipy.spatial.cKDTree(points).query(centers)[0]
+    candidates = np.flatnonzero(distance > ratio * radius)
+    if not len(candidates):
+        return candidates
+
+    neighbours = scipy.spatial.cKDTree(centers[candidates]).query_ball_point(
+        centers[candidates], ratio * radius[candidates])
+    blocked = np.zeros(len(candidates), dtype=bool)
+    selected = []
+    for i, candidate in enumerate(candidates):
+        if not blocked[i]:
+            selected.append(candidate)
+            blocked[neighbours[i]] = True
+
+    return np.array(selected, dtype=int)
+
+
+def _encroaching(centers, points, segments):
+    """
+    Check which centers lie within the diametral circle of a segment
+    :return: encroaching centers (mask), encroached segments (mask)
+    """
+    seg_start = points[segments[:, 0]]
+    seg_end = points[segments[:, 1]]
+    midpoints = (seg_start + seg_end) / 2
+    radius = np.linalg.norm(seg_end - seg_start, axis=1) / 2
+    encroached = np.zeros(len(segments), dtype=bool)
+    encroaching = np.zeros(len(centers), dtype=bool)
+    for chunk_start in range(0, len(centers), CHUNK_SIZE):
+        chunk = centers[chunk_start:chunk_start + CHUNK_SIZE]
+        inside_circle = np.linalg.norm(chunk[:, np.newaxis] - midpoints, axis=2) < radius
+        encroached |= inside_circle.any(axis=0)
+        encroaching[chunk_start:chunk_start + CHUNK_SIZE] = inside_circle.any(axis=1)
+
+    return encroaching, encroached
+
+
+def triangulate(points, segments=None, quality=False, min_angle=20., max_area=None, max_iterations=20,
+                split_segments=True, max_points=None, protect_angle=60.):
+    """
+    Constrained delaunay triangulation. The segments are inserted by splitting them
+    (new points are appended), triangles outside of the segment-loops (holes) are
+    removed using the winding number.
+    :param points: (n, 2) array
+    :param segments: (m, 2) array of point indices (closed loops: outline + holes)
+    :param quality: refine bad triangles (minimal angle < min_angle [deg] / area > max_area)
+    :param split_segments: allow the refinement to split segments (False: triangle's "Y" switch;
+                           segments which are no delaunay-edges are still split initially)
+    :param max_points: stop the refinement at this number of points (default: 10 x input)
+    :param protect_angle: triangles with their minimal angle at an input angle below protect_angle [deg]
+                          (p.e. the trailing edge) are not refined
+    :return: points, triangles
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if segments is None or not len(segments):
+        segments = np.zeros((0, 2), dtype=np.int64)
+    segments = np.asarray(segments, dtype=np.int64).reshape(-1, 2)
+    if max_points is None:
+        max_points = 10 * len(points)
+    protected = np.flatnonzero(_input_angles(points, segments) < np.radians(protect_angle))
+
+    points, segments, triangles = _insert_segments(points, segments)
+    triangles = triangles[_inside(points[triangles].mean(axis=1), points, segments)]
+
+    if quality:
+        min_angle = np.radians(min_angle)
+        extent = np.ptp(points, axis=0) if len(points) else np.zeros(2)
+        min_area = np.finfo(float).eps * max(extent[0] * extent[1], np.finfo(float).tiny)
+
+        for _ in range(max_iterations):
+            if len(points) >= max_points:
+                break
+
+            triangle_points = points[triangles]
+            angles, areas, min_vertex = _quality(triangle_points)
+            bad = angles < min_angle
+            if max_area is not None:
+                bad |= areas > max_area
+            bad &= areas > min_area
+            # small input angles can't be resolved (the refinement would never stop)
+            is_protected = np.zeros(len(points), dtype=bool)
+            is_protected[protected] = True
+            bad &= ~is_protected[triangles[np.arange(len(triangles)), min_vertex]]
+            if not bad.any():
+                break
+
+            # worst triangles first
+            bad = np.flatnonzero(bad)[np.argsort(angles[bad])]
+            centers = _circumcenters(triangle_points[bad])
+            radius = np.linalg.norm(centers - triangle_points[bad, 0], axis=1)
+            inside = _inside(centers, points, segments)
+            centers = centers[inside]
+            radius = radius[inside]
+
+            # don't insert centers next to each other / next to existing points
+            centers = centers[_select_spaced(centers, radius, points)]
+
+            # circumcenters encroaching a segment: split the segment instead
+            encroaching, encroached = _encroaching(centers, points, segments)
+            centers = centers[~encroaching]
+            if not split_segments:
+                encroached[:] = False
+
+            budget = max_points - len(points)
+            encroached[np.flatnonzero(encroached)[budget:]] = False
+            centers = centers[:max(budget - np.sum(encroached), 0)]
+            if not len(centers) and not encroached.any():
+                break
+
+            if split_segments:
+                points, segments = _split_segments(points, segments, encroached)
+                points, segments, triangles = _insert_segments(np.concatenate([points, centers]), segments)
+            else:
+                points, triangles = _insert_points(points, segments, centers)
+                if triangles is None:
+                    break
+            triangles = triangles[_inside(points[triangles].mean(axis=1), points, segments)]
+
+    # counter-clockwise orientation
+    a, b, c = points[triangles].transpose(1, 0, 2)
+    clockwise = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]) < 0
+    triangles[clockwise] = triangles[clockwise][:, ::-1]
+
+    return points, triangles
+
+
+def _insert_points(points, segments, new_points):
+    """
+    Add points without splitting a segment: points next to a segment that
+    isn't a delaunay-edge anymore are dropped.
+    :return: points, triangles (None if no point could be added)
+    """
+    while len(new_points):
+        all_points = np.concatenate([points, new_points])
+        triangles = _delaunay(all_points)
+        missing = _missing_segments(triangles, segments, len(all_points))
+        if not missing.any():
+            return all_points, triangles
+
+        seg_start = points[segments[missing, 0]]
+        seg_end = points[segments[missing, 1]]
+        midpoints = (seg_start + seg_end) / 2
+        lengths = np.linalg.norm(seg_end - seg_start, axis=1)
+        close = np.zeros(len(new_points), dtype=bool)
+        for chunk_start in range(0, len(new_points), CHUNK_SIZE):
+            chunk = new_points[chunk_start:chunk_start + CHUNK_SIZE]
+            close[chunk_start:chunk_start + CHUNK_SIZE] = np.any(
+                np.linalg.norm(chunk[:, np.newaxis] - midpoints, axis=2) < lengths, axis=1)
+        if not close.any():
+            break
+        new_points = new_points[~close]
+
+    return points, None
+
+
+def loop_segments(start, num):
+    """
+    segments of a closed loop of num points starting at index start
+    """
+    indices = np.arange(num) + start
+    return np.array([indices, np.roll(indices, -1)]).T
@@ -2,6 +2,7 @@ import os
 import subprocess
 
 from openglider import jsonify
+from openglider.utils.disk_cache import get_artifact
 
 import openglider.plots.spreadsheets
 import openglider.plots.cuts
@@ -62,20 +63,30 @@ class Patterns(object):
         if self.config.profile_numpoints:
             self.glider_2d.num_profile = self.config.profile_numpoints
 
+        glider_given = glider is not None
         glider = glider or self.glider_2d.get_glider_3d()
 
         drawings = self._get_sketches(outdir, glider)
 
-        if self.config.complete_glider:
-            glider_complete = glider.copy_complete()
-            glider_complete.rename_parts()
-            plots = PlotMaker(glider_complete, config=self.config)
-            glider_complete.lineset.iterate_target_length()
+        def get_plots():
+            if self.config.complete_glider:
+                glider_complete = glider.copy_complete()
+                glider_complete.rename_parts()
+                plots = PlotMaker(glider_complete, config=self.config)
+                glider_complete.lineset.iterate_target_length()
+            else:
+                plots = PlotMaker(glider, config=self.config)
+                glider.lineset.iterate_target_length()
+
+            return plots.unwrap()
+
+        if glider_given:
+            plots = get_plots()
         else:
-            plots = PlotMaker(glider, config=self.config)
-            glider.lineset.iterate_target_length()
-            
-        plots.unwrap()
+            plots = get_artifact(get_plots, "patterns", self.glider_2d, self.config)
+            if not self.config.complete_glider:
+                glider = plots.glider_3d
+
         all_patterns = plots.get_all_grouped()
 
         with open(fn("patterns.json"), "w") as outfile:
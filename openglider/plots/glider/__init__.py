@@ -47,12 +47,23 @@ class PlotMaker(object):
 
         return self._cellplotmakers[cell]
 
+    def _flatten_cells(self):
+        """
+        Flatten all cells in one batch
+        """
+        cells = [cell for cell in self.glider_3d.cells
+                 if self._get_cellplotmaker(cell)._flattened_cell is None]
+        for cell, ribs in zip(cells, self.glider_3d.get_flattened_cells(cells)):
+            self._get_cellplotmaker(cell)._flattened_ribs = ribs
+
     def get_panels(self):
         self.panels.clear()
         panels_upper = []
         panels_lower = []
         panels = []
 
+        self._flatten_cells()
+
         for cell in self.glider_3d.cells:
             pm = self._get_cellplotmaker(cell)
             lower = pm.get_panels_lower()
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 from openglider.airfoil import get_x_value
 from openglider.plots import cuts, PlotPart
 from openglider.plots.glider.config import PatternConfig
@@ -447,7 +449,7 @@ class DribPlot(object):
 
         ik_1 = foil(x1)
         ik_2 = foil(x2)
-        length = foil[ik_1:ik_2].get_length() * rib.chord
+        length = foil.get_length(ik_1, ik_2) * rib.chord
 
         ik_new = inner.extend(0, length)
         return inner[ik_new], outer[ik_new]
@@ -546,19 +548,22 @@ class CellPlotMaker:
         self.config = self.DefaultConf(config)
 
         self._flattened_cell = None
+        self._flattened_ribs = None  # (left, right) if flattened in a batch
 
     def _get_flatten_cell(self):
         if self._flattened_cell is None:
             # assert isinstance(cell, Cell)
-            left, right = projection.flatten_list(self.cell.prof1,
-                                                  self.cell.prof2)
+            if self._flattened_ribs is not None:
+                left, right = self._flattened_ribs
+            else:
+                left, right = projection.flatten_list(self.cell.prof1,
+                                                      self.cell.prof2)
             left_bal = left.copy()
             right_bal = right.copy()
-            ballooning = [self.cell.ballooning[x] for x in self.cell.rib1.profile_2d.x_values]
-            for i in range(len(left)):
-                diff = (right[i] - left[i]) * ballooning[i] / 2
-                left_bal.data[i] -= diff
-                right_bal.data[i] += diff
+            ballooning = self.cell.ballooning[self.cell.rib1.profile_2d.x_values]
+            diff = (right.data - left.data) * ballooning[:, np.newaxis] / 2
+            left_bal.data = left.data - diff
+            right_bal.data = right.data + diff
 
             inner = [left, right]
             ballooned = [left_bal, right_bal]
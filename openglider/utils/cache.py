@@ -1,5 +1,9 @@
+import collections
 import copy
+import hashlib
+import sys
 import time
+import weakref
 
 import numpy as np
 
@@ -12,12 +16,28 @@ class CachedObject(object):
     """
     An object to provide cached properties and functions.
     Provide a list of attributes to hash down for tracking changes
+
+    Instead of hashing the hashlist on every access, cached values register
+    themselves as dependents of the attributes they were computed from.
+    Setting one of those attributes drops the value (and everything computed
+    from it) so a cache hit is a plain dict-lookup. Only numpy-arrays (which
+    can be changed in place) are compared to the hash of their buffer.
     """
     hashlist = ()
     cached_properties = []
 
-    def __hash__(self):
-        return hash_attributes(self, self.hashlist)
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+        dependents = self.__dict__.get("_dependents")
+        if dependents and key in dependents:
+            self._invalidate(key)
+
+    def __getstate__(self):
+        # dependency-graph and cached values are bound to this very instance
+        state = self.__dict__.copy()
+        state.pop("_cache", None)
+        state.pop("_dependents", None)
+        return state
 
     def __del__(self):
         for prop in self.cached_properties:
@@ -30,6 +50,279 @@ class CachedObject(object):
             rep = rep[:-1] + ': "{}">'.format(self.name)
         return rep
 
+    def _add_dependent(self, attribute, owner, prop):
+        dependents = self.__dict__.get("_dependents")
+        if dependents is None:
+            dependents = {}
+            object.__setattr__(self, "_dependents", dependents)
+        dependents.setdefault(attribute, set()).add((weakref.ref(owner), prop))
+
+    def _invalidate(self, attribute):
+        """
+        Mark the attribute as changed: drop all cached values depending on it
+        """
+        dependents = self.__dict__.get("_dependents")
+        if not dependents:
+            return
+        for owner_ref, prop in dependents.pop(attribute, ()):
+            owner = owner_ref()
+            if owner is not None:
+                prop.invalidate(owner)
+
+
+def _is_observable(obj, attribute):
+    """
+    Check if changes of obj.attribute pass through CachedObject.__setattr__
+    or cache-invalidation (read-only properties can't be tracked).
+    """
+    if not isinstance(obj, CachedObject):
+        return False
+    descriptor = getattr(type(obj), attribute, None)
+    if isinstance(descriptor, property):
+        return descriptor.fset is not None
+    return True
+
+
+def _register_dependencies(owner, prop, obj, path, guards, visited):
+    """
+    Walk down an attribute-path (p.e. "rib1.profile_3d") starting at obj and
+    register owner's prop at every object on the way. Parts that can't be
+    tracked are added as guards to be checked on access.
+    """
+    start = obj
+    names = path.split(".") if path != "self" else []
+    for i, name in enumerate(names):
+        if not _is_observable(obj, name):
+            guards.append(_Guard(start, path))
+            obj = recursive_getattr(obj, ".".join(names[i:]))
+            break
+        obj._add_dependent(name, owner, prop)
+        obj = getattr(obj, name)
+    else:
+        if isinstance(obj, list):
+            # in-place changes of lists can't be tracked
+            guards.append(_Guard(start, path))
+        elif isinstance(obj, np.ndarray):
+            # neither can in-place changes of arrays (p.e. rib.pos[1] += 1)
+            guards.append(_ArrayGuard(start, path, obj))
+
+    # the value itself is a CachedObject -> depend on its hashlist
+    if isinstance(obj, CachedObject) and id(obj) not in visited:
+        visited.add(id(obj))
+        for attribute in obj.hashlist:
+            _register_dependencies(owner, prop, obj, attribute, guards, visited)
+
+
+class _Guard(object):
+    """
+    Fallback for untrackable dependencies: compare the hash on access
+    """
+    def __init__(self, obj, attribute):
+        self.obj = weakref.ref(obj)
+        self.attribute = attribute
+        self.hash = hash_attributes(obj, [attribute])
+
+    def changed(self):
+        obj = self.obj()
+        return obj is None or hash_attributes(obj, [self.attribute]) != self.hash
+
+
+class _ArrayGuard(object):
+    """
+    Guard for numpy-arrays: compare the hash of the buffer on access
+    (reassignment is tracked by the dependency graph anyway)
+    """
+    def __init__(self, obj, attribute, array):
+        self.obj = weakref.ref(obj)
+        self.attribute = attribute
+        self.hash = self._hash(array)
+
+    @staticmethod
+    def _hash(array):
+        if array.dtype.hasobject:
+            return hash((array.shape, repr(array.tolist())))
+        return hash((array.shape, array.dtype.str, np.ascontiguousarray(array).tobytes()))
+
+    def changed(self):
+        obj = self.obj()
+        if obj is None:
+            return True
+        array = recursive_getattr(obj, self.attribute)
+        return not isinstance(array, np.ndarray) or self._hash(array) != self.hash
+
+
+class CacheStatistics(object):
+    """
+    Hits, misses, evictions and total compute-time of a cached_property
+    (compute-time includes nested cached properties)
+    """
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def __repr__(self):
+        return "<CacheStatistics {}: {}>".format(self.name, self.as_dict())
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compute_time = 0.
+
+    def as_dict(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "compute_time": self.compute_time
+        }
+
+
+def get_nbytes(value):
+    """
+    Estimate the memory used by a cached value (numpy-data is what counts)
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    elif isinstance(value, HashedList):
+        return getattr(value.data, "nbytes", 0)
+    elif isinstance(value, (list, tuple)):
+        return sum(get_nbytes(el) for el in value)
+    return sys.getsizeof(value)
+
+
+class CacheStore(object):
+    """
+    Unbounded store: cached values live in the owner's _cache-dict
+    as long as the owner exists.
+    """
+    def __init__(self):
+        self.owners = {}
+
+    def __repr__(self):
+        return "<{}: {} objects>".format(self.__class__.__name__, len(self.owners))
+
+    def _forget(self, key):
+        self.owners.pop(key, None)
+
+    def get(self, owner, prop):
+        cache = owner.__dict__.get("_cache")
+        if cache:
+            return cache.get(prop)
+
+    def set(self, owner, prop, entry):
+        cache = owner.__dict__.get("_cache")
+        if cache is None:
+            cache = {}
+            object.__setattr__(owner, "_cache", cache)
+        cache[prop] = entry
+
+        key = id(owner)
+        if key not in self.owners:
+            # forget the owner as soon as it's gone
+            self.owners[key] = weakref.ref(owner, lambda ref, key=key: self._forget(key))
+
+    def remove(self, owner, prop):
+        cache = owner.__dict__.get("_cache")
+        return bool(cache) and cache.pop(prop, None) is not None
+
+    def clear(self):
+        for ref in list(self.owners.values()):
+            owner = ref()
+            if owner is not None:
+                owner.__dict__.get("_cache", {}).clear()
+        self.owners.clear()
+
+
+class LRUCacheStore(CacheStore):
+    """
+    Bounded store: evict the least recently used values as soon as the
+    cached data exceeds max_bytes.
+    """
+    def __init__(self, max_bytes):
+        super(LRUCacheStore, self).__init__()
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.entries = collections.OrderedDict()  # (id(owner), prop) -> nbytes
+        self.owner_props = {}
+
+    def __repr__(self):
+        return "<{}: {} values, {}/{} bytes>".format(
+            self.__class__.__name__, len(self.entries), self.nbytes, self.max_bytes)
+
+    def _forget(self, key):
+        super(LRUCacheStore, self)._forget(key)
+        for prop in self.owner_props.pop(key, ()):
+            self.nbytes -= self.entries.pop((key, prop), 0)
+
+    def get(self, owner, prop):
+        entry = super(LRUCacheStore, self).get(owner, prop)
+        if entry is not None and (id(owner), prop) in self.entries:
+            self.entries.move_to_end((id(owner), prop))
+        return entry
+
+    def set(self, owner, prop, entry):
+        self.remove(owner, prop)
+        super(LRUCacheStore, self).set(owner, prop, entry)
+        key = id(owner)
+        nbytes = get_nbytes(entry[0])
+        self.entries[key, prop] = nbytes
+        self.owner_props.setdefault(key, set()).add(prop)
+        self.nbytes += nbytes
+        self.evict()
+
+    def remove(self, owner, prop):
+        key = id(owner)
+        if (key, prop) in self.entries:
+            self.nbytes -= self.entries.pop((key, prop))
+            self.owner_props[key].discard(prop)
+        return super(LRUCacheStore, self).remove(owner, prop)
+
+    def evict(self):
+        # keep the most recent value, even if it exceeds the limit
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            (key, prop), nbytes = self.entries.popitem(last=False)
+            self.nbytes -= nbytes
+            self.owner_props[key].discard(prop)
+            owner = self.owners[key]()
+            if owner is not None:
+                # dependents stay valid, the value is just recomputed on access
+                owner.__dict__["_cache"].pop(prop, None)
+            prop.statistics.evictions += 1
+
+    def clear(self):
+        super(LRUCacheStore, self).clear()
+        self.entries.clear()
+        self.owner_props.clear()
+        self.nbytes = 0
+
+
+_store = None
+
+
+def get_cache_store():
+    """
+    Get the cache-store as set in openglider.config ("cache_backend": "instance"/"lru")
+    """
+    global _store
+    backend = openglider.config["cache_backend"]
+    if backend == "lru":
+        max_bytes = openglider.config["cache_max_bytes"]
+        if not isinstance(_store, LRUCacheStore):
+            clear_cache()
+            _store = LRUCacheStore(max_bytes)
+        elif _store.max_bytes != max_bytes:
+            _store.max_bytes = max_bytes
+            _store.evict()
+    elif backend == "instance":
+        if _store is None or _store.__class__ is not CacheStore:
+            clear_cache()
+            _store = CacheStore()
+    else:
+        raise ValueError("invalid cache-backend: {}".format(backend))
+
+    return _store
+
 
 def cached_property(*hashlist):
     #@functools.wraps
@@ -37,33 +330,74 @@ def cached_property(*hashlist):
         def __init__(self, fget=None, doc=None):
             super(CachedProperty, self).__init__()
             self.function = fget
+            self.name = fget.__name__
             self.__doc__ = doc or fget.__doc__
             self.__module__ = fget.__module__
 
             self.hashlist = hashlist
             self.cache = {}
+            self.statistics = CacheStatistics("{}.{}".format(fget.__module__, fget.__qualname__))
 
             global cache_instances
             cache_instances.append(self)
 
         def __get__(self, parentclass, type=None):
+            if parentclass is None:
+                return self
             if not openglider.config["caching"]:
                 return self.function(parentclass)
             else:
-                if not hasattr(parentclass, "_cache"):
-                    parentclass._cache = {}
-
-                cache = parentclass._cache
-                dahash = hash_attributes(parentclass, self.hashlist)
-                # Return cached or recalc if hashes differ
-                if self not in cache or cache[self]['hash'] != dahash:
-                    res = self.function(parentclass)
-                    cache[self] = {
-                        "hash": dahash,
-                        "value": res
-                    }
-
-                return cache[self]["value"]
+                store = get_cache_store()
+                entry = store.get(parentclass, self)
+                if entry is not None:
+                    value, guards = entry
+                    if not guards or not any(guard.changed() for guard in guards):
+                        self.statistics.hits += 1
+                        return value
+                    self.invalidate(parentclass)
+
+                self.statistics.misses += 1
+                start = time.perf_counter()
+                value = self.function(parentclass)
+                self.statistics.compute_time += time.perf_counter() - start
+
+                self._store(store, parentclass, value)
+
+                return value
+
+        def _store(self, store, instance, value):
+            guards = []
+            visited = set()
+            for attribute in self.hashlist:
+                _register_dependencies(instance, self, instance, attribute, guards, visited)
+            store.set(instance, self, (value, guards))
+
+        def prime(self, instance, value):
+            """
+            Store a value calculated elsewhere (p.e. in a batch for many instances)
+            """
+            if openglider.config["caching"]:
+                self._store(get_cache_store(), instance, value)
+
+        def setter(self, fset):
+            """
+            Add a setter (same as property.setter); cached values are dropped after setting
+            """
+            self.__class__ = SettableCachedProperty
+            self.fset = fset
+            return self
+
+        def invalidate(self, instance):
+            if _store is not None:
+                _store.remove(instance, self)
+            # values might be evicted, dependents have to be invalidated anyway
+            if isinstance(instance, CachedObject):
+                instance._invalidate(self.name)
+
+    class SettableCachedProperty(CachedProperty):
+        def __set__(self, instance, value):
+            self.fset(instance, value)
+            self.invalidate(instance)
 
     return CachedProperty
 
@@ -71,6 +405,22 @@ def cached_property(*hashlist):
 def clear_cache():
     for instance in cache_instances:
         instance.cache.clear()
+    if _store is not None:
+        _store.clear()
+
+
+def cache_statistics():
+    """
+    Get the statistics of all cached properties that were used so far
+    :return: {"module.Class.property": {"hits": .., "misses": .., "evictions": .., "compute_time": ..}}
+    """
+    return {prop.statistics.name: prop.statistics.as_dict()
+            for prop in cache_instances if prop.statistics.hits or prop.statistics.misses}
+
+
+def reset_cache_statistics():
+    for prop in cache_instances:
+        prop.statistics.reset()
 
 
 def recursive_getattr(obj, attr):
@@ -91,7 +441,7 @@ def c_mul(a, b):
     C type multiplication
     http://stackoverflow.com/questions/6008026/how-hash-is-implemented-in-python-3-2
     """
-    return eval(hex((int(a) * b) & 0xFFFFFFFF)[:-1])
+    return (int(a) * b) & 0xFFFFFFFF
 
 
 def hash_attributes(class_instance, hashlist):
@@ -130,6 +480,8 @@ class HashedList(CachedObject):
     Hashed List to use cached properties
     """
     name = "unnamed"
+    hashlist = ("data",)
+
     def __init__(self, data, name=None):
         self._data = None
         self._hash = None
@@ -147,13 +499,33 @@ class HashedList(CachedObject):
     def __setitem__(self, key, value):
         self.data[key] = np.array(value)
         self._hash = None
+        self._invalidate("data")
 
     def __hash__(self):
+        # hash the whole buffer, str() would truncate long arrays
         if self._hash is None:
-            self._hash = hash(str(self.data))
-            #self._hash = hash("{}/{}".format(id(self), time.time()))
+            data = np.ascontiguousarray(self.data)
+            if data.dtype.hasobject:
+                self._hash = hash((data.shape, repr(data.tolist())))
+            else:
+                self._hash = hash((data.shape, data.dtype.str, data.tobytes()))
         return self._hash
 
+    def digest(self):
+        """
+        blake2b-digest of the whole data (including shape and dtype).
+        Unlike hash() this is stable between processes.
+        """
+        data = np.ascontiguousarray(self.data)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(data.shape).encode())
+        digest.update(data.dtype.str.encode())
+        if data.dtype.hasobject:
+            digest.update(repr(data.tolist()).encode())
+        else:
+            digest.update(data.tobytes())
+        return digest.hexdigest()
+
     def __len__(self):
         return len(self.data)
 
@@ -0,0 +1,158 @@
+"""
+Content-addressed on-disk cache for expensive results (3d-gliders, meshes, patterns).
+
+Artifacts are stored as compressed pickles, keyed by a digest of the inputs,
+the config and the openglider version. Only point config.disk_cache_dir to
+a trusted directory: loading a pickle can execute arbitrary code.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+import zlib
+
+import openglider
+from openglider.jsonify import Encoder
+
+# config-values not affecting the results
+IGNORED_CONFIG = ("user", "debug", "caching", "cache_backend", "cache_max_bytes",
+                  "disk_cache_dir", "disk_cache_max_bytes", "disk_cache_max_age")
+
+
+class DiskCache(object):
+    suffix = ".ogc"
+
+    def __init__(self, path, max_bytes=None, max_age=None):
+        """
+        :param path: cache directory
+        :param max_bytes: limit for the total size, least recently used files are evicted first
+        :param max_age: remove artifacts not used for max_age seconds
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def __repr__(self):
+        return "<DiskCache {}: {} files, {} bytes>".format(self.path, len(self._get_files()), self.nbytes)
+
+    @staticmethod
+    def get_key(*data):
+        """
+        Canonical digest of json-serializable input data (including config and version)
+        """
+        config = {key: value for key, value in openglider.config if key not in IGNORED_CONFIG}
+        dct = {"version": openglider.__version__, "config": config, "data": data}
+        canonical = json.dumps(dct, cls=Encoder, sort_keys=True, separators=(",", ":"))
+        return hashlib.blake2b(canonical.encode(), digest_size=20).hexdigest()
+
+    def _get_filename(self, key):
+        return os.path.join(self.path, key + self.suffix)
+
+    def _get_files(self):
+        files = []
+        for filename in os.listdir(self.path):
+            if filename.endswith(self.suffix):
+                path = os.path.join(self.path, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:  # removed by a concurrent process
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    @property
+    def nbytes(self):
+        return sum(f[1] for f in self._get_files())
+
+    def __contains__(self, key):
+        return os.path.isfile(self._get_filename(key))
+
+    def load(self, key):
+        filename = self._get_filename(key)
+        try:
+            with open(filename, "rb") as infile:
+                data = infile.read()
+        except (IOError, OSError):
+            raise KeyError(key)
+
+        # mark as recently used
+        os.utime(filename, None)
+        return pickle.loads(zlib.decompress(data))
+
+    def store(self, key, obj):
+        data = zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        # write to a temporary file first, so concurrent readers never see partial data
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as outfile:
+                outfile.write(data)
+            os.replace(tmp_name, self._get_filename(key))
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+
+        self.evict()
+
+    def get(self, key, function):
+        """
+        Load the artifact or compute and store it using function()
+        """
+        try:
+            return self.load(key)
+        except KeyError:
+            pass
+        except (pickle.UnpicklingError, zlib.error, EOFError, AttributeError, ImportError):
+            # broken or incompatible file -> recompute
+            pass
+
+        obj = function()
+        self.store(key, obj)
+        return obj
+
+    def evict(self):
+        files = self._get_files()
+        files.sort()  # oldest usage first
+        nbytes = sum(f[1] for f in files)
+        now = time.time()
+
+        for mtime, size, path in files:
+            too_old = self.max_age is not None and now - mtime > self.max_age
+            too_big = self.max_bytes is not None and nbytes > self.max_bytes
+            if not too_old and not too_big:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            nbytes -= size
+
+    def clear(self):
+        for _, _, path in self._get_files():
+            os.remove(path)
+
+
+def get_disk_cache():
+    """
+    Get the DiskCache as configured in openglider.config (None if disabled)
+    """
+    path = openglider.config["disk_cache_dir"]
+    if path is None:
+        return None
+    return DiskCache(path,
+                     max_bytes=openglider.config["disk_cache_max_bytes"],
+                     max_age=openglider.config["disk_cache_max_age"])
+
+
+def get_artifact(function, name, *data):
+    """
+    Get the result of function() from the disk-cache if enabled.
+    name and data have to describe the result completely.
+    """
+    disk_cache = get_disk_cache()
+    if disk_cache is None:
+        return function()
+    return disk_cache.get(disk_cache.get_key(name, *data), function)
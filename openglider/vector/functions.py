@@ -48,17 +48,28 @@ def rangefrom(maxl, startpoint=0):
 def rotation_3d(angle, axis=None):
     """
     3D-Rotation Matrix for (angle[rad],[axis(x,y,z)])
+    angle (n) and axis (n x 3) can be arrays -> stack of matrices (n x 3 x 3)
     """
     if axis is None:
         axis = [1, 0, 0]
+    angle = np.asarray(angle, dtype=float)
+    axis = np.asarray(axis, dtype=float)
+    assert axis.shape[-1] == 3
+    length = np.linalg.norm(axis, axis=-1)
+    if np.any(length == 0):
+        raise ValueError("Cannot normalize a vector of length Zero")
+    axis = axis / length[..., np.newaxis]
+
     # see http://en.wikipedia.org/wiki/SO%284%29#The_Euler.E2.80.93Rodrigues_formula_for_3D_rotations"""
     a = np.cos(angle / 2)
-    (b, c, d) = -normalize(axis) * np.sin(angle / 2)
-    return np.array([
+    b, c, d = np.moveaxis(-axis * np.sin(angle / 2)[..., np.newaxis], -1, 0)
+    a, b, c, d = np.broadcast_arrays(a, b, c, d)
+    mat = np.array([
         [a**2 + b**2 - c**2 - d**2, 2*(b*c - a*d),              2*(b*d + a*c)],
         [2*(b*c + a*d),             a**2 + c**2 - b**2 - d**2,  2 * (c*d - a*b)],
         [2*(b*d - a*c),             2*(c*d + a*b),              a**2 + d**2 - b**2 - c**2]
     ])
+    return np.moveaxis(mat, (0, 1), (-2, -1))
 
 
 def rotation_2d(angle):
@@ -82,6 +93,32 @@ def cut(p1, p2, p3, p4):
     return p1 + k * (p2 - p1), k, l
 
 
+def cut_batch(p1, p2, p3, p4):
+    """
+    Vectorized version of cut: all arguments are (broadcastable) arrays of 2D-points.
+    Returns (k, l) arrays, nan for parallel lines.
+    """
+    d1 = p2 - p1
+    d2 = p4 - p3
+    r = p3 - p1
+    det = d1[..., 0] * d2[..., 1] - d1[..., 1] * d2[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = (r[..., 0] * d2[..., 1] - r[..., 1] * d2[..., 0]) / det
+        l = (r[..., 0] * d1[..., 1] - r[..., 1] * d1[..., 0]) / det
+    k[det == 0] = np.nan
+    l[det == 0] = np.nan
+    return k, l
+
+
+def sort_from(indices, startpoint=0):
+    """
+    Sort indices in the same order as rangefrom() would yield them
+    """
+    indices = np.asarray(indices)
+    order = np.lexsort((indices < startpoint, np.abs(indices - startpoint)))
+    return indices[order]
+
+
 def set_dimension(array, dim=3):
     array = np.array(array)
     if len(array.shape) == 1:
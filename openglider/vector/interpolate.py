@@ -1,24 +1,43 @@
+import numpy as np
+
+from openglider.utils.cache import cached_property
 from openglider.vector import PolyLine2D
 
 
 class Interpolation(PolyLine2D):
     def __init__(self, data, name=None, extrapolate=True):
+        """
+        Linear interpolation of [[x, y], ...] with ascending x-values
+        """
         super(Interpolation, self).__init__(data, name)
         self.extrapolate = extrapolate
 
-    def __call__(self, xval):
-        last_point = self.data[0]
-        for index, point in enumerate(self.data):
-            if index == 0:
-                continue
+    @cached_property('self')
+    def _xy_values(self):
+        data = np.asarray(self.data, dtype=float)
+        return data[:, 0].copy(), data[:, 1].copy()
 
-            lower_bound = self.extrapolate or last_point[0] < xval
-            end_of_list = self.extrapolate and index == len(self.data) - 1
+    def __call__(self, xval):
+        """
+        Get the interpolated value(s) for a scalar or an array of x-values.
+        Outside of the data the first/last segment is extrapolated,
+        a ValueError is raised if extrapolate is False.
+        """
+        x_values, y_values = self._xy_values
+        xval_array = np.asarray(xval, dtype=float)
 
-            if (lower_bound and xval < point[0]) or end_of_list:
-                d_x = point[0] - last_point[0]
-                return last_point[1] + (xval-last_point[0])/d_x * (point[1] - last_point[1])
+        if not self.extrapolate:
+            outside = (xval_array < x_values[0]) | (xval_array > x_values[-1])
+            if np.any(outside):
+                raise ValueError("x-value(s) out of range: {}".format(xval_array[outside]))
 
-            last_point = point
+        index = np.searchsorted(x_values, xval_array, side="right")
+        index = np.clip(index, 1, len(x_values) - 1)
+        x_0 = x_values[index - 1]
+        y_0 = y_values[index - 1]
+        d_x = x_values[index] - x_0
+        result = y_0 + (xval_array - x_0) / d_x * (y_values[index] - y_0)
 
-        raise Exception
\ No newline at end of file
+        if result.ndim == 0:
+            return float(result)
+        return result
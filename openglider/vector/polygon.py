@@ -17,8 +17,8 @@ class Polygon2D(PolyLine2D):
         try:
             thacut = cut(self.data[0], self.data[1], self.data[-2], self.data[-1])
             if thacut[1] <= 1 and 0 <= thacut[2]:
-                self.data[0] = thacut[0]
-                self.data[-1] = thacut[0]
+                self[0] = thacut[0]
+                self[-1] = thacut[0]
                 return True
         except ArithmeticError:
             return False
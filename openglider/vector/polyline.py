@@ -1,11 +1,83 @@
+import bisect
+
 import numpy as np
 
 from openglider.utils import sign
 from openglider.utils.cache import cached_property, HashedList
-from openglider.vector.functions import norm, normalize, rangefrom, rotation_2d, cut
+from openglider.vector.functions import norm, normalize, rotation_2d, cut, cut_batch, sort_from
 from openglider.utils.table import Table
 
 
+def _rays_hit_bbox(starts, directions, points):
+    """
+    Check which rays (start + t * direction, t >= 0) touch the bounding box of points
+    """
+    lower = points.min(axis=0)
+    upper = points.max(axis=0)
+    padding = 1e-9 * (np.max(upper - lower) + 1)
+    lower = lower - padding
+    upper = upper + padding
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (lower - starts) / directions
+        t2 = (upper - starts) / directions
+    parallel = directions == 0
+    inside = (lower <= starts) & (starts <= upper)
+    t_min = np.where(parallel, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+    t_max = np.where(parallel, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+
+    t_enter = np.maximum(t_min.max(axis=1), 0)
+    t_exit = t_max.min(axis=1)
+    return t_enter <= t_exit
+
+
+def _rotate_normalized(vectors):
+    """
+    normalize an array of 2D-vectors and rotate them 90 degrees clockwise (rhs)
+    """
+    rotated = np.stack([vectors[:, 1], -vectors[:, 0]], axis=1)
+    return rotated / np.linalg.norm(rotated, axis=1)[:, np.newaxis]
+
+
+def _self_cut_candidates(data, tolerance=1e-6):
+    """
+    Sweep over the x-axis to find all pairs of (non-adjacent) segments that
+    possibly intersect. Returns {segment: sorted list of higher segments}
+    """
+    starts = data[:-1]
+    ends = data[1:]
+    x_min = np.minimum(starts[:, 0], ends[:, 0])
+    x_max = np.maximum(starts[:, 0], ends[:, 0])
+    padding = tolerance * (np.max(np.abs(data)) + 1)
+
+    # only segments starting within the x-range of the current one are active
+    order = np.argsort(x_min, kind="mergesort")
+    x_min_sorted = x_min[order]
+    stop = np.searchsorted(x_min_sorted, x_max[order] + padding, side="right")
+    counts = stop - np.arange(1, len(order) + 1)
+    counts = np.maximum(counts, 0)
+    first = np.repeat(np.arange(len(order)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + offsets
+    seg_1 = order[first]
+    seg_2 = order[second]
+
+    # y-range overlap and no neighbours
+    y_min = np.minimum(starts[:, 1], ends[:, 1])
+    y_max = np.maximum(starts[:, 1], ends[:, 1])
+    overlap = (y_min[seg_1] <= y_max[seg_2] + padding) & (y_min[seg_2] <= y_max[seg_1] + padding)
+    overlap &= np.abs(seg_1 - seg_2) > 1
+    seg_1, seg_2 = np.minimum(seg_1, seg_2)[overlap], np.maximum(seg_1, seg_2)[overlap]
+
+    k, l = cut_batch(starts[seg_1], ends[seg_1], starts[seg_2], ends[seg_2])
+    possible_cut = (-tolerance < k) & (k < 1 + tolerance) & (-tolerance < l) & (l < 1 + tolerance)
+
+    partners = {}
+    for i, j in sorted(zip(seg_1[possible_cut].tolist(), seg_2[possible_cut].tolist())):
+        partners.setdefault(i, []).append(j)
+    return partners
+
+
 class PolyLine(HashedList):
     def __init__(self, data, name=None):
         super(PolyLine, self).__init__(data, name)
@@ -15,8 +87,7 @@ class PolyLine(HashedList):
             return self.data[ik]
         elif isinstance(ik, slice):  # example: list[1.2:5.5:1]
             values = self.get_positions(ik.start, ik.stop, ik.step)
-            #print(values, ik.start, ik.stop, ik.step, step, start_round, stop_round)
-            return PolyLine([self[i] for i in values])
+            return PolyLine(self.points_at(values))
         else:
             if ik < 0:
                 k = ik
@@ -28,6 +99,19 @@ class PolyLine(HashedList):
                 k = ik % 1 + max(0, int(ik) - len(self.data) + 2)
             return self.data[i] + k * (self.data[i + 1] - self.data[i])
 
+    def points_at(self, ik_array):
+        """
+        Get the points for an array of (fractional) indices at once.
+        Same as [self[ik] for ik in ik_array], values outside of (0, len-1)
+        are extrapolated using the first/last segment.
+        :return: np.array (len(ik_array), dim)
+        """
+        ik_array = np.asarray(ik_array, dtype=float)
+        data = np.asarray(self.data)
+        i = np.clip(np.trunc(ik_array).astype(int), 0, len(data) - 2)
+        k = (ik_array - i)[..., np.newaxis]
+        return data[i] * (1 - k) + data[i + 1] * k
+
     def __mul__(self, other):
         """Scale"""
         new = self.copy()
@@ -61,10 +145,11 @@ class PolyLine(HashedList):
         return self[len(self) - 1]
 
     def get(self, start, stop):
-        start2 = start - start % 1 + 1
-        stop2 = stop - stop % 1
+        start2 = int(start - start % 1 + 1)
+        stop2 = int(stop - stop % 1)
         data = self.data[start2:stop2]
-        return np.concatenate([[self[start]], data, [self[stop]]])
+        first, last = self.points_at([start, stop])
+        return np.concatenate([[first], data, [last]])
 
     def get_positions(self, start=0, stop=None, step=None):
         stop = stop if stop is not None else len(self)-1
@@ -97,28 +182,51 @@ class PolyLine(HashedList):
 
         return self
 
+    @cached_property('self')
+    def arc_lengths(self):
+        """
+        Cumulative length of the line at every point (arc_lengths[0] == 0)
+        """
+        data = np.asarray(self.data)
+        segment_lengths = np.linalg.norm(data[1:] - data[:-1], axis=1)
+        return np.concatenate([[0.], np.cumsum(segment_lengths)])
+
+    def get_length_at(self, ik):
+        """
+        Get the (signed) arc-length from the first point to the (fractional) index ik.
+        Values outside are extrapolated the same way as self[ik]. Accepts arrays.
+        """
+        lengths = self.arc_lengths
+        ik_array = np.asarray(ik, dtype=float)
+        i = np.clip(np.trunc(ik_array).astype(int), 0, len(lengths) - 2)
+        result = lengths[i] + (ik_array - i) * (lengths[i + 1] - lengths[i])
+        if result.ndim == 0:
+            return float(result)
+        return result
+
+    def get_ik_at_length(self, length):
+        """
+        Inverse of get_length_at: get the (fractional) index for an arc-length. Accepts arrays.
+        """
+        lengths = self.arc_lengths
+        length_array = np.asarray(length, dtype=float)
+        i = np.searchsorted(lengths, length_array, side="right") - 1
+        i = np.clip(i, 0, len(lengths) - 2)
+        segment_lengths = lengths[i + 1] - lengths[i]
+        # zero-length segments (only possible at the end after clipping)
+        segment_lengths = np.where(segment_lengths > 0, segment_lengths, 1.)
+        result = i + (length_array - lengths[i]) / segment_lengths
+        if result.ndim == 0:
+            return float(result)
+        return result
+
     def extend(self, start, length):
         """
         Move from a starting point for a given length in direction of the line
         """
         if length == 0:
             return start
-        direction = sign(length)
-        length = abs(length)
-        next_value = start - start % 1 + (direction > 0)
-        difference = norm(self[start] - self[next_value])
-        length -= difference
-        #
-        while length > 0:
-            if (next_value > len(self) and direction > 0) or (next_value < 0 and direction < 0):
-                break
-            start = next_value
-            next_value += direction
-            difference = norm(self[next_value] - self[start])
-            length -= difference
-            # Length is smaller than zero
-        length = length
-        return next_value + direction * length * abs(next_value - start) / difference
+        return self.get_ik_at_length(self.get_length_at(start) + length)
 
     def get_length(self, first=0, second=None):
         """
@@ -126,22 +234,16 @@ class PolyLine(HashedList):
         """
         if second is None:
             second = len(self) - 1
-        direction = sign(float(second - first))
-        length = 0
-        next_value = int(first - first % 1 + (direction > 0))
-        # Just to fasten up
-        if next_value > len(self) and direction < 0:
-            next_value = len(self)
-        elif next_value < 0 < direction:
-            next_value = 0
-        while next_value * direction < second * direction:
-            length += norm(self[next_value] - self[first])
-            first = next_value
-            next_value += direction
-            # Fasten up aswell
-            if (next_value > len(self) and direction > 0) or (next_value < 0 and direction < 0):
-                break
-        return length + norm(self[second] - self[first])
+        return abs(self.get_length_at(second) - self.get_length_at(first))
+
+    def resample(self, num):
+        """
+        Get a copy with num points, equally spaced by arc-length
+        """
+        ik_values = self.get_ik_at_length(np.linspace(0, self.arc_lengths[-1], num))
+        new = self.copy()
+        new.data = self.points_at(ik_values)
+        return new
 
     def scale(self, x, y=None):
         if y is None:
@@ -191,47 +293,109 @@ class PolyLine2D(PolyLine):
         if extrapolate is true, cuts will be exceeding the lists length
         """
         startpoint = int(startpoint)
-        for i in rangefrom(len(self)-1, startpoint):
-            try:
-                # (x,y), i, k
-                pos, ik1, ik2 = cut(self[i], self[i+1], p1, p2)
-                good_cut = 0 < ik1 <= 1 or ik1 == i == 0
-                extrapolated_front = i == 0 and ik1 <= 0
-                extrapolated_back = i == len(self)-2 and ik1 > 0
-                extrapolated_cut = extrapolated_front or extrapolated_back
-
-                if good_cut or extrapolate and extrapolated_cut:
-                    if cut_only_positive and ik2 < 0:
-                        continue
-                    yield i+ik1, ik2
-            except np.linalg.LinAlgError:
+        data = np.asarray(self.data, dtype=float)
+        if len(data) < 2:
+            return
+        # (x,y), i, k
+        ik1, ik2 = cut_batch(data[:-1], data[1:], np.asarray(p1, dtype=float), np.asarray(p2, dtype=float))
+        indices = np.arange(len(data) - 1)
+
+        good_cut = ((0 < ik1) & (ik1 <= 1)) | ((ik1 == 0) & (indices == 0))
+        if extrapolate:
+            extrapolated_front = (indices == 0) & (ik1 <= 0)
+            extrapolated_back = (indices == len(data) - 2) & (ik1 > 0)
+            good_cut |= extrapolated_front | extrapolated_back
+        if cut_only_positive:
+            good_cut &= ik2 >= 0
+
+        for i in sort_from(indices[good_cut], startpoint):
+            yield i + ik1[i], ik2[i]
+
+    def cut_with_polyline(self, pl, startpoint=0, blocksize=64):
+        """
+        Iterate over all cuts with the segments of another polyline
+        yields (ik_self, ik_other), ordered by the other polyline's segments
+        """
+        startpoint = int(startpoint)
+        data = np.asarray(self.data, dtype=float)
+        other = np.asarray(pl.data, dtype=float)
+        if len(data) < 2 or len(other) < 2:
+            return
+        indices = np.arange(len(data) - 1)
+
+        # process blocks of segments, so that next() doesn't have to calculate all cuts
+        for block_start in range(0, len(other) - 1, blocksize):
+            block = np.arange(block_start, min(block_start + blocksize, len(other) - 1))
+            starts = other[block]
+            ends = other[block + 1]
+            # prefilter: rays (cut_only_positive) missing the bounding box
+            block = block[_rays_hit_bbox(starts, ends - starts, data)]
+            if not len(block):
                 continue
 
-    def cut_with_polyline(self, pl, startpoint=0):
-        for i, (p1, p2) in enumerate(zip(pl[:-1], pl[1:])):
-            l = norm(p2-p1)
-            for ik1, k2 in self.cut(p1, p2, startpoint, cut_only_positive=True):
-                ik2 = i + (norm(self[ik1] - p1) / l)
-                yield ik1, ik2
+            ik1, ik2 = cut_batch(data[np.newaxis, :-1], data[np.newaxis, 1:],
+                                 other[block][:, np.newaxis], other[block + 1][:, np.newaxis])
+            good_cut = ((0 < ik1) & (ik1 <= 1)) | ((ik1 == 0) & (indices == 0))
+            good_cut &= ik2 >= 0
+
+            for row, i in enumerate(block):
+                for j in sort_from(indices[good_cut[row]], startpoint):
+                    yield j + ik1[row, j], i + ik2[row, j]
 
-    def check(self):  # TODO: IMPROVE (len = len(self.data), len-=,...)
+    def check(self):
         """
         Check for mistakes in the array, such as for the moment: self-cuttings,..
         """
         super(PolyLine2D, self).check()
-        for i in range(len(self.data) - 3):
-            if i > len(self.data) - 4:
-                break
-            for j in range(i + 2, len(self.data) - 2):
-                if j > len(self.data) - 3:
-                    break
-                try:
-                    temp = cut(self.data[i], self.data[i + 1], self.data[j], self.data[j + 1])
+        data = np.asarray(self.data, dtype=float)
+        num = len(data)
+        if num < 5:
+            return self
+
+        partners = _self_cut_candidates(data)
+        if not partners:
+            return self
+
+        # Remove loops the same way the former double-loop did:
+        # segment i is tested against all segments j >= i+2 (except the last one),
+        # a cut replaces the points i..j with the cutting point. Only candidates
+        # from the sweep are tested, the indices refer to the original data.
+        result = []
+        start = data[0]  # start of the current segment (point or cut)
+        end_index = 1  # index of the current segment's endpoint
+        segment = 0  # original segment containing the current segment
+        while end_index <= num - 3:
+            j = end_index + 1
+            while j <= num - 3:
+                candidates = partners.get(segment, [])
+                pos = bisect.bisect_left(candidates, j)
+                next_cut = None
+                for j_candidate in candidates[pos:]:
+                    if j_candidate > num - 3:
+                        break
+                    try:
+                        temp = cut(start, data[end_index], data[j_candidate], data[j_candidate + 1])
+                    except np.linalg.LinAlgError:
+                        continue
                     if 0 < temp[1] < 1. and 0 < temp[2] < 1.:
-                        #self.data = self.data[:i] + [temp[0]] + self.data[j + 1:]
-                        self.data = np.concatenate([self.data[:i], [temp[0]], self.data[j+1:]])
-                except np.linalg.linalg.LinAlgError:
-                    continue
+                        next_cut = j_candidate, temp[0]
+                        break
+                if next_cut is None:
+                    break
+                j_cut, point = next_cut
+                # the double-loop continued with the next index of the shortened list
+                j = 2 * j_cut - end_index + 2
+                start = point
+                end_index = j_cut + 1
+                segment = j_cut
+
+            result.append(start)
+            start = data[end_index]
+            segment = end_index
+            end_index += 1
+
+        result.append(start)
+        self.data = np.concatenate([result, data[end_index:]])
 
         return self
 
@@ -242,22 +406,17 @@ class PolyLine2D(PolyLine):
         this property returns a normal for every point,
         approximated by the 2 neighbour points (len(data) == len(normals))
         """
-        rotate = lambda x: normalize(x).dot([[0, -1], [1, 0]])
-        normvectors = [rotate(self.data[1] - self.data[0])]
-        for j in range(1, len(self.data) - 1):
-            normvectors.append(
-                #rotate(normalize(self.data[j + 1] - self.data[j]) + normalize(self.data[j] - self.data[j - 1])))
-                rotate(self.data[j + 1] - self.data[j - 1]))
-        normvectors.append(rotate(self.data[-1] - self.data[-2]))
-        return normvectors
-
+        data = np.asarray(self.data, dtype=float)
+        directions = np.concatenate([data[1:2] - data[0:1],
+                                     data[2:] - data[:-2],
+                                     data[-1:] - data[-2:-1]])
+        return _rotate_normalized(directions)
 
     @cached_property('self')
     def tangents(self):
-        tangents = []
-        for p1, p2 in self.segments:
-            tangents.append((p2 - p1) / norm(p2 - p1))
-        return np.array(tangents)
+        segments = self.segments
+        directions = segments[:, 1] - segments[:, 0]
+        return directions / np.linalg.norm(directions, axis=1)[:, np.newaxis]
 
     @cached_property('self')
     def norm_segment_vectors(self):
@@ -265,11 +424,8 @@ class PolyLine2D(PolyLine):
         return all the normals based on the segments of the data:
         len(data) - 1 == len(normals)
         """
-        rotate = lambda x: normalize(x).dot([[0, -1], [1, 0]])
-        normvectors = []
-        for p1, p2 in self.segments:
-            normvectors.append(rotate(normalize(p2 - p1)))
-        return np.array(normvectors)
+        data = np.asarray(self.data, dtype=float)
+        return _rotate_normalized(data[1:] - data[:-1])
 
     def get_normal(self, ik):
         """get normal-vector by ik-value"""
@@ -285,11 +441,8 @@ class PolyLine2D(PolyLine):
 
     @property
     def segments(self):
-        data = self.data
-        segments = []
-        for i in range(len(self) - 1):
-            segments.append(data[i:i+2])
-        return np.array(segments)
+        data = np.asarray(self.data)
+        return np.stack([data[:-1], data[1:]], axis=1)
 
     def move(self, vector):
         """
@@ -301,42 +454,41 @@ class PolyLine2D(PolyLine):
 
         return self
 
-    def add_stuff(self, amount):
+    def add_stuff(self, amount, miter_limit=None):
         """
         Shift the whole line for a given amount (->Sewing allowance)
+        Corners are mitered, reversals (180 degree) and corners exceeding the
+        miter_limit (miter length / amount) get two points (bevel).
         """
-        # cos(vectorangle(a,b)) = (a1 b1+a2 b2)/Sqrt[(a1^2+a2^2) (b1^2+b2^2)]
-        newlist = []
-        second = self.data[0]
-        third = self.data[1]
-        newlist.append(second + self.norm_segment_vectors[0] * amount)
-        for i in range(1, len(self.data) - 1):
-            first = second
-            second = third
-            third = self.data[i + 1]
-            d1 = second - first
-            d2 = third - second
-            cosphi = d1.dot(d2) / np.sqrt(d1.dot(d1) * d2.dot(d2))
-            coresize = 1e-8
-            if cosphi > 0.9999 or norm(d1) < coresize or norm(d2) < coresize:
-                newlist.append(second + self.normvectors[i] * amount / cosphi)
-            elif cosphi < -0.9999: # this is true if the direction changes 180 degree
-                n1 = self.norm_segment_vectors[i-1]
-                n2 = self.norm_segment_vectors[i]
-                newlist.append(second + self.norm_segment_vectors[i-1] * amount)
-                newlist.append(second + self.norm_segment_vectors[i] * amount)
-            else:
-                n1 = self.norm_segment_vectors[i-1]
-                n2 = self.norm_segment_vectors[i]
-                sign = -1. + 2. * (d2.dot(n1) > 0)
-                phi = np.arccos(n1.dot(n2))
-                d1 = normalize(d1)
-                ext_vec = n1 - sign * d1 * np.tan(phi / 2)
-                newlist.append(second + ext_vec * amount)
-
-                # newlist.append(cut(a, b, c, d)[0])
-        newlist.append(third + self.norm_segment_vectors[-1] * amount)
-        self.data = newlist
+        data = np.asarray(self.data, dtype=float)
+        segment_lengths = np.linalg.norm(data[1:] - data[:-1], axis=1)
+        # zero-length segments have no direction -> zero normal, the neighbours are used
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normals = _rotate_normalized(data[1:] - data[:-1])
+        normals[segment_lengths < 1e-8] = 0
+
+        # incoming and outgoing normal at every point
+        normals_in = np.concatenate([normals[:1], normals])
+        normals_out = np.concatenate([normals, normals[-1:]])
+
+        # miter vector m: m.dot(n_in) == m.dot(n_out) == 1
+        cos_phi = np.sum(normals_in * normals_out, axis=1)
+        reversal = cos_phi < -0.9999
+        with np.errstate(divide="ignore", invalid="ignore"):
+            miter = (normals_in + normals_out) / (1 + cos_phi)[:, np.newaxis]
+        miter_length = np.linalg.norm(miter, axis=1)
+        bevel = reversal | ~np.isfinite(miter_length)
+        if miter_limit is not None:
+            bevel |= miter_length > miter_limit
+
+        first = np.where(bevel[:, np.newaxis], normals_in, miter)
+        second = np.where(bevel[:, np.newaxis], normals_out, miter)
+        # one point for mitered corners, two points for beveled ones
+        offsets = np.stack([first, second], axis=1).reshape(-1, 2)
+        use = np.stack([np.ones_like(bevel), bevel], axis=1).reshape(-1)
+        points = np.repeat(data, 2, axis=0)
+
+        self.data = (points + offsets * amount)[use]
 
         return self
 
@@ -37,42 +37,81 @@ def point2d(p1_3d, p1_2d, p2_3d, p2_2d, point_3d):
     return np.array(point_2d + diff_2d * diff_3d.dot(diff_point))
 
 
-def flatten_list(list1, list2):
+def _flatten_steps(len1, len2):
+    """
+    Order of the unfolding: [(index_left, index_right, side, index_new), ...]
+    alternating left/right, side 0 adds list1[index_new], side 1 list2[index_new]
+    """
+    steps = []
     index_left = index_right = 0
-    flat_left = [np.array([0, 0])]
-    flat_right = [np.array([norm(list1[0]-list2[0]), 0])]
-
-    # def which(i, j):
-    #     diff = list1[i] - list2[j]
-    #     return diff.dot(list1[i+1]-list1[i]+list2[j+1]-list2[j+1])
     while True:
-        #while which(index_left, index_right) <= 0 and index_left < len(list1) - 2:  # increase left_index
-        if index_left < len(list1) - 1:
-            flat_left.append(point2d(list1[index_left], flat_left[index_left],
-                                     list2[index_right], flat_right[index_right],
-                                     list1[index_left + 1]))
+        if index_left < len1 - 1:
+            steps.append((index_left, index_right, 0, index_left + 1))
             index_left += 1
 
-        #while which(index_left, index_right) >= 0 and index_right < len(list2) - 2:  # increase right_index
-        if index_right < len(list2) - 1:
-            flat_right.append(point2d(list1[index_left], flat_left[index_left],
-                                      list2[index_right], flat_right[index_right],
-                                      list2[index_right + 1]))
+        if index_right < len2 - 1:
+            steps.append((index_left, index_right, 1, index_right + 1))
             index_right += 1
 
-        if index_left == len(list1) - 1 and index_right == len(list2) - 1:
-            break
-
-    # while index_left < len(list1) - 1:
-    #     flat_left.append(point2d(list1[index_left], flat_left[index_left],
-    #                              list2[index_right], flat_right[index_right],
-    #                              list1[index_left + 1]))
-    #     index_left += 1
-    #
-    # while index_right < len(list2) - 1:
-    #     flat_right.append(point2d(list1[index_left], flat_left[index_left],
-    #                               list2[index_right], flat_right[index_right],
-    #                               list2[index_right + 1]))
-    #     index_right += 1
-
-    return PolyLine2D(flat_left), PolyLine2D(flat_right)
\ No newline at end of file
+        if index_left >= len1 - 1 and index_right >= len2 - 1:
+            return steps
+
+
+def flatten_lists(lists1, lists2):
+    """
+    Flatten many pairs of 3d-lines (p.e. the ribs of all cells) at once.
+    lists1: (n x len1 x 3), lists2: (n x len2 x 3)
+    Returns the stacked 2d-lines (n x len1 x 2), (n x len2 x 2)
+    """
+    lists1 = np.asarray(lists1, dtype=float)
+    lists2 = np.asarray(lists2, dtype=float)
+    num, len1 = lists1.shape[:2]
+    len2 = lists2.shape[1]
+    steps = np.array(_flatten_steps(len1, len2), dtype=int).reshape(-1, 4)
+    index_left, index_right, side, index_new = steps.T
+
+    # local coordinates of every new point in the 3d-frame p1 -> p2 (vectorized)
+    p1 = lists1[:, index_left]
+    p2 = lists2[:, index_right]
+    point = np.where(side[np.newaxis, :, np.newaxis] == 0,
+                     lists1[:, np.minimum(index_new, len1 - 1)],
+                     lists2[:, np.minimum(index_new, len2 - 1)])
+    diff_3d = p2 - p1
+    diff_3d /= np.linalg.norm(diff_3d, axis=-1)[..., np.newaxis]
+    diff_point = point - p1
+    along = np.sum(diff_3d * diff_point, axis=-1)
+    across = np.linalg.norm(diff_point - diff_3d * along[..., np.newaxis], axis=-1)
+    local = along + 1j * across
+
+    # chain the 2d-frames (complex numbers: rotation by 90deg == *1j)
+    flat_left = np.zeros((len1, num), dtype=complex)
+    flat_right = np.zeros((len2, num), dtype=complex)
+    flat_right[0] = np.linalg.norm(lists1[:, 0] - lists2[:, 0], axis=-1)
+    if num == 1:
+        # python-scalars are faster than tiny numpy-arrays
+        flat = [flat_left[:, 0].tolist(), flat_right[:, 0].tolist()]
+        local = local[0].tolist()
+        for step, (i, j, step_side, new) in enumerate(steps.tolist()):
+            p1_2d = flat[0][i]
+            direction = flat[1][j] - p1_2d
+            flat[step_side][new] = p1_2d + direction / abs(direction) * local[step]
+        flat_left[:, 0], flat_right[:, 0] = flat
+    else:
+        flat = [flat_left, flat_right]
+        for step, (i, j, step_side, new) in enumerate(steps.tolist()):
+            p1_2d = flat_left[i]
+            direction = flat_right[j] - p1_2d
+            flat[step_side][new] = p1_2d + direction / np.abs(direction) * local[:, step]
+
+    def to_array(flat):
+        return np.stack([flat.real.T, flat.imag.T], axis=-1)
+
+    return to_array(flat_left), to_array(flat_right)
+
+
+def flatten_list(list1, list2):
+    """
+    Unfold the triangle-strip between two 3d-lines into the plane
+    """
+    left, right = flatten_lists([np.asarray(list1)], [np.asarray(list2)])
+    return PolyLine2D(left[0]), PolyLine2D(right[0])
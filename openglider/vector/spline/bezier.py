@@ -22,12 +22,14 @@ from __future__ import division
 import numpy as np
 
 from openglider.utils.cache import HashedList
-from openglider.vector import norm, Interpolation
+from openglider.vector import Interpolation
 from openglider.vector.transformation import Reflection
 from openglider.utils import dualmethod
 
 
 class _BernsteinFactory():
+    key = ("bernstein", None)
+
     def __init__(self):
         self.bases = {}
 
@@ -41,8 +43,62 @@ class _BernsteinFactory():
 
         return self.bases[degree]
 
+    def get_matrix(self, degree, values):
+        """
+        Evaluate all basis functions for an array of values at once
+        :return: np.array (len(values), degree)
+        """
+        values = np.asarray(values, dtype=float)[:, np.newaxis]
+        exponents = np.arange(degree)
+        binomials = np.array([choose(degree - 1, n) for n in exponents], dtype=float)
+        return binomials * values ** exponents * (1 - values) ** (degree - 1 - exponents)
+
 BernsteinBase = _BernsteinFactory()
 
+# process-wide cache for the basis-matrices of get_sequence/fit
+_basis_matrices = {}
+
+
+def get_basis_matrix(basefactory, num_ctrl, num):
+    """
+    Basis-matrix of the basefactory for num equidistant values (0..1).
+    The (read-only) result is cached per (basis type, degree, num_ctrl, num)
+    """
+    key = getattr(basefactory, "key", None)
+    if key is None:
+        return basefactory.get_matrix(num_ctrl, np.linspace(0, 1, num))
+
+    key = key + (num_ctrl, num)
+    if key not in _basis_matrices:
+        matrix = basefactory.get_matrix(num_ctrl, np.linspace(0, 1, num))
+        matrix.setflags(write=False)
+        _basis_matrices[key] = matrix
+
+    return _basis_matrices[key]
+
+
+def least_squares(matrix, values, fixed=None):
+    """
+    Solve min(|matrix.dot(u) - values|) for all columns of values at once (lstsq).
+    fixed: {index: value} -> equality constraints for rows of u. These are
+    eliminated by solving for the remaining rows only (null-space of the constraints).
+    """
+    values = np.asarray(values, dtype=float)
+    num_ctrl = matrix.shape[1]
+    fixed = {index % num_ctrl: value for index, value in (fixed or {}).items()}
+    fixed_indices = sorted(fixed)
+    free_indices = [i for i in range(num_ctrl) if i not in fixed]
+
+    solution = np.zeros((num_ctrl,) + values.shape[1:])
+    rhs = values
+    if fixed_indices:
+        for index in fixed_indices:
+            solution[index] = fixed[index]
+        rhs = values - matrix[:, fixed_indices].dot(solution[fixed_indices])
+
+    solution[free_indices] = np.linalg.lstsq(matrix[:, free_indices], rhs, rcond=None)[0]
+    return solution
+
 
 class Bezier(HashedList):
     basefactory = BernsteinBase
@@ -52,7 +108,6 @@ class Bezier(HashedList):
         Bezier Curve representative
         http://en.wikipedia.org/wiki/Bezier_curve#Generalization
         """
-        self._matrix = None
         super(Bezier, self).__init__(controlpoints)
 
     def __repr__(self):
@@ -66,14 +121,17 @@ class Bezier(HashedList):
         return cls(controlpoints)
 
     def __call__(self, value):
-        dim = len(self.data[0])
-        assert 0 <= value <= 1, "value must be in the range (0,1), not {}".format(value)
+        """
+        Get the point for a value (0..1) or an array of points for an array of values
+        """
+        values = np.asarray(value, dtype=float)
+        assert np.all((0 <= values) & (values <= 1)), "value must be in the range (0,1), not {}".format(value)
 
-        val = np.zeros(dim)
-        base = self.basefactory(len(self.data))
-        for i, point in enumerate(self.data):
-            val += point * base[i](value)
-        return val
+        matrix = self.basefactory.get_matrix(len(self.data), values.reshape(-1))
+        points = matrix.dot(self.data)
+        if values.ndim == 0:
+            return points[0]
+        return points
 
     @property
     def numpoints(self):
@@ -85,13 +143,12 @@ class Bezier(HashedList):
     @numpoints.setter
     def numpoints(self, num_ctrl, num_points=50):
         if not num_ctrl == self.numpoints:
-            data = [self(i) for i in np.linspace(0, 1, num_points)]
+            data = self(np.linspace(0, 1, num_points))
             self.fit(data, num_ctrl)
 
     def change_base(self, base, num_points=50):
-        data = [self(i) for i in np.linspace(0, 1, num_points)]
+        data = self(np.linspace(0, 1, num_points))
         self.basefactory = base
-        self._matrix = None
         self.fit(data, self.numpoints)
 
     @property
@@ -108,49 +165,15 @@ class Bezier(HashedList):
         Fit to a given set of points with a certain number of spline-points (default=3)
         if start (/ end) is True, the first (/ last) point of the Curve is included
         """
-        base = this.basefactory(numpoints)
-        matrix = np.matrix(
-            [[base[column](row * 1. / (len(points) - 1))
-                for column in range(len(base))]
-                    for row in range(len(points))])
-
-        if not start and not end:
-            matrix = np.linalg.pinv(matrix)
-            out = np.array(matrix * points)
-            return out
-        else:
-            A1 = np.array(matrix)
-            A2 = []
-            points2 = []
-            points1 = np.array(points)
-            solution = []
+        points = np.asarray(points, dtype=float)
+        matrix = get_basis_matrix(this.basefactory, numpoints, len(points))
 
-            if start:
-                # add first column to A2 and remove first column of A1
-                A2.append(A1[:, 0])
-                A1 = A1[:, 1:]
-                points2.append(points[0])
-                points1 = points1[1:]
-
-            if end:
-                # add last column to A2 and remove last column of A1
-                A2.append(A1[:, -1])
-                A1 = A1[:, :-1]
-                points2.append(points[-1])
-                points1 = points[:-1]
-            A1_inv = np.linalg.inv(np.dot(A1.T, A1))
-            A2 = np.array(A2).T
-            points1 = np.array(points).T
-            points2 = np.array(points2).T
-            for dim, point in enumerate(points1):
-                rhs1 = np.array(A1.T.dot(point))
-                rhs2 = np.array((A1.T.dot(A2)).dot(points2[dim])).T
-                solution.append(np.array(A1_inv.dot(rhs1 - rhs2)))
-            solution = np.matrix(solution).T.tolist()
-            if start:
-                solution.insert(0, points[0])
-            if end:
-                solution.append(points[-1])
+        fixed = {}
+        if start:
+            fixed[0] = points[0]
+        if end:
+            fixed[numpoints - 1] = points[-1]
+        solution = least_squares(matrix, points, fixed)
 
         if type(this) == type:  # classmethod
             return this(solution)
@@ -158,6 +181,33 @@ class Bezier(HashedList):
             this.controlpoints = solution
             return this
 
+    @classmethod
+    def fit_many(cls, point_lists, numpoints=5, start=True, end=True):
+        """
+        Fit several curves at once, point-lists of the same shape are solved together.
+        :return: [curve1, curve2,...]
+        """
+        point_lists = [np.asarray(points, dtype=float) for points in point_lists]
+        groups = {}
+        for index, points in enumerate(point_lists):
+            groups.setdefault(points.shape, []).append(index)
+
+        solutions = [None] * len(point_lists)
+        for (num, dim), indices in groups.items():
+            matrix = get_basis_matrix(cls.basefactory, numpoints, num)
+            values = np.concatenate([point_lists[index] for index in indices], axis=1)
+            fixed = {}
+            if start:
+                fixed[0] = values[0]
+            if end:
+                fixed[numpoints - 1] = values[-1]
+            solution = least_squares(matrix, values, fixed)
+
+            for i, index in enumerate(indices):
+                solutions[index] = solution[:, i*dim:(i+1)*dim]
+
+        return [cls(solution) for solution in solutions]
+
     @dualmethod
     def constraint_fit(this, points, constraint):
         """constraint is a matrix in size of the controlpointmatrix
@@ -169,56 +219,32 @@ class Bezier(HashedList):
         num_ctrl_pts = len(constraint)
 
         # create the base matrix:
-        base = this.basefactory(num_ctrl_pts)
-        matrix = np.array(
-            [[base[column](row * 1. / (len(points) - 1))
-                for column in range(len(base))]
-                    for row in range(len(points))])
-
-        # create the b vector for each dim
-        b = np.array(list(zip(*points)))
-
-        # fit
-        solution = []
-        constraints_T = list(zip(*constraint))
-        for i in range(dim):
-            constraints = [[index, val] for index, val in enumerate(constraints_T[i]) if val != None]
-            solution.append(this.constraint_least_square_sol(matrix, b[i], constraints))
+        matrix = get_basis_matrix(this.basefactory, num_ctrl_pts, len(points))
+        points = np.asarray(points, dtype=float)
+
+        # fit all dimensions with the same constrained indices at once
+        groups = {}
+        for i, column in enumerate(zip(*constraint)):
+            fixed_indices = tuple(index for index, val in enumerate(column) if val is not None)
+            groups.setdefault(fixed_indices, []).append(i)
+
+        solution = np.zeros((num_ctrl_pts, dim))
+        for fixed_indices, dimensions in groups.items():
+            fixed = {index: [constraint[index][i] for i in dimensions] for index in fixed_indices}
+            solution[:, dimensions] = least_squares(matrix, points[:, dimensions], fixed)
+
         if type(this) == type:
-            return this(np.array(solution).transpose())
+            return this(solution)
         else:
-            this.controlpoints = np.array(solution).transpose()
+            this.controlpoints = solution
             return this
 
-
     @staticmethod
     def constraint_least_square_sol(A, b, constraint):
         """return u for minimized |A.u-b| with u containing the constraint points.
         A(n x m)...matrix with n >= m + c_n (n=num_cols, m=num_rows, c_n=num_constraints)
         constraint: dict of "indeces: value" couples  [[0, 1.], [10, 3.]]"""
-        # create  vector from the known values
-        u_fix = np.zeros(A.shape[1])
-        u_sol_index = list(range(len(u_fix)))
-        u = np.zeros(A.shape[1])
-        for key, val in constraint:
-            u_fix[key] = val
-
-        # A.T.dot(A).dot(u) == A.T.dot(b) - A.T.dot(A).dot(u_fix)
-        rhs =  A.T.dot(b) - ((A.T).dot(A)).dot(u_fix)
-        mat = A.T.dot(A)
-        for i, key in enumerate(constraint):
-            mat = np.delete(mat, key[0] - i, 0)
-            mat = np.delete(mat, key[0] - i, 1)
-            rhs = np.delete(rhs, key[0] - i, 0)
-            u_sol_index.pop(key[0] - i)
-        u_sol = np.linalg.solve(mat, rhs.transpose())
-
-        # insert the known values in the solution
-        for i, index in enumerate(u_sol_index):
-            u[index] = u_sol[i]
-        for key, val in constraint:
-            u[key] = val
-        return u
+        return least_squares(np.asarray(A), b, dict(constraint))
 
     def interpolation(self, num=100, **kwargs):
         return Interpolation(self.get_sequence(num))
@@ -227,33 +253,21 @@ class Bezier(HashedList):
         self.controlpoints = [p*[x,y] for p in self.controlpoints]
 
     def get_matrix(self, num=50):
-        num_points = len(self._data)
-        if self._matrix is not None and self._matrix.shape == (num, num_points):
-            return self._matrix
-        else:
-            self._matrix = np.ndarray([num, num_points])
-            functions = self.basefactory(num_points)
-            for row, value in enumerate(np.linspace(0, 1 , num)):
-                for col, foo in enumerate(functions):
-                    self._matrix[row, col] = foo(value)
-            return self._matrix
+        return get_basis_matrix(self.basefactory, len(self._data), num)
 
     def get_sequence(self, num=50):
         return np.dot(self.get_matrix(num), self._data)
 
     def get_length(self, num):
         seq = self.get_sequence(num=num)
-        out = 0.
-        for i, s in enumerate(seq[1:]):
-            out += norm(s - seq[i])
-        return out
+        return np.sum(np.linalg.norm(seq[1:] - seq[:-1], axis=1))
 
 
 class SymmetricBezier(Bezier):
     def __init__(self, controlpoints=None, mirror=None):
         self._mirror = mirror or Reflection([1., 0., 0.])
         super(SymmetricBezier, self).__init__(controlpoints=None)
-        if controlpoints:
+        if controlpoints is not None and len(controlpoints):
             self.controlpoints = controlpoints
 
     @classmethod
@@ -278,8 +292,8 @@ class SymmetricBezier(Bezier):
     @numpoints.setter
     def numpoints(self, num_ctrl, num_points=50):
         if not num_ctrl == self.numpoints:
-            data = [self(i) for i in np.linspace(0, 1, num_points)]
-            self.fit(np.array(data), num_ctrl)
+            data = self(np.linspace(0, 1, num_points))
+            self.fit(data, num_ctrl)
 
     @dualmethod
     def fit(cls, data, numpoints=3, start=True, end=True):
@@ -287,6 +301,13 @@ class SymmetricBezier(Bezier):
         bez.controlpoints = bez.controlpoints[numpoints:]
         return bez
 
+    @classmethod
+    def fit_many(cls, point_lists, numpoints=3, start=True, end=True):
+        curves = super(SymmetricBezier, cls).fit_many(point_lists, numpoints=2*numpoints, start=start, end=start)
+        for curve in curves:
+            curve.controlpoints = curve.controlpoints[numpoints:]
+        return curves
+
 
 
 def choose(n, k):
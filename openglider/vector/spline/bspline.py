@@ -1,54 +1,57 @@
+import numpy as np
+
 from openglider.vector.spline.bezier import Bezier, SymmetricBezier
 from openglider.utils import dualmethod
 
+
 class BSplineBase():
     def __init__(self, degree=3):
         self.degree = degree
         self.bases = {}
 
-    def __call__(self, numpoints):      # number of controlpoints
-        if numpoints not in self.bases and True:
-            knots = self.make_knot_vector(self.degree, numpoints)
-            basis = [self.get_basis(self.degree, i, knots) for i in range(numpoints)]
-            self.bases[numpoints] = basis
+    @property
+    def key(self):
+        return "bspline", self.degree
 
-        return self.bases[numpoints]
+    def __call__(self, numpoints):      # number of controlpoints
+        if numpoints not in self.bases:
+            def basis_function(i):
+                return lambda t: self.get_matrix(numpoints, [t])[0, i]
 
-    def get_basis(self, degree, i, knots):
-        """ Returns a basis_function for the given degree """
-        if degree == 0:
-            def basis_function(t):
-                """The basis function for degree = 0 as per eq. 7"""
-                t_this = knots[i]
-                t_next = knots[i+1]
-                return t_next >= t > t_this
-        else:
-
-            def basis_function(t):
-                """The basis function for degree > 0 as per eq. 8"""
-                if i == t == 0:
-                    return 1
-                out = 0.
-                t_this = knots[i]
-                t_next = knots[i+1]
-                t_precog  = knots[i+degree]
-                t_horizon = knots[i+degree+1]
-
-                top = (t-t_this)
-                bottom = (t_precog-t_this)
-
-                if bottom != 0:
-                    out = top/bottom * self.get_basis(degree-1, i, knots)(t)
-
-                top = (t_horizon-t)
-                bottom = (t_horizon-t_next)
-                if bottom != 0:
-                    out += top/bottom * self.get_basis(degree-1, i+1, knots)(t)
-                return out
-
-        return basis_function
+            self.bases[numpoints] = [basis_function(i) for i in range(numpoints)]
 
+        return self.bases[numpoints]
 
+    def get_matrix(self, numpoints, values):
+        """
+        Evaluate all basis functions for an array of values at once
+        (iterative Cox-de Boor)
+        :return: np.array (len(values), numpoints)
+        """
+        knots = np.array(self.make_knot_vector(self.degree, numpoints))
+        t = np.asarray(values, dtype=float)[:, np.newaxis]
+        at_start = t[:, 0] == 0
+
+        # degree 0: (t_i, t_i+1]
+        basis = ((knots[:-1] < t) & (t <= knots[1:])).astype(float)
+
+        for degree in range(1, self.degree + 1):
+            num = len(knots) - 1 - degree
+            t_this = knots[:num]
+            t_next = knots[1:num+1]
+            t_precog = knots[degree:num+degree]
+            t_horizon = knots[degree+1:num+degree+1]
+
+            bottom_1 = t_precog - t_this
+            bottom_2 = t_horizon - t_next
+            with np.errstate(divide="ignore", invalid="ignore"):
+                factor_1 = np.where(bottom_1 != 0, (t - t_this) / bottom_1, 0.)
+                factor_2 = np.where(bottom_2 != 0, (t_horizon - t) / bottom_2, 0.)
+
+            basis = factor_1 * basis[:, :num] + factor_2 * basis[:, 1:num+1]
+            basis[at_start, 0] = 1
+
+        return basis
 
     def make_knot_vector(self, degree, num_points):
         """
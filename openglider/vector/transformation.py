@@ -1,50 +1,66 @@
 import numpy as np
-from .functions import normalize
+from .functions import normalize, rotation_3d
 
 class Transformation(object):
     '''
     Transformation represented by a 4x4 matrix. This includes transfomation + translation.
+    A stack of matrices (n x 4 x 4) represents n transformations applied at once.
     '''
     def __init__(self, mat):
-        # mat is a 4 x 4 matrix
-        assert len(mat) == len(mat.T) == 4
-        self.mat = np.array(mat)
+        # mat is a 4 x 4 matrix (or a stack of them)
+        mat = np.array(mat)
+        assert mat.shape[-2:] == (4, 4)
+        self.mat = mat
+
+    def __len__(self):
+        return len(self.mat) if self.mat.ndim > 2 else 1
+
+    def __getitem__(self, item):
+        """Get a single transformation from a stack"""
+        return Transformation(self.mat[item])
 
     def __call__(self, vec):
         vec = np.array(vec)
         assert len(vec.shape) == 1
         vec = np.array([vec])
-        return self.apply(vec)[0]
+        return self.apply(vec)[..., 0, :]
 
     def apply(self, vec):
-        if len(vec[0]) == 2:
-            return vec.dot(self.mat[:2,:2]) + self.mat[-1,:2]
-        elif len(vec[0]) == 3:
-            return vec.dot(self.mat[:3,:3]) + self.mat[-1,:3]
-        else:
-            return vec.dot(self.mat[:4,:4])
+        """
+        Apply to an array of points (n x dim).
+        Stacked transformations take a stack of point-arrays (m x n x dim)
+        """
+        vec = np.asarray(vec)
+        dim = vec.shape[-1]
+        if self.mat.ndim == 2:
+            if dim == 4:
+                return vec.dot(self.mat)
+            return vec.dot(self.mat[:dim, :dim]) + self.mat[-1, :dim]
+
+        result = np.einsum("...nd,...de->...ne", vec, self.mat[..., :dim, :dim])
+        if dim < 4:
+            result += self.mat[..., np.newaxis, -1, :dim]
+        return result
 
     def dot(self, other):
-        return Transformation(self.mat.dot(other.mat))
+        return Transformation(np.matmul(self.mat, other.mat))
 
     def __mul__(self, other):
-        return Transformation(self.mat.dot(other.mat))
+        return Transformation(np.matmul(self.mat, other.mat))
 
 
 class Rotation(Transformation):
     def __init__(self, angle=0., axis=None):
+        """
+        angle and axis can be arrays (one per transformation) -> stacked transformation
+        """
         # see http://en.wikipedia.org/wiki/SO%284%29#The_Euler.E2.80.93Rodrigues_formula_for_3D_rotations"""
         if axis is None:
             axis = np.array([0., 0., 1.])
-        assert len(axis) == 3
-        a = np.cos(angle / 2)
-        (b, c, d) = -normalize(axis) * np.sin(angle / 2)
-        mat = np.array([
-            [a**2 + b**2 - c**2 - d**2, 2*(b*c - a*d), 2*(b*d + a*c), 0.],
-            [2*(b*c + a*d), a**2 + c**2 - b**2 - d**2,  2 * (c*d - a*b), 0.],
-            [2*(b*d - a*c), 2*(c*d + a*b), a**2 + d**2 - b**2 - c**2, 0.],
-            [0., 0., 0., 1.]
-        ])
+        rotation = rotation_3d(angle, axis)
+        mat = np.zeros(rotation.shape[:-2] + (4, 4))
+        mat[..., :3, :3] = rotation
+        mat[..., 3, 3] = 1.
         super(Rotation, self).__init__(mat)
 
 
@@ -66,20 +82,30 @@ class Reflection(Transformation):
 
 class Scale(Transformation):
     def __init__(self, scale_values=None):
+        """
+        scale_values: number (uniform), [x, y, z] or a stack of those (n x 1 or n x 3)
+        """
         if scale_values is None:
             scale_values = np.ones(3)
         elif isinstance(scale_values, (int, float)):
             scale_values = np.ones(3) * scale_values
-        _scale_values = np.ones(4)
-        _scale_values[:len(scale_values)] = scale_values
-        mat = np.diag(_scale_values)
+        scale_values = np.asarray(scale_values, dtype=float)
+        if scale_values.ndim > 1 and scale_values.shape[-1] == 1:
+            scale_values = scale_values * np.ones(3)
+        _scale_values = np.ones(scale_values.shape[:-1] + (4,))
+        _scale_values[..., :scale_values.shape[-1]] = scale_values
+        mat = _scale_values[..., np.newaxis] * np.eye(4)
         super(Scale, self).__init__(mat)
 
 
 class Translation(Transformation):
     def __init__(self, vec=None):
+        """
+        vec: translation-vector or a stack of vectors (n x dim)
+        """
         if vec is None:
             vec = np.zeros(3)
-        mat = np.eye(4)
-        mat[-1,:len(vec)] = vec
-        super(Translation, self).__init__(mat)
\ No newline at end of file
+        vec = np.asarray(vec)
+        mat = np.tile(np.eye(4), vec.shape[:-1] + (1, 1))
+        mat[..., -1, :vec.shape[-1]] = vec
+        super(Translation, self).__init__(mat)
@@ -0,0 +1,42 @@
+"""
+Compare the sweep-based PolyLine2D.check with the former double-loop
+on the (resampled) sewing-allowance outlines of the demokite.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+import openglider
+from openglider.plots.glider.cell import CellPlotMaker
+
+tests_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests")
+sys.path.append(tests_dir)
+from common.reference import check_reference
+
+demokite = os.path.join(tests_dir, "common", "demokite.json")
+
+glider = openglider.load(demokite).get_glider_3d()
+outlines = []
+for cell in glider.cells:
+    inner, ballooned, outer, outer_orig = CellPlotMaker(cell, [])._get_flatten_cell()
+    outlines += ballooned
+
+for numpoints in (100, 200, 400):
+    lines = []
+    for line, amount in zip(outlines, [-0.01, 0.01] * len(outlines)):
+        lines.append(line.resample(numpoints).add_stuff(amount))
+
+    start = time.time()
+    result_quadratic = [check_reference(line.copy()) for line in lines]
+    t_quadratic = time.time() - start
+
+    start = time.time()
+    result_sweep = [line.copy().check() for line in lines]
+    t_sweep = time.time() - start
+
+    equal = all(len(l1) == len(l2) and np.allclose(l1.data, l2.data)
+                for l1, l2 in zip(result_quadratic, result_sweep))
+    print("{:>5} points x {} outlines: quadratic {:7.3f}s, sweep {:6.3f}s ({:5.0f}x) equal: {}".format(
+        numpoints, len(lines), t_quadratic, t_sweep, t_quadratic / t_sweep, equal))
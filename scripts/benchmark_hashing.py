@@ -0,0 +1,42 @@
+"""
+Compare the buffer-hash of HashedList with the former str()-based hash
+for airfoils of 200 to 2000 points.
+"""
+import timeit
+
+import numpy as np
+
+from openglider.airfoil import Profile2D, Profile3D
+
+num = 200
+
+
+def str_hash(hashed_list):
+    return hash(str(hashed_list.data))
+
+
+def buffer_hash(hashed_list):
+    hashed_list._hash = None  # force a recalculation (cache-miss)
+    return hash(hashed_list)
+
+
+# warm up numpy's array-printing
+str_hash(Profile2D.compute_naca(2412, 200))
+
+for numpoints in (200, 500, 1000, 2000):
+    profile_2d = Profile2D.compute_naca(2412, numpoints)
+    profile_3d = Profile3D(np.insert(profile_2d.data, 1, 0., axis=1))
+
+    for profile in (profile_2d, profile_3d):
+        t_str = timeit.timeit(lambda: str_hash(profile), number=num) / num
+        t_buffer = timeit.timeit(lambda: buffer_hash(profile), number=num) / num
+
+        # numpy truncates long arrays in str() -> different profiles share a hash
+        other = profile.copy()
+        other.data = profile.data.copy()
+        other[len(other) // 2] = other[len(other) // 2] * 1.01
+        collision = str_hash(other) == str_hash(profile)
+
+        print("{:<10} {:>5} points: str {:8.1f}us, buffer {:6.1f}us ({:5.0f}x) str-collision: {}".format(
+            profile.__class__.__name__, numpoints, t_str * 1e6, t_buffer * 1e6,
+            t_str / t_buffer, collision))
@@ -0,0 +1,77 @@
+"""
+Compare the scipy-based constrained delaunay triangulation with PolyTri
+and meshpy (if installed) on the rib outlines (with holes) of the demokite.
+"""
+import os
+import time
+
+import numpy as np
+
+import openglider
+from openglider.mesh.poly_tri import PolyTri
+from openglider.mesh.scipy_triangle import triangulate
+
+try:
+    import meshpy.triangle as mptriangle
+    from openglider.mesh.meshpy_triangle import custom_triangulation
+except ImportError:
+    mptriangle = None
+
+demokite = os.path.join(os.path.dirname(__file__), "..", "tests", "common", "demokite.json")
+
+
+def get_outline(rib, hole_num=10):
+    vertices = list(rib.profile_2d.data[:-1])
+    boundaries = [list(range(len(vertices))) + [0]]
+    hole_centers = []
+    for hole in rib.holes:
+        start_index = len(vertices)
+        hole_vertices = hole.get_flattened(rib, num=hole_num, scale=False).data[:-1]
+        boundaries.append(list(range(start_index, start_index + len(hole_vertices))) + [start_index])
+        vertices += list(hole_vertices)
+        hole_centers.append(hole.get_center(rib, scale=False).tolist())
+    return np.array(vertices), boundaries, hole_centers
+
+
+def run_scipy(vertices, boundaries, holes, quality=False):
+    segments = [[boundary[i], boundary[i+1]] for boundary in boundaries for i in range(len(boundary) - 1)]
+    return triangulate(vertices, segments, quality=quality)[1]
+
+
+def run_poly_tri(vertices, boundaries, holes):
+    boundaries = [boundary[::-1] if i == 0 else boundary for i, boundary in enumerate(boundaries)]
+    return PolyTri(vertices, boundaries, holes=True, delaunay=True).get_tris()
+
+
+def run_meshpy(vertices, boundaries, holes):
+    mesh_info = mptriangle.MeshInfo()
+    mesh_info.set_points(vertices.tolist())
+    mesh_info.set_facets([[boundary[i], boundary[i+1]] for boundary in boundaries for i in range(len(boundary) - 1)])
+    if holes:
+        mesh_info.set_holes(holes)
+    return list(custom_triangulation(mesh_info, "Qzip").elements)
+
+
+glider = openglider.load(demokite).get_glider_3d()
+ribs = [rib for rib in glider.ribs if rib.holes] or glider.ribs
+
+methods = [("scipy", run_scipy),
+           ("scipy (quality)", lambda *args: run_scipy(*args, quality=True)),
+           ("PolyTri", run_poly_tri)]
+if mptriangle is not None:
+    methods.append(("meshpy", run_meshpy))
+
+for numpoints in (50, 100, 200):
+    glider.profile_numpoints = numpoints
+    outlines = [get_outline(rib) for rib in ribs]
+    print("{} ribs, {} profile points".format(len(outlines), numpoints))
+
+    for name, method in methods:
+        start = time.time()
+        try:
+            num_triangles = sum(len(method(*outline)) for outline in outlines)
+        except Exception as e:
+            print("  {:<16} failed: {}".format(name, e))
+            continue
+        duration = time.time() - start
+        print("  {:<16} {:8.3f}s  {} triangles".format(name, duration, num_triangles))
@@ -0,0 +1,44 @@
+"""
+Former (loop-based) implementations, used as a reference for the vectorized versions
+"""
+import numpy as np
+
+from openglider.vector.functions import rangefrom, cut
+from openglider.vector.polyline import PolyLine
+
+
+def check_reference(polyline):
+    """
+    former double-loop implementation of PolyLine2D.check
+    """
+    PolyLine.check(polyline)
+    for i in range(len(polyline.data) - 3):
+        if i > len(polyline.data) - 4:
+            break
+        for j in range(i + 2, len(polyline.data) - 2):
+            if j > len(polyline.data) - 3:
+                break
+            try:
+                temp = cut(polyline.data[i], polyline.data[i + 1], polyline.data[j], polyline.data[j + 1])
+                if 0 < temp[1] < 1. and 0 < temp[2] < 1.:
+                    polyline.data = np.concatenate([polyline.data[:i], [temp[0]], polyline.data[j+1:]])
+            except np.linalg.LinAlgError:
+                continue
+    return polyline
+
+
+def cut_reference(polyline, p1, p2, startpoint=0, extrapolate=False, cut_only_positive=False):
+    """
+    former loop-implementation of PolyLine2D.cut
+    """
+    for i in rangefrom(len(polyline)-1, startpoint):
+        try:
+            pos, ik1, ik2 = cut(polyline[i], polyline[i+1], p1, p2)
+        except np.linalg.LinAlgError:
+            continue
+        good_cut = 0 < ik1 <= 1 or ik1 == i == 0
+        extrapolated_cut = (i == 0 and ik1 <= 0) or (i == len(polyline)-2 and ik1 > 0)
+        if good_cut or extrapolate and extrapolated_cut:
+            if cut_only_positive and ik2 < 0:
+                continue
+            yield i+ik1, ik2
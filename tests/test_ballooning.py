@@ -20,6 +20,8 @@
 import unittest
 import random
 
+import numpy as np
+
 from common import openglider
 from openglider.glider import ballooning
 
@@ -44,6 +46,25 @@ class TestBallooningBezier(unittest.TestCase):
             val = random.random()
             self.assertAlmostEqual(2 * self.ballooning[val], (self.ballooning + self.ballooning)[val])
 
+    def test_array(self):
+        x_values = np.linspace(-1, 1, 50)
+        values = self.ballooning[x_values]
+        phi = self.ballooning(x_values)
+        for x, value, phi_x in zip(x_values, values, phi):
+            self.assertAlmostEqual(value, self.ballooning[x])
+            self.assertAlmostEqual(phi_x, self.ballooning(x))
+        self.assertTrue(np.allclose(self.ballooning.mapx(x_values), values))
+        self.assertRaises(ValueError, self.ballooning.__getitem__, [0.5, 1.5])
+
+
+class TestArcSinc(unittest.TestCase):
+    def test_inverse(self):
+        values = np.concatenate([np.linspace(0.001, 0.999, 100), 1 - np.logspace(-12, -3, 10)])
+        phi = ballooning.Ballooning.arcsinc(values)
+        self.assertTrue(np.allclose(np.sinc(phi / np.pi), values, rtol=0, atol=1e-14))
+        self.assertAlmostEqual(ballooning.Ballooning.arcsinc(values[10]), phi[10])
+        self.assertEqual(ballooning.Ballooning.arcsinc(1.), 0)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
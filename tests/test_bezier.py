@@ -22,7 +22,9 @@ from __future__ import division
 import unittest
 import random
 
-from openglider.vector.spline import Bezier
+import numpy as np
+
+from openglider.vector.spline import Bezier, BSpline, BSplineBase
 
 
 class TestBezier(unittest.TestCase):
@@ -43,6 +45,22 @@ class TestBezier(unittest.TestCase):
             self.assertAlmostEqual(p1[0], p2[0], 0)
             self.assertAlmostEqual(p1[1], p2[1], 0)
 
+    def test_fit_many(self):
+        to_fit = [self.bezier.get_sequence(), self.bezier.get_sequence(40) * 2, self.bezier.get_sequence() + 1]
+        curves = self.bezier.__class__.fit_many(to_fit, numpoints=6)
+        for points, curve in zip(to_fit, curves):
+            reference = self.bezier.__class__.fit(points, numpoints=6)
+            self.assertTrue(np.allclose(curve.controlpoints, reference.controlpoints))
+            self.assertTrue(np.allclose(curve.controlpoints[0], points[0]))
+
+    def test_constraint_fit(self):
+        constraints = [[None, None] for _ in range(6)]
+        constraints[0] = [1., 0.]
+        constraints[-2][0] = 0.
+        curve = self.bezier.__class__.constraint_fit(self.bezier.get_sequence(), constraints)
+        self.assertTrue(np.allclose(curve.controlpoints[0], [1, 0]))
+        self.assertAlmostEqual(curve.controlpoints[-2][0], 0)
+
     def test_length(self):
         self.bezier.controlpoints = [[0, 0], [2, 0]]
         self.assertAlmostEqual(self.bezier.get_length(10), 2.)
@@ -51,6 +69,37 @@ class TestBezier(unittest.TestCase):
         sequence = self.bezier.get_sequence(100)
         # print(sequence)
 
+    def test_call_array(self):
+        values = np.random.random(20)
+        points = self.bezier(values)
+        for value, point in zip(values, points):
+            self.assertTrue(np.allclose(self.bezier(value), point))
+
+    def test_matrix_cache(self):
+        other = self.bezier.__class__(self.bezier.data.copy())
+        self.assertIs(self.bezier.get_matrix(30), other.get_matrix(30))
+
+
+class TestBSpline(TestBezier):
+    def setUp(self):
+        controlpoints = [[i, random.random()] for i in range(15)]
+        self.bezier = BSpline(controlpoints)
+
+    def test_length(self):
+        self.bezier.controlpoints = [[0, 0], [1, 0], [2, 0]]
+        self.assertAlmostEqual(self.bezier.get_length(10), 2.)
+
+    def test_partition_of_unity(self):
+        for degree in range(1, 5):
+            matrix = BSplineBase(degree).get_matrix(10, np.linspace(0, 1, 33))
+            self.assertTrue(np.allclose(matrix.sum(axis=1), 1))
+
+    def test_fit(self):
+        num = len(self.bezier.controlpoints)
+        to_fit = self.bezier.get_sequence(200)
+        bspline = BSpline.fit(to_fit, numpoints=num)
+        self.assertTrue(np.allclose(bspline.get_sequence(), self.bezier.get_sequence(), atol=1e-2))
+
 
 
 if __name__ == '__main__':
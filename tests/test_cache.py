@@ -0,0 +1,155 @@
+import unittest
+import random
+import shutil
+import tempfile
+
+import numpy as np
+
+from common import *
+
+import openglider
+from openglider.utils import cache
+from openglider.utils.disk_cache import DiskCache, get_disk_cache
+from openglider.glider.rib.rib import Rib
+from openglider.vector.polyline import PolyLine2D
+
+
+class TestCache(TestCase):
+    def setUp(self):
+        self.prof = openglider.airfoil.Profile2D.compute_naca(random.randint(1, 9999), 30)
+        self.rib = Rib(self.prof,
+                       startpoint=[0., 1., 0.],
+                       chord=1.5,
+                       arcang=random.random(),
+                       aoa_absolute=random.random(),
+                       glide=6.)
+
+    def test_cache_hit(self):
+        self.assertIs(self.rib.profile_3d, self.rib.profile_3d)
+
+    def test_attribute_change(self):
+        profile_3d = self.rib.profile_3d
+        self.rib.chord = 3.
+        self.assertIsNot(profile_3d, self.rib.profile_3d)
+        self.assertAlmostEqual(self.rib.profile_3d.data[0][0], 2 * profile_3d.data[0][0])
+
+    def test_profile_change(self):
+        profile_3d = self.rib.profile_3d
+        self.prof.data = self.prof.data * 0.5
+        self.assertIsNot(profile_3d, self.rib.profile_3d)
+
+    def test_inplace_change(self):
+        profile_3d = self.rib.profile_3d
+        self.rib.pos[1] += 1
+        self.assertIsNot(profile_3d, self.rib.profile_3d)
+        self.assertTrue(np.allclose(self.rib.profile_3d.data[:, 1], profile_3d.data[:, 1] + 1))
+
+        thickness = self.prof.thickness
+        self.prof.data[:, 1] *= 2
+        self.assertAlmostEqual(self.prof.thickness, 2 * thickness)
+
+    def test_inplace_change_cell(self):
+        glider = self.import_glider()
+        cell = glider.cells[1]
+        midrib = cell.midrib(0.5).data
+        cell.rib1.pos[2] += 0.5
+        cell.rib2.pos[2] += 0.5
+        self.assertTrue(np.allclose(cell.midrib(0.5).data[:, 2], midrib[:, 2] + 0.5))
+
+    def test_setitem(self):
+        line = PolyLine2D([[0, 0], [1, 0], [2, 0]])
+        tangents = line.tangents
+        line[2] = [1, 1]
+        self.assertIsNot(tangents, line.tangents)
+        self.assertAlmostEqual(line.tangents[1][1], 1)
+
+    def test_hash_long_array(self):
+        data = np.random.random((2000, 2))
+        line1 = PolyLine2D(data)
+        line2 = PolyLine2D(data.copy())
+        self.assertEqual(hash(line1), hash(line2))
+        self.assertEqual(line1.digest(), line2.digest())
+        line2[1000] = line2[1000] * 1.01
+        self.assertNotEqual(hash(line1), hash(line2))
+        self.assertNotEqual(line1.digest(), line2.digest())
+
+    def test_copy(self):
+        profile_3d = self.rib.profile_3d
+        rib2 = self.rib.copy()
+        rib2.chord = 3.
+        self.assertIs(profile_3d, self.rib.profile_3d)
+        self.assertIsNot(profile_3d, rib2.profile_3d)
+
+    def test_statistics(self):
+        cache.reset_cache_statistics()
+        for _ in range(3):
+            self.rib.profile_3d
+        stats = cache.cache_statistics()["openglider.glider.rib.rib.Rib.profile_3d"]
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+
+    def test_lru_store(self):
+        openglider.config.cache_backend = "lru"
+        openglider.config.cache_max_bytes = 2 * self.prof.data.nbytes * 3 // 2
+        try:
+            lines = [PolyLine2D(self.prof.data) for _ in range(5)]
+            for line in lines:
+                line.tangents
+            store = cache.get_cache_store()
+            self.assertLessEqual(store.nbytes, openglider.config.cache_max_bytes)
+            self.assertLess(len(store.entries), len(lines))
+            tangents = lines[0].tangents  # evicted -> recalc
+            self.assertTrue(np.allclose(tangents, lines[-1].tangents))
+
+            del lines, line
+            self.assertEqual(store.nbytes, 0)
+        finally:
+            openglider.config.cache_backend = "instance"
+            openglider.config.cache_max_bytes = openglider.config.__class__.cache_max_bytes
+
+    def test_dependency_chain(self):
+        glider = self.import_glider()
+        cell = glider.cells[1]
+        basic_cell = cell.basic_cell
+        self.assertIs(basic_cell, cell.basic_cell)
+        cell.rib1.aoa_absolute += 0.1
+        self.assertIsNot(basic_cell, cell.basic_cell)
+        self.assertTrue(np.allclose(cell.basic_cell.prof1.data, cell.rib1.profile_3d.data))
+
+
+class TestDiskCache(TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        openglider.config.disk_cache_dir = self.tempdir
+
+    def tearDown(self):
+        openglider.config.disk_cache_dir = None
+        shutil.rmtree(self.tempdir)
+
+    def test_glider_3d(self):
+        glider_2d = self.import_glider_2d()
+        glider_3d = glider_2d.get_glider_3d()
+        disk_cache = get_disk_cache()
+        self.assertEqual(len(disk_cache._get_files()), 1)
+
+        # warm cache
+        glider_2d = self.import_glider_2d()
+        self.assertEqualGlider(glider_3d, glider_2d.get_glider_3d())
+        self.assertEqual(len(disk_cache._get_files()), 1)
+
+        glider_2d.glide += 1
+        glider_2d.get_glider_3d()
+        self.assertEqual(len(disk_cache._get_files()), 2)
+
+    def test_eviction(self):
+        disk_cache = DiskCache(self.tempdir, max_bytes=2000)
+        for i in range(5):
+            disk_cache.store(disk_cache.get_key(i), np.random.random(100))
+        self.assertEqual(len(disk_cache._get_files()), 2)
+        self.assertLessEqual(disk_cache.nbytes, 2000)
+        self.assertIn(disk_cache.get_key(4), disk_cache)
+        self.assertNotIn(disk_cache.get_key(0), disk_cache)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
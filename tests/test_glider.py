@@ -20,8 +20,11 @@
 import random
 import unittest
 
+import numpy as np
+
 from common import *
 import openglider.glider
+from openglider.vector.projection import flatten_list
 
 
 class GliderTestClass(TestCase):
@@ -64,6 +67,35 @@ class TestGlider(GliderTestClass):
         y = random.random()*len(self.glider.cells)
         self.glider.get_midrib(y).flatten()
 
+    def test_align_ribs(self):
+        self.glider.align_ribs()
+        for rib in self.glider.ribs:
+            profile_3d = rib.profile_3d
+            transformation = rib.transformation
+            rib.chord *= 1.  # invalidate
+            self.assertIsNot(profile_3d, rib.profile_3d)
+            self.assertTrue(np.allclose(profile_3d.data, rib.profile_3d.data))
+            self.assertTrue(np.allclose(transformation.mat, rib.transformation.mat))
+
+    def test_spanwise(self):
+        for x, point in zip(range(len(self.glider.ribs)), self.glider.get_spanwise(0.5)):
+            self.assertTrue(np.allclose(point, self.glider.ribs[x].align([0.5, 0, 0])))
+
+    def test_flattened_cells(self):
+        flattened = self.glider.get_flattened_cells()
+        for cell, (left, right) in zip(self.glider.cells, flattened):
+            left_2, right_2 = flatten_list(cell.prof1, cell.prof2)
+            self.assertTrue(np.allclose(left.data, left_2.data))
+            self.assertTrue(np.allclose(right.data, right_2.data))
+
+    def test_midribs(self):
+        y_values = np.linspace(0, 1, 7)
+        for cell in self.glider.cells:
+            midribs = cell.midribs(y_values)
+            self.assertEqual(midribs.shape, (len(y_values), len(cell.prof1.data), 3))
+            for y, midrib in zip(y_values, midribs):
+                self.assertTrue(np.allclose(midrib, cell.midrib(y, with_numpy=False).data))
+
     def copy_complete(self):
         self.glider.copy_complete()
 
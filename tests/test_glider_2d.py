@@ -2,9 +2,11 @@ import unittest
 
 import tempfile
 import os
+import numpy as np
 from common import *
 from openglider import jsonify
 from openglider.glider import ParametricGlider
+from openglider.airfoil import Profile2D
 
 TEMPDIR =  tempfile.gettempdir()
 
@@ -28,6 +30,25 @@ class GliderTestCase2D(TestCase):
     def test_export_ods(self):
         exp = self.glider2d.export_ods(os.path.join(TEMPDIR, "test.ods"))
 
+    def test_merge_profile(self):
+        profile_1 = Profile2D.compute_naca(2412, 100)
+        profile_2 = Profile2D.compute_naca(4418, 80)
+        self.glider2d.profiles = [profile_1, profile_2]
+        x_values = np.linspace(-1, 1, 51)
+        merged = self.glider2d.get_merge_profile(0.25, x_values)
+        expected = profile_1.points_at(profile_1(x_values)) * 0.75 + profile_2.points_at(profile_2(x_values)) * 0.25
+        self.assertTrue(np.allclose(merged.data, expected))
+
+        # memoized, but independent objects
+        other = self.glider2d.get_merge_profile(0.25, x_values)
+        self.assertIsNot(merged, other)
+        self.assertTrue(np.allclose(merged.data, other.data))
+
+        # changed profiles -> recalc
+        profile_2.data = profile_2.data * [1, 2]
+        merged_2 = self.glider2d.get_merge_profile(1, x_values)
+        self.assertTrue(np.allclose(merged_2.data, profile_2.points_at(profile_2(x_values))))
+
     def test_set_area(self):
         self.glider2d.shape.set_area(10)
         self.assertAlmostEqual(self.glider2d.shape.area, 10)
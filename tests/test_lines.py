@@ -33,6 +33,42 @@ class TestLines(unittest.TestCase):
     def test_case_4(self):
         self.runcase(test_dir+"/lines/TEST_INPUT_FILE_4.txt")
 
+    def test_line_index(self):
+        key_dict = import_lines(test_dir+"/lines/TEST_INPUT_FILE_1.txt")
+        lineset = LineSet(key_dict["LINES"][2], [10, 0, 1])
+
+        def check():
+            for node in lineset.nodes:
+                self.assertEqual(lineset.get_upper_connected_lines(node),
+                                 [line for line in lineset.lines if line.lower_node is node])
+                self.assertEqual(lineset.get_lower_connected_lines(node),
+                                 [line for line in lineset.lines if line.upper_node is node])
+
+        def check_order():
+            order = lineset._line_order
+            self.assertEqual(len(order), len(lineset.lines))
+            for i, line in enumerate(order):
+                for lower_line in lineset.get_lower_connected_lines(line.lower_node):
+                    self.assertLess(order.index(lower_line), i)
+
+        check()
+        check_order()
+
+        # in-place change of the lines
+        line = lineset.lines.pop()
+        check()
+        lineset.lines.append(line)
+        check()
+        check_order()
+
+        # reconnect a line
+        upper_line = lineset.uppermost_lines[0]
+        other_line = [l for l in lineset.lines
+                      if l.upper_node.type == 1 and l.upper_node is not upper_line.lower_node][0]
+        upper_line.lower_node = other_line.upper_node
+        check()
+        check_order()
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -1,9 +1,19 @@
+import os
+import tempfile
 import unittest
 
 
 from common import *
 
-from openglider.mesh import Mesh, Vertex
+import numpy as np
+try:
+    import scipy
+except ImportError:
+    scipy = None
+
+from openglider.mesh import Mesh, Vertex, ArrayMesh, PolygonArray
+from openglider.mesh.mesh import find_duplicates
+from openglider.mesh.least_square_conformal_mapping import LSCM
 import openglider
 from openglider.utils.distribution import Distribution
 
@@ -40,6 +50,149 @@ class TestMesh(TestCase):
         m.delete_duplicates()
         m.get_indexed()
 
+    def test_array_mesh(self):
+        mesh = self.glider.cells[1].get_mesh(2)
+        array_mesh = ArrayMesh.from_mesh(mesh)
+        vertices, polygons, boundaries = mesh.get_indexed()
+        self.assertEqual(len(array_mesh.vertices), len(vertices))
+        self.assertEqual(array_mesh.polygons["hull"].tolist(), polygons["hull"])
+
+        joined = ArrayMesh.concatenate([array_mesh, array_mesh])
+        self.assertEqual(len(joined.vertices), 2 * len(vertices))
+        self.assertEqual(len(joined.polygons["hull"]), 2 * len(polygons["hull"]))
+        self.assertTrue(np.all(joined.polygons["hull"].indices[len(array_mesh.polygons["hull"].indices):] >= len(vertices)))
+
+        triangles = array_mesh.triangularize().polygons["hull"]
+        self.assertEqual(len(triangles), 2 * len(polygons["hull"]))
+        self.assertEqual(triangles.regular().shape, (len(triangles), 3))
+
+        mesh_2 = array_mesh.to_mesh()
+        self.assertEqual(len(mesh_2.vertices), len(vertices))
+
+    def test_array_mesh_duplicates(self):
+        mesh = ArrayMesh.concatenate([ArrayMesh.from_mesh(cell.get_mesh(1)) for cell in self.glider.cells[1:-1]])
+        reference = Mesh(name="reference")
+        for cell in self.glider.cells[1:-1]:
+            reference += cell.get_mesh(1)
+        reference.delete_duplicates()
+
+        num_vertices = len(mesh.vertices)
+        remap = mesh.delete_duplicates()
+        self.assertEqual(len(remap), num_vertices)
+        self.assertEqual(len(mesh.vertices), len(reference.vertices))
+        self.assertEqual(mesh.polygons["hull"].indices.max(), len(mesh.vertices) - 1)
+
+    def test_find_duplicates(self):
+        vertices = np.random.random((100, 3))
+        vertices = np.concatenate([vertices, vertices + 1e-12, vertices[:10]])
+        remap = find_duplicates(vertices)
+        self.assertTrue(np.all(remap[:100] == np.arange(100)))
+        self.assertTrue(np.all(remap[100:200] == np.arange(100)))
+        self.assertTrue(np.all(remap[200:] == np.arange(10)))
+
+    def test_array_mesh_export(self):
+        mesh = ArrayMesh.from_mesh(self.glider.cells[1].get_mesh(2))
+        num_quads = len(mesh.polygons["hull"])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "mesh.stl")
+            mesh.export(path)
+            self.assertEqual(os.path.getsize(path), 84 + 50 * 2 * num_quads)
+
+            path = os.path.join(directory, "mesh.ply")
+            mesh.export(path)
+            with open(path, "rb") as infile:
+                content = infile.read()
+            header, data = content.split(b"end_header\n")
+            self.assertIn("element face {}".format(num_quads).encode(), header)
+            self.assertEqual(len(data), len(mesh.vertices) * 12 + num_quads * (1 + 4 * 4 + 4) + 3)
+
+            for encoding in ("raw", "base64"):
+                path = os.path.join(directory, "mesh.vtu")
+                mesh.export(path, encoding=encoding)
+                with open(path, "rb") as infile:
+                    content = infile.read()
+                self.assertIn('NumberOfCells="{}"'.format(num_quads).encode(), content)
+
+        obj = mesh.export_obj().splitlines()
+        self.assertEqual(len([line for line in obj if line.startswith("v ")]), len(mesh.vertices))
+        self.assertEqual(len([line for line in obj if line.startswith("f ")]), num_quads)
+
+    @unittest.skipIf(scipy is None, "scipy not installed")
+    def test_lscm_plane(self):
+        x, y = np.meshgrid(np.linspace(0, 2, 10), np.linspace(0, 1, 5))
+        vertices = np.array([x.flatten(), y.flatten(), 0.1 * x.flatten()]).T
+        quads = [[i * 10 + j, i * 10 + j + 1, (i + 1) * 10 + j + 1, (i + 1) * 10 + j]
+                 for i in range(4) for j in range(9)]
+        triangles = PolygonArray.from_list(quads).triangularize().regular()
+        for method in ("spsolve", "lsqr"):
+            flattened = LSCM(vertices, triangles).run(method)
+            for i, j in [[0, 49], [3, 45], [12, 27]]:
+                self.assertAlmostEqual(np.linalg.norm(flattened[i] - flattened[j]),
+                                       np.linalg.norm(vertices[i] - vertices[j]))
+
+    @unittest.skipIf(scipy is None, "scipy not installed")
+    def test_panel_flattened(self):
+        cell = self.glider.cells[1]
+        for panel in cell.panels:
+            left, right = panel.get_flattened(cell, numribs=3, method="lscm")
+            left_2, right_2 = panel.get_flattened(cell, method="flatten_list")
+            self.assertAlmostEqual(left.get_length() / left_2.get_length(), 1, delta=0.05)
+            self.assertAlmostEqual(right.get_length() / right_2.get_length(), 1, delta=0.05)
+
+    @unittest.skipIf(scipy is None, "scipy not installed")
+    def test_scipy_triangulation(self):
+        from openglider.mesh.scipy_triangle import triangulate, loop_segments
+        outline = np.array([[0, 0], [4, 0], [4, 2], [0, 2]], dtype=float)
+        hole = np.array([[1, 0.5], [1, 1.5], [2, 1.5], [2, 0.5]], dtype=float)
+        segments = np.concatenate([loop_segments(0, 4), loop_segments(4, 4)])
+        num_triangles = []
+        for quality in (False, True):
+            points, triangles = triangulate(np.concatenate([outline, hole]), segments, quality=quality, max_area=0.1)
+            a, b, c = points[triangles].transpose(1, 0, 2)
+            areas = 0.5 * ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+            self.assertTrue(np.all(areas > 0))
+            self.assertAlmostEqual(areas.sum(), 7)
+            num_triangles.append(len(triangles))
+        self.assertGreater(num_triangles[1], num_triangles[0])
+
+    @unittest.skipIf(scipy is None, "scipy not installed")
+    def test_scipy_triangulation_sharp_angle(self):
+        from openglider.mesh.scipy_triangle import triangulate, loop_segments
+        x = np.linspace(0, 1, 30)
+        upper = np.array([x, 0.1 * np.sqrt(np.sin(np.pi * x)) * (1 - x)]).T
+        lower = np.array([x[::-1], -0.02 * np.sin(np.pi * x[::-1])]).T[1:-1]
+        outline = np.concatenate([upper, lower])
+        segments = loop_segments(0, len(outline))
+        num_points = len(triangulate(outline, segments)[0])
+
+        for split_segments in (True, False):
+            points, triangles = triangulate(outline, segments, quality=True, max_area=1e-4,
+                                            split_segments=split_segments, max_points=300)
+            self.assertGreater(len(points), num_points)
+            self.assertLess(len(points), 400)
+            if not split_segments:
+                # no additional points on the outline
+                edges = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+                edges, count = np.unique(edges, axis=0, return_counts=True)
+                self.assertTrue(np.all(edges[count == 1] < num_points))
+
+    def test_rib_mesh_quality(self):
+        rib = self.glider.ribs[0]
+        outline = Mesh.from_rib(rib, mesh_option="Qzip", filled=True)
+        mesh = Mesh.from_rib(rib, mesh_option="QYqazip", filled=True)
+        self.assertGreater(len(mesh.polygons["ribs"]), 0)
+        self.assertLess(len(mesh.vertices), 10 * len(outline.vertices))
+
+    def test_polygon_array(self):
+        polygons = [[0, 1], [1, 2, 3], [0, 1, 2, 3]]
+        array = PolygonArray.from_list(polygons)
+        self.assertEqual(array.tolist(), polygons)
+        self.assertEqual(array.triangularize().tolist(), [[0, 1], [1, 2, 3], [0, 1, 2], [2, 3, 0]])
+        self.assertIsNone(array.regular())
+        self.assertEqual(array[-1].tolist(), polygons[-1])
+        self.assertRaises(IndexError, lambda: array[3])
+        self.assertRaises(IndexError, lambda: array[-4])
+
 
 
 if __name__ == '__main__':
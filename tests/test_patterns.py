@@ -2,10 +2,14 @@ import unittest
 
 import tempfile
 import os
+
+import numpy as np
+
 import openglider
 import openglider.plots
 import openglider.plots.glider
 from common import TestCase
+from common.reference import check_reference
 
 
 TEMPDIR =  tempfile.gettempdir()
@@ -16,6 +20,14 @@ class TestPlots(TestCase):
         self.glider_3d = self.glider_2d.get_glider_3d()
         self.plotmaker = openglider.plots.PlotMaker(self.glider_3d)
 
+    def test_check_outlines(self):
+        for cell in self.glider_3d.cells:
+            plotmaker = openglider.plots.glider.cell.CellPlotMaker(cell, [])
+            inner, ballooned, outer, outer_orig = plotmaker._get_flatten_cell()
+            for line, line_orig in zip(outer, outer_orig):
+                reference = check_reference(line_orig.copy())
+                self.assertTrue(np.allclose(line.data, reference.data))
+
     @unittest.skip("not working")
     def test_patterns_panels(self):
         self.plotmaker.get_panels()
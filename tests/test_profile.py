@@ -22,7 +22,7 @@ import os
 import tempfile
 import unittest
 from common import import_dir
-from openglider.airfoil import Profile2D
+from openglider.airfoil import Profile2D, get_x_value
 from test_vector import *
 
 TEMPDIR =  tempfile.gettempdir()
@@ -45,6 +45,21 @@ class TestProfile(unittest.TestCase):
         x = random.random() * random.randint(-1, 1)
         self.assertAlmostEqual(abs(x), self.prof.profilepoint(x)[0])
 
+    def test_call_array(self):
+        x_values = np.linspace(-1, 1, 100)
+        iks = self.prof(x_values)
+        for x, ik in zip(x_values, iks):
+            self.assertAlmostEqual(ik, self.prof(x))
+        self.assertTrue(np.allclose(np.abs(self.prof.points_at(iks)[:, 0]), np.abs(x_values)))
+        self.assertAlmostEqual(self.prof(0.), self.prof.noseindex)
+
+    def test_get_x_value(self):
+        self.assertAlmostEqual(get_x_value([1, 2, 3], 1.5), 0.5)
+        x_values = self.prof.x_values
+        positions = get_x_value(x_values, x_values)
+        self.assertTrue(np.allclose(positions, range(len(x_values))))
+        self.assertAlmostEqual(positions[3], get_x_value(x_values, x_values[3]))
+
     def test_multiplication(self):
         factor = random.random()
         other = self.prof * factor
@@ -78,6 +93,29 @@ class TestProfile(unittest.TestCase):
         self.prof.thickness *= val
         self.assertAlmostEqual(self.prof.thickness, thickness*val)
 
+    def test_x_values(self):
+        x_values = np.linspace(-1, 1, 51)
+        expected = np.array([self.prof[self.prof(x)] for x in x_values])
+        self.prof.x_values = x_values
+        self.assertTrue(np.allclose(self.prof.data, expected))
+        self.assertTrue(np.allclose(np.abs(self.prof.x_values), np.abs(x_values)))
+
+    def test_cached_metrics(self):
+        thickness = self.prof.thickness
+        camber_line = self.prof.camber_line
+        self.assertTrue(np.allclose(camber_line, self.prof.camber_line))
+        # cached arrays are shared -> read-only
+        with self.assertRaises(ValueError):
+            camber_line[:, 1] *= 2
+        with self.assertRaises(ValueError):
+            self.prof.upper_indices[0] = 1
+        self.assertAlmostEqual(self.prof.camber, max(camber_line[:, 1]))
+
+        self.prof.data = self.prof.data * [1, 2]
+        self.assertAlmostEqual(self.prof.thickness, 2 * thickness)
+        self.assertTrue(np.allclose(self.prof.camber_line[:, 1], 2 * camber_line[:, 1]))
+        self.assertEqual(len(self.prof.upper_indices) + len(self.prof.lower_indices) + 1, len(self.prof))
+
     @unittest.skip("whatsoever!")
     def test_camber(self):
         val = random.random()
@@ -20,6 +20,11 @@
 import numpy as np
 from openglider.vector.functions import norm, normalize, rotation_3d
 from openglider.vector.polyline import PolyLine, PolyLine2D
+from openglider.vector.interpolate import Interpolation
+from openglider.vector.transformation import Rotation, Translation
+from openglider.vector.projection import flatten_list, flatten_lists
+
+from common.reference import check_reference, cut_reference
 
 
 __author__ = 'simon'
@@ -93,6 +98,40 @@ class TestVector3D(unittest.TestCase):
                                    "\nresult: i2=" + str(new) + " leng2=" + str(leng2) +
                                    " dist=" + str(norm(thalist[start] - thalist[new])))
 
+    def test_points_at(self):
+        for thalist in self.vectors:
+            ik_array = np.random.random(50) * (self.numpoints + 40) - 20
+            ik_array[:3] = [0, self.numpoints - 1, self.numpoints - 1.5]
+            points = thalist.points_at(ik_array)
+            for ik, point in zip(ik_array, points):
+                self.assertTrue(np.allclose(point, thalist[ik]))
+
+    def test_length_at(self):
+        for thalist in self.vectors:
+            ik_array = np.random.random(20) * (self.numpoints + 40) - 20
+            lengths = thalist.get_length_at(ik_array)
+            self.assertTrue(np.allclose(thalist.get_ik_at_length(lengths), ik_array))
+
+    def test_resample(self):
+        for thalist in self.vectors:
+            resampled = thalist.resample(30)
+            self.assertEqual(len(resampled), 30)
+            self.assertTrue(np.allclose(resampled[0], thalist[0]))
+            self.assertTrue(np.allclose(resampled.last(), thalist.last()))
+
+        straight = PolyLine([[0, 0], [1, 0], [1.5, 0], [4, 0]]).resample(5)
+        self.assertTrue(np.allclose(straight.arc_lengths, [0, 1, 2, 3, 4]))
+
+    def test_slice(self):
+        for thalist in self.vectors:
+            start = random.random() * self.numpoints
+            stop = random.random() * self.numpoints
+            part = thalist[start:stop]
+            positions = thalist.get_positions(start, stop)
+            self.assertEqual(len(part), len(positions))
+            for ik, point in zip(positions, part):
+                self.assertTrue(np.allclose(point, thalist[ik]))
+
 
 class TestVector2D(TestVector3D):
     def setUp(self, dim=2):
@@ -116,6 +155,18 @@ class TestVector2D(TestVector3D):
             amount = random.random()
             thalist.add_stuff(amount)
 
+    def test_shift_corner(self):
+        square = PolyLine2D([[0, 0], [1, 0], [1, 1], [0, 1]]).add_stuff(-0.1)
+        self.assertTrue(np.allclose(square.data, [[0, 0.1], [0.9, 0.1], [0.9, 0.9], [0, 0.9]]))
+
+        # miter_limit -> bevel
+        corner = PolyLine2D([[0, 0], [1, 0], [0, 0.1]]).add_stuff(0.1, miter_limit=4)
+        self.assertEqual(len(corner), 4)
+
+        # reversal
+        reversed_line = PolyLine2D([[0, 0], [1, 0], [0, 0]]).add_stuff(0.1)
+        self.assertTrue(np.allclose(reversed_line.data, [[0, -0.1], [1, -0.1], [1, 0.1], [0, 0.1]]))
+
     def test_Cut(self):
         for thalist in self.vectors:
             i = random.randint(1, len(thalist)-3)
@@ -129,6 +180,85 @@ class TestVector2D(TestVector3D):
             neu = thalist.cut(p1, p2, i - 1)
             #self.assertAlmostEqual(i, neu[1])
 
+    def test_cut_order(self):
+        for thalist in self.vectors:
+            p1, p2 = np.random.random((2, 2)) * 100
+            startpoint = random.randint(0, len(thalist) + 5)
+            for extrapolate in (True, False):
+                cuts = list(thalist.cut(p1, p2, startpoint, extrapolate=extrapolate))
+                reference = list(cut_reference(thalist, p1, p2, startpoint, extrapolate))
+                self.assertTrue(np.allclose(cuts, reference))
+
+    def test_cut_with_polyline(self):
+        for thalist, other in zip(self.vectors[:10], self.vectors[10:20]):
+            startpoint = random.randint(0, len(thalist))
+            cuts = list(thalist.cut_with_polyline(other, startpoint, blocksize=7))
+            reference = []
+            for i in range(len(other) - 1):
+                p1, p2 = other[i], other[i+1]
+                for ik1, ik2 in cut_reference(thalist, p1, p2, startpoint, cut_only_positive=True):
+                    reference.append((ik1, i + ik2))
+            self.assertTrue(len(cuts) > 0)
+            self.assertTrue(np.allclose(cuts, reference))
+
+    def test_check(self):
+        for thalist in self.vectors:
+            for data in (thalist.data, np.cumsum(thalist.data - 50, axis=0)):
+                checked = PolyLine2D(data).check()
+                reference = check_reference(PolyLine2D(data))
+                self.assertEqual(len(checked), len(reference))
+                self.assertTrue(np.allclose(checked.data, reference.data))
+
+
+class TestFlatten(unittest.TestCase):
+    def test_lengths(self):
+        list1 = np.cumsum(np.random.random((20, 3)), axis=0)
+        list2 = list1[::2] + [0, 1, 0]
+        left, right = flatten_list(list1, list2)
+        self.assertEqual(len(left), len(list1))
+        self.assertEqual(len(right), len(list2))
+        for flat, line in ((left, list1), (right, list2)):
+            lengths_3d = np.linalg.norm(np.diff(line, axis=0), axis=1)
+            lengths_2d = np.linalg.norm(np.diff(flat.data, axis=0), axis=1)
+            self.assertTrue(np.allclose(lengths_2d, lengths_3d))
+
+    def test_batch(self):
+        lists1 = np.random.random((5, 10, 3))
+        lists2 = np.random.random((5, 12, 3)) + [0, 2, 0]
+        left, right = flatten_lists(lists1, lists2)
+        for i in range(5):
+            left_2, right_2 = flatten_list(lists1[i], lists2[i])
+            self.assertTrue(np.allclose(left[i], left_2.data))
+            self.assertTrue(np.allclose(right[i], right_2.data))
+
+
+class TestInterpolation(unittest.TestCase):
+    def setUp(self):
+        x_values = np.sort(np.random.random(20) * 10)
+        self.data = np.array([x_values, np.random.random(20)]).T
+        self.interpolation = Interpolation(self.data)
+
+    def test_nodes(self):
+        for x, y in self.data:
+            self.assertAlmostEqual(self.interpolation(x), y)
+
+    def test_array(self):
+        x_values = np.random.random(100) * 14 - 2
+        values = self.interpolation(x_values)
+        for x, value in zip(x_values, values):
+            self.assertAlmostEqual(self.interpolation(x), value)
+
+        inside = (x_values >= self.data[0, 0]) & (x_values <= self.data[-1, 0])
+        self.assertTrue(np.allclose(values[inside], np.interp(x_values[inside], *self.data.T)))
+
+    def test_extrapolate(self):
+        (x0, y0), (x1, y1) = self.data[:2]
+        self.assertAlmostEqual(self.interpolation(x0 - 1), y0 - (y1 - y0) / (x1 - x0))
+
+        interpolation = Interpolation(self.data, extrapolate=False)
+        self.assertRaises(ValueError, interpolation, x0 - 1)
+
+
 class TestVectorFunctions3D(unittest.TestCase):
     def setUp(self):
         self.vectors = [
@@ -136,6 +266,22 @@ class TestVectorFunctions3D(unittest.TestCase):
             for _ in range(100)
         ]
 
+    def test_rotation_array(self):
+        angles = np.random.random(10)
+        axes = np.random.random((10, 3))
+        matrices = rotation_3d(angles, axes)
+        self.assertEqual(matrices.shape, (10, 3, 3))
+        for angle, axis, matrix in zip(angles, axes, matrices):
+            self.assertTrue(np.allclose(matrix, rotation_3d(angle, axis)))
+
+    def test_stacked_transformation(self):
+        angles = np.random.random(10)
+        rotations = Rotation(angles, [0, 1, 0]) * Translation(np.random.random((10, 3)))
+        points = np.random.random((10, 5, 3))
+        result = rotations.apply(points)
+        for i in range(10):
+            self.assertTrue(np.allclose(result[i], rotations[i].apply(points[i])))
+
     def test_rotation_scale(self):
         angle = 2*random.random() - 1
         rot = rotation_3d(0, [1, 0, 0])